@@ -1,11 +1,39 @@
 import streamlit as st
-import pdfplumber
-import re
 import pandas as pd
-import hashlib
+import json
 import os
+import uuid
 from datetime import datetime
 
+from swim.analysis import category_ranks
+from swim.cache import ParseCache
+from swim.extraction import read_pdf_bytes
+from swim.columnar import (
+    compact,
+    count_distinct,
+    mean,
+    page,
+    payload_size,
+    search_mask,
+    sort_indices,
+    take_rows,
+    value_counts,
+)
+from swim.dataset import CombinedDataset
+from swim.filters import FilterIndex
+from swim.identity import ATHLETE_ID_COLUMN
+from swim.leaderboard import LEADERBOARD_SIZE, ORDER_POINTS, ORDER_TIME
+from swim.instrumentation import Metrics, count, timer
+from swim.jobs import RUNNING, IngestQueue
+from swim.ingest import (
+    get_city_name,
+    get_file_hash,
+    load_meet,
+)
+from swim.pages import PageCache, page_hashes
+from swim.schema import enforce_schema
+from swim.store import get_parse_store
+
 # Set page configuration
 st.set_page_config(
     page_title="Yüzme Yarış Sonuçları Analizi",
@@ -20,6 +48,21 @@ if 'processed_files' not in st.session_state:
     st.session_state.processed_files = {}
 if 'processing' not in st.session_state:
     st.session_state.processing = False
+if 'session_id' not in st.session_state:
+    # Paylaşılan arka plan işlerinde bu oturumu bekleyen olarak tanımlar
+    st.session_state.session_id = uuid.uuid4().hex
+if 'ingest_jobs' not in st.session_state:
+    st.session_state.ingest_jobs = {}
+if 'ingest_status' not in st.session_state:
+    st.session_state.ingest_status = {}
+if 'data_version' not in st.session_state:
+    st.session_state.data_version = None
+if 'dataset' not in st.session_state:
+    st.session_state.dataset = CombinedDataset()
+if 'upload_hashes' not in st.session_state:
+    st.session_state.upload_hashes = {}
+if 'file_metrics' not in st.session_state:
+    st.session_state.file_metrics = {}
 if 'active_tab' not in st.session_state:
     st.session_state.active_tab = 0
 
@@ -31,129 +74,68 @@ uploaded_files = st.sidebar.file_uploader(
     type="pdf",
     accept_multiple_files=True
 )
+show_text = st.sidebar.checkbox("📄 Çıkarılan metni göster", value=False)
 
 
-def get_file_hash(file):
-    """Dosya hash'ini hesaplar"""
-    file.seek(0)
-    content = file.read()
-    file.seek(0)
-    return hashlib.md5(content).hexdigest()
-
-
-def get_city_name(filename):
-    """Dosya adından şehir ismini çıkarır"""
-    # .pdf uzantısını kaldır ve büyük harfe çevir
-    city_name = os.path.splitext(filename)[0].upper()
-    return city_name
-
-
-def extract_text(pdf_file):
-    """PDF dosyasından metin çıkarır"""
-    text = ""
-    try:
-        with pdfplumber.open(pdf_file) as pdf:
-            total_pages = len(pdf.pages)
-
-            progress_bar = st.progress(0)
-            progress_text = st.empty()
-
-            for i, page in enumerate(pdf.pages):
-                progress = (i + 1) / total_pages
-                progress_bar.progress(progress)
-                progress_text.text(f"Sayfa {i + 1}/{total_pages} işleniyor...")
-
-                t = page.extract_text()
-                if t:
-                    text += t + "\n"
-
-            progress_bar.empty()
-            progress_text.empty()
-
-            # "YAŞ KATILIM BARAJINI GEÇTİ" satırlarını sil
-            lines = text.split('\n')
-            cleaned_lines = []
-
-            for line in lines:
-                if "YAŞ KATILIM BARAJINI GEÇTİ" not in line:
-                    cleaned_lines.append(line)
-
-            text = '\n'.join(cleaned_lines)
-
-            # "50m:" ile başlayan satırları sil
-            lines = text.split('\n')
-            cleaned_lines = []
-
-            for line in lines:
-                if not line.strip().startswith("50m:"):
-                    cleaned_lines.append(line)
+@st.cache_resource
+def get_parse_cache():
+    """Tüm oturumların paylaştığı disk önbelleği"""
+    return ParseCache()
 
-            text = '\n'.join(cleaned_lines)
 
-            # "SW", "Puanlar", "BAŞHAKEM", "Splash" ile başlayan ve "Sonuçlar" içeren satırları sil
-            lines = text.split('\n')
-            cleaned_lines = []
+@st.cache_resource
+def get_page_cache():
+    """Sayfa düzeyinde önbellek - yeniden yayınlanan dosyalarda yalnızca değişen sayfalar işlenir"""
+    return PageCache()
 
-            for line in lines:
-                line_stripped = line.strip()
-                if not (line_stripped.startswith("SW") or
-                        line_stripped.startswith("Puanlar") or
-                        line_stripped.startswith("BAŞHAKEM") or
-                        line_stripped.startswith("Splash") or
-                        line_stripped.startswith("ANTALYA") or
-                        "MÜSABAKASI" in line_stripped or
-                        "BARAJLARI" in line_stripped or
-                        "Sonuçlar" in line_stripped):
-                    cleaned_lines.append(line)
 
-            text = '\n'.join(cleaned_lines)
+# Arka planda işlenen dosyaların durumu bu aralıkla (sn) yoklanır
+INGEST_POLL_SECONDS = 1.0
 
-            # OCR hatalarını düzelt
-            lines = text.split('\n')
-            corrected_lines = []
 
-            for line in lines:
-                corrected_line = line
+@st.cache_resource
+def get_ingest_queue():
+    """Arka plan işleme kuyruğu - tüm oturumlar aynı işçi havuzunu paylaşır"""
+    return IngestQueue()
 
-                corrected_line = re.sub(r'Kulü(\d+)b:ü(\d+\.\d+)', r'Kulübü \1:\2', corrected_line)
-                corrected_line = re.sub(r'Kulüb(\d+)ü:(\d+\.\d+)', r'Kulübü \1:\2', corrected_line)
 
-                # ü ile rakam arasına boşluk ekle (sadece boşluk yoksa)
-                corrected_line = re.sub(r'Kulübü(?! )(\d+\.\d+)', r'Kulübü \1', corrected_line)
-
-                corrected_line = corrected_line.replace("Kulü3b:ü", "Kulübü ")
-                corrected_line = corrected_line.replace("Kulü1b:ü", "Kulübü ")
-                corrected_line = corrected_line.replace("Kulüb1ü", "Kulübü")
-                corrected_line = corrected_line.replace("Kulub1ü", "Kulübü")
-                corrected_line = corrected_line.replace("Kulub1", "Kulübü")
-
-                corrected_line = re.sub(r'Kulübü(\d+):(\d+\.\d+)', r'Kulübü \1:\2', corrected_line)
-
-                corrected_lines.append(corrected_line)
-
-            text = '\n'.join(corrected_lines)
-
-            # TXT dosyası olarak indirme seçeneği
-            if text.strip():
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"extracted_text_{timestamp}.txt"
-
-                st.download_button(
-                    label="📄 Metni TXT olarak İndir",
-                    data=text,
-                    file_name=filename,
-                    mime="text/plain"
-                )
-
-                # Metin önizleme
-                with st.expander("📋 Çıkarılan Metin Önizleme", expanded=False):
-                    st.text_area("", text, height=300)
+@st.fragment(run_every=INGEST_POLL_SECONDS)
+def watch_ingestion():
+    """
+    Arka planda işlenen dosyaların durum tablosu. Bir dosya bittiğinde sayfa yeniden çizilir
+    ve şehir birleşik veriye eklenir; beklerken yalnızca bu bölüm yenilenir.
+    """
+    queue = get_ingest_queue()
+    jobs = [(key, queue.get(key)) for key in st.session_state.ingest_jobs]
+    if any(job is None or job.done() for _, job in jobs):
+        st.rerun()
+
+    for key, job in jobs:
+        set_ingest_status(job.name, "⚙️ İşleniyor" if job.state == RUNNING else "⏳ Sırada", seconds=job.seconds)
+    total = len(st.session_state.ingest_status)
+    if total:
+        pending = set(st.session_state.ingest_jobs.values())
+        finished = sum(1 for name in st.session_state.ingest_status if name not in pending)
+        st.progress(finished / total, text=f"📥 {finished}/{total} dosya işlendi - biten şehirler kullanılabilir")
+        st.dataframe(pd.DataFrame(st.session_state.ingest_status.values()), hide_index=True)
+
+
+def show_extracted_text(text):
+    """Çıkarılan metin için indirme butonu ve önizleme gösterir"""
+    if text.strip():
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"extracted_text_{timestamp}.txt"
 
-        return text
+        st.download_button(
+            label="📄 Metni TXT olarak İndir",
+            data=text,
+            file_name=filename,
+            mime="text/plain"
+        )
 
-    except Exception as e:
-        st.error(f"PDF okuma hatası: {str(e)}")
-        return ""
+        # Metin önizleme
+        with st.expander("📋 Çıkarılan Metin Önizleme", expanded=False):
+            st.text_area("", text, height=300)
 
 
 def save_text_to_file(text, file_path=None):
@@ -173,312 +155,151 @@ def save_text_to_file(text, file_path=None):
         return None
 
 
-def parse_results(text, city_name):
-    """Metin verilerini parse eder ve DataFrame'e çevirir - gelişmiş normalizasyon ile"""
-    results = []
-    current_race_base = ""
-    current_age = ""
-    current_gender = ""
-
-    lines = text.splitlines()
-    total_lines = len(lines)
-
+def extract_and_parse(pdf_file, city_name, file_hash=None, jobs=None, show_text=False):
+    """
+    PDF'i akış halinde işler: sayfalar çıkarıldıkça satırlar temizlenir ve parse edilir.
+    Sonuç Excel sayfasıyla paylaşılan depoya da yazılır (bkz. swim.store).
+    show_text ise temizlenmiş metin ayrıca biriktirilip indirme için gösterilir.
+    """
     progress_bar = st.progress(0)
     progress_text = st.empty()
 
-    try:
-        for i, line in enumerate(lines):
-            line = line.strip()
-
-            if i % 50 == 0:
-                progress = i / total_lines
-                progress_bar.progress(progress)
-                progress_text.text(f"Satır {i}/{total_lines} işleniyor...")
-
-            # Gereksiz satırları atla
-            if (line.startswith("SW ") or
-                    "KATILIM BARAJINI GEÇTİ" in line or
-                    "50m:" in line or "100m:" in line or "150m:" in line or "200m:" in line or
-                    line.startswith("Puanlar:") or
-                    "BARAJLARI" in line or
-                    "Sonuçlar" in line or
-                    line.startswith("Splash Meet") or
-                    "BAŞHAKEM" in line or
-                    "ETAP MÜSABAKASI" in line or
-                    "YB Zaman Derece" in line):
-                continue
+    def on_progress(done, total_pages):
+        progress_bar.progress(done / total_pages)
+        progress_text.text(f"Sayfa {done}/{total_pages} işlendi...")
 
-            # Yarış başlığı yakala
-            if line.startswith("Yarış") and "4 x" not in line and "4x" not in line:
-                current_race_base = line
-
-                # Cinsiyet belirle ve normalize et
-                if "Kızlar" in line:
-                    current_gender = "Kızlar"
-                elif "Erkekler" in line:
-                    current_gender = "Erkekler"
-                elif "Kız" in line:
-                    current_gender = "Kızlar"  # Normalize et
-                elif "Erkek" in line:
-                    current_gender = "Erkekler"  # Normalize et
-                else:
-                    current_gender = ""
-
-                # Tek yaş formatı kontrolü
-                single_age_match = re.search(r"(\d{1,2}) yaş$", line.strip())
-                if single_age_match:
-                    current_age = single_age_match.group(1)
-                    current_race_base = re.sub(r",?\s*\d{1,2}\s*yaş$", "", line).strip()
-                else:
-                    # Yaş aralığını temizle
-                    current_race_base = re.sub(r"\s*\d{1,2}\s*-\s*\d{1,2}\s*yaşları?\s*arası", "", line).strip()
-                    current_race_base = re.sub(r"\s*\d{1,2}\s*yaş", "", current_race_base).strip()
-                    current_race_base = re.sub(r"\s*yaşları\s*arası", "", current_race_base).strip()
-                    current_age = ""
-                continue
-
-            # Yaş grubu başlığı
-            age_match = re.match(r"^(\d{1,2}) yaş$", line.strip())
-            if age_match and current_race_base:
-                current_age = age_match.group(1)
-                continue
-
-            # Sporcu satırı yakala
-            if current_race_base and current_age and current_gender:
-                # OCR tolerant parsing
-                parsed_athlete = parse_athlete_line_robust(line)
-
-                if parsed_athlete:
-                    # Zaman kontrolü
-                    seconds = time_to_seconds(parsed_athlete["time"])
-                    if seconds is None or seconds <= 0:
-                        continue
-
-                    # Yarış başlığını oluştur
-                    current_race = f"{current_race_base}, {current_age} yaş" if current_age else current_race_base
-
-                    # Normalize edilmiş kategori oluştur
-                    race_category = normalize_race_category_advanced(current_race, current_gender, current_age)
-
-                    results.append({
-                        "Şehir": city_name,
-                        "Yarış": current_race,  # Orijinal yarış adı
-                        "Yarış_Kategori": race_category,  # Normalize edilmiş kategori
-                        "Cinsiyet": current_gender,
-                        "Yaş": current_age,
-                        "YB": parsed_athlete["yb"],
-                        "İsim": parsed_athlete["name"],
-                        "Kulüp": parsed_athlete["club"],
-                        "Zaman": parsed_athlete["time"],
-                        "Puan": parsed_athlete["score"]
-                    })
+    kept_lines = []
 
+    try:
+        df = load_meet(pdf_file, city_name, file_hash=file_hash, jobs=jobs, on_progress=on_progress,
+                       on_line=kept_lines.append if show_text else None, page_cache=get_page_cache())["results"]
+    except Exception as e:
+        st.error(f"PDF okuma hatası: {str(e)}")
+        return pd.DataFrame()
     finally:
-        progress_bar.progress(1.0)
-        progress_text.text("İşlem tamamlandı!")
         progress_bar.empty()
         progress_text.empty()
 
-        if results:
-            st.success(f"✅ Toplam {len(results)} sporcu kaydı işlendi")
-
-            categories = {}
-            for result in results:
-                cat = result["Yarış_Kategori"]
-                categories[cat] = categories.get(cat, 0) + 1
-
-        else:
-            st.warning("⚠️ Hiç sporcu kaydı bulunamadı!")
-
-    return pd.DataFrame(results)
-
-
-def parse_athlete_line_robust(line):
-    """OCR hatalarını tolere eden sporcu satırı parse'ı"""
+    if show_text:
+        show_extracted_text('\n'.join(kept_lines))
 
-    # Normal format dene
-    match = re.match(
-        r"^([A-ZÇĞİÖŞÜ][a-zçğıöşüA-ZÇĞİÖŞÜ\s\-'İıĞğÇçŞşÖöÜü]+?)\s+(\d{2})\s+(.+?)\s+((?:\d+:)?\d{1,2}[.,]\d{2})\s+(\d+)$",
-        line
-    )
+    report_parse_result(df)
+    return df
 
-    if match:
-        return {
-            "name": match.group(1).strip(),
-            "yb": int(match.group(2)),
-            "club": match.group(3).strip(),
-            "time": match.group(4).strip().replace(',', '.'),
-            "score": int(match.group(5))
-        }
 
-    # OCR hatası için agresif parsing
-    time_point_match = re.search(r"(\d{1,2}[:.]\d{2})\s+(\d+)$", line)
-    if time_point_match:
-        time_raw = time_point_match.group(1).replace(':', '.')
-        score_raw = int(time_point_match.group(2))
-
-        remaining = re.sub(r"\s*\d{1,2}[:.]\d{2}\s+\d+$", "", line).strip()
-
-        name_yb_match = re.match(r"^([A-ZÇĞİÖŞÜ][a-zçğıöşüA-ZÇĞİÖŞÜ\s\-'İıĞğÇçŞşÖöÜü]+?)\s+(\d{2})\s+(.+)$", remaining)
+def report_parse_result(df):
+    """Parse sonucunu kullanıcıya bildirir"""
+    if not df.empty:
+        st.success(f"✅ Toplam {len(df)} sporcu kaydı işlendi")
+    else:
+        st.warning("⚠️ Hiç sporcu kaydı bulunamadı!")
 
-        if name_yb_match:
-            name_raw = name_yb_match.group(1).strip()
-            yb_raw = int(name_yb_match.group(2))
-            club_raw = name_yb_match.group(3).strip()
 
-            # OCR hata düzeltmeleri
-            club_raw = re.sub(r"1ü:?$", "ü", club_raw)
-            club_raw = re.sub(r":+$", "", club_raw)
-            club_raw = re.sub(r"\d+$", "", club_raw).strip()
+# Tüm Sonuçlar sekmesinde gösterilen sütunlar (Yarış_Kategori gizli)
+DISPLAY_COLUMNS = ['Şehir', 'Yarış', 'Cinsiyet', 'Yaş', 'İsim', 'YB', 'Kulüp', 'Zaman', 'Puan']
 
-            return {
-                "name": name_raw,
-                "yb": yb_raw,
-                "club": club_raw,
-                "time": time_raw,
-                "score": score_raw
-            }
+# Metin olarak sıralanamayan sütunların sıralama anahtarı
+SORT_KEYS = {'Zaman': 'Süre_cs'}
 
-    return None
+PAGE_SIZES = [25, 50, 100, 250]
 
 
-def normalize_race_category_advanced(race_title, gender, age):
+@st.fragment
+def show_results_table(table):
     """
-    Gelişmiş yarış kategorisi normalizasyonu
-    Farklı formatları tek standarda çevirir
+    Sayfalı sonuç tablosu. Arama ve sıralama sunucuda Arrow tablosu üzerinde yapılır;
+    tarayıcıya yalnızca görünen sayfa gönderilir. Sayfa değiştirmek yalnızca bu bölümü yeniden çizer.
     """
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    with col1:
+        search_text = st.text_input("🔎 Ara", key="results_search").strip()
+    with col2:
+        search_column = st.selectbox("Aranan sütun", ['Tümü'] + DISPLAY_COLUMNS, key="results_search_column")
+    with col3:
+        sort_column = st.selectbox("Sırala", ['Sıralama yok'] + DISPLAY_COLUMNS, key="results_sort")
+    with col4:
+        descending = st.toggle("Azalan", key="results_descending")
+
+    with timer("results_query"):
+        if search_text:
+            columns = DISPLAY_COLUMNS if search_column == 'Tümü' else [search_column]
+            table = table.filter(search_mask(table, columns, search_text))
+        indices = None
+        if sort_column != 'Sıralama yok' and table.num_rows:
+            indices = sort_indices(table, SORT_KEYS.get(sort_column, sort_column), ascending=not descending)
+
+    total_rows = table.num_rows
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        page_size = st.selectbox("Sayfa boyutu", PAGE_SIZES, index=1, key="results_page_size")
+    page_count = max(1, -(-total_rows // page_size))
+
+    # Arama, sıralama ya da filtre değişince ilk sayfaya dön
+    signature = (search_text, search_column, sort_column, descending, page_size, total_rows)
+    if st.session_state.get("results_signature") != signature:
+        st.session_state.results_signature = signature
+        st.session_state.results_page = 1
+    with col2:
+        page_number = st.number_input(f"Sayfa (toplam {page_count})", min_value=1, max_value=page_count, step=1,
+                                      key="results_page")
 
-    # Önce metni temizle
-    cleaned_title = race_title.strip()
-
-    # Yarış numarası çıkar
-    race_match = re.search(r"Yarış\s+(\d+)", cleaned_title)
-    race_num = race_match.group(1) if race_match else "1"
-
-    # Mesafe çıkar
-    distance_match = re.search(r"(\d+)m", cleaned_title)
-    distance = distance_match.group(0) if distance_match else ""
-
-    # Stil çıkar
-    style_map = {
-        "serbest": "Serbest",
-        "sırtüstü": "Sırtüstü",
-        "sırt": "Sırtüstü",
-        "kurbağalama": "Kurbağalama",
-        "kurbağa": "Kurbağalama",
-        "kelebek": "Kelebek",
-        "karışık": "Karışık"
-    }
-
-    style = ""
-    title_lower = cleaned_title.lower()
-    for key, value in style_map.items():
-        if key in title_lower:
-            style = value
-            break
-
-    # Cinsiyet standartlaştır
-    std_gender = ""
-    if gender in ["Kız", "Kızlar"]:
-        std_gender = "Kızlar"
-    elif gender in ["Erkek", "Erkekler"]:
-        std_gender = "Erkekler"
-    else:
-        std_gender = gender
-
-    # Standart format oluştur: "Yarış X, Cinsiyet, Mesafe Stil, Yaş yaş"
-    if all([race_num, std_gender, distance, style, age]):
-        return f"Yarış {race_num}, {std_gender}, {distance} {style}, {age} yaş"
-    else:
-        # Eksik bilgi varsa fallback
-        return cleaned_title
-
-
-def normalize_race_category(race_title, gender, age):
-    """Eski fonksiyon - geriye uyumluluk için"""
-    return normalize_race_category_advanced(race_title, gender, age)
-
-
-# Test fonksiyonu
-def test_normalization():
-    """Normalizasyon testleri"""
-    test_cases = [
-        ("Yarış 10 Erkekler, 200m Sırtüstü, 11 yaş", "Erkekler", "11"),
-        ("Yarış 10, Erkekler, 200m Sırtüstü, 11 yaş", "Erkekler", "11"),
-        ("Yarış 1 Kızlar, 100m Serbest, 10 yaş", "Kızlar", "10"),
-        ("Yarış 1, Kızlar, 100m Serbest, 10 yaş", "Kızlar", "10"),
-        ("Yarış 5, Erkek, 50m Kelebek, 12 yaş", "Erkek", "12"),
-    ]
-
-    print("🧪 Yarış Normalizasyon Testi:")
-    print("=" * 60)
-
-    results = []
-    for race_title, gender, age in test_cases:
-        normalized = normalize_race_category_advanced(race_title, gender, age)
-        results.append(normalized)
-        print(f"Girdi: {race_title}")
-        print(f"Çıktı: {normalized}")
-        print("-" * 40)
-
-    # Kritik test: Aynı yarışlar birleşiyor mu?
-    result1 = results[0]  # "Yarış 10 Erkekler, 200m Sırtüstü, 11 yaş"
-    result2 = results[1]  # "Yarış 10, Erkekler, 200m Sırtüstü, 11 yaş"
-
-    print(f"\n✅ Birleştirme Testi:")
-    print(f"Format 1: {result1}")
-    print(f"Format 2: {result2}")
-    print(f"Aynı mı? {'✅ EVET' if result1 == result2 else '❌ HAYIR'}")
+    offset = (page_number - 1) * page_size
+    visible = compact(page(table.select(DISPLAY_COLUMNS), offset, page_size, indices))
+    payload_bytes = payload_size(visible)
+    count("payload_bytes_results", payload_bytes)
+    count("rows_serialized", visible.num_rows)
 
-    return result1 == result2
+    if total_rows == 0:
+        st.warning("⚠️ Aramaya uygun sonuç bulunamadı.")
+        return
 
-
-def time_to_seconds(time_str):
-    """Zaman stringini saniyeye çevirir"""
-    try:
-        if ":" in time_str:
-            parts = time_str.split(":")
-            return int(parts[0]) * 60 + float(parts[1])
-        else:
-            time_val = float(time_str)
-            # Sıfır veya çok küçük değerleri geçersiz say
-            return time_val if time_val > 0 else None
-    except:
-        return None
+    st.dataframe(visible, use_container_width=True, hide_index=True)
+    st.caption(f"{offset + 1}–{offset + visible.num_rows} / {total_rows} satır · "
+               f"gönderilen veri {payload_bytes / 1024:.1f} KB")
 
 
 @st.fragment
-def show_top_5_by_race(df):
+def show_top_5_by_race(leaderboard, table, mask):
+    """
+    Yarış bazlı en iyi performanslar - veri sürümü başına kurulan lider tablosundan okunur.
+    Yarış ya da sıralama ölçütü değiştirmek sıralama yapmaz; filtre seçimi (mask) sıralı satırlara uygulanır.
+    """
     st.subheader("🏆 Performanslar")
 
-    # Sadece yarış filtresi
-    race_options = ['Tümü'] + sorted(df['Yarış'].unique())
-    selected_race = st.selectbox("🏊 Yarış Türü Seçin", race_options, key="top5_race")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        # Yarışlar normalize kategoriye göre (şehirler arası aynı yarış tek seçenek)
+        race_options = ['Tümü'] + leaderboard.race_options(mask)
+        selected_race = st.selectbox("🏊 Yarış Türü Seçin", race_options, key="top5_race")
+    with col2:
+        order_by = st.radio("Sıralama", ["Süre", "FINA Puanı"], horizontal=True, key="top5_order")
 
-    # Filtreleme uygula (sadece yarış filtresi)
-    if selected_race != 'Tümü':
-        filtered_df = df[df['Yarış'] == selected_race]
-    else:
-        filtered_df = df.copy()
+    race = None if selected_race == 'Tümü' else selected_race
+    with timer("leaderboard_lookup"):
+        rows = leaderboard.top(race, LEADERBOARD_SIZE, by=ORDER_TIME if order_by == "Süre" else ORDER_POINTS,
+                               mask=mask)
+        total_in_category = leaderboard.count(race, mask)
 
     # Sonuçları göster
-    if not filtered_df.empty:
-        # En iyi 50 performansı göster (daha fazla veri için)
-        top_performers = filtered_df.nsmallest(100, 'Saniye')[
-            ['İsim', 'Yarış', 'Şehir', 'Cinsiyet', 'Yaş', 'Zaman', 'Puan', 'Kulüp']]
+    if len(rows) > 0:
+        top_table = compact(take_rows(table, rows).select(
+            ['İsim', 'Yarış', 'Şehir', 'Cinsiyet', 'Yaş', 'Zaman', 'Puan', 'Kulüp']))
+        # Yarış içi dereceler (tüm şehirler) önceden hesaplanmıştır
+        top_table = top_table.append_column("Süre Derecesi", [leaderboard.time_ranks[rows]])
+        top_table = top_table.append_column("Puan Derecesi", [leaderboard.points_ranks[rows]])
+        count("payload_bytes_top", payload_size(top_table))
+        top_performers = top_table.to_pandas()
 
         # Sıralama numarası ekle
-        top_performers = top_performers.reset_index(drop=True)
         top_performers.index = range(1, len(top_performers) + 1)
         top_performers.index.name = 'Sıra'
 
         st.dataframe(top_performers, use_container_width=True)
 
         # Özet bilgi
-        total_in_category = len(filtered_df)
         shown_results = len(top_performers)
 
-        if selected_race != 'Tümü':
+        if race is not None:
             st.info(
                 f"📊 **{selected_race}** kategorisinde "
                 f"{shown_results} yarışmacı gösteriliyor.")
@@ -489,97 +310,87 @@ def show_top_5_by_race(df):
         st.warning("⚠️ Seçilen kriterlere uygun veri bulunamadı.")
 
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_category_ranks(data_key, _df):
+    """
+    Kategori içi FINA puanı sıralamaları - (veri sürümü, filtre seçimleri) başına bir kez hesaplanır.
+    DataFrame'in kendisi önbellek anahtarına girmez (her tıklamada hash'lenmez).
+    """
+    return category_ranks(_df)
+
+
+def athlete_options(df, athlete_labels):
+    """Filtrelenmiş verideki sporcu kimlikleri -> görünen isim, isme göre sıralı"""
+    present = df[[ATHLETE_ID_COLUMN, 'YB']].drop_duplicates(ATHLETE_ID_COLUMN)
+    names = {athlete_id: athlete_labels.get(athlete_id, athlete_id) for athlete_id in present[ATHLETE_ID_COLUMN]}
+
+    # Aynı görünen isim birden çok sporcuda varsa doğum yılı eklenir
+    repeated = pd.Series(names).duplicated(keep=False)
+    birth_years = dict(zip(present[ATHLETE_ID_COLUMN], present['YB']))
+    for athlete_id in repeated[repeated].index:
+        names[athlete_id] = f"{names[athlete_id]} ({birth_years[athlete_id]})"
+
+    return dict(sorted(names.items(), key=lambda item: (item[1], item[0])))
+
+
 @st.fragment
-def show_athlete_analysis(df):
-    """Sporcu bazlı analiz - FINA puanına göre sıralama ile"""
+def show_athlete_analysis(df, data_key, athlete_labels):
+    """
+    Sporcu bazlı analiz - FINA puanına göre sıralama ile.
+    Sporcular isim yerine kimlik (Sporcu_ID) ile gruplanır; OCR ile farklı yazılmış
+    isimler aynı sporcuda birleşir.
+    """
     st.subheader("👤 Sporcu Analizi")
 
     # Sporcu seçimi - filtrelenmiş veriyi kullan
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        # Filtrelenmiş veriden sporcu isimlerini al
-        available_athletes = sorted(df['İsim'].unique())
+        # Filtrelenmiş veriden sporcuları al; aynı isimli farklı sporcular doğum yılı ile ayrılır
+        athlete_names = athlete_options(df, athlete_labels)
 
-        if len(available_athletes) == 0:
+        if len(athlete_names) == 0:
             st.warning("⚠️ Seçilen filtreler ile sporcu bulunamadı.")
             return
 
-        athlete_options = ['Sporcu seçin...'] + available_athletes
-        selected_athlete = st.selectbox("🏊 Sporcu Seçin", athlete_options, key="athlete_select")
+        options = ['Sporcu seçin...'] + list(athlete_names)
+        selected_athlete = st.selectbox("🏊 Sporcu Seçin", options, key="athlete_select",
+                                        format_func=lambda option: athlete_names.get(option, option))
 
     with col2:
         if selected_athlete != 'Sporcu seçin...':
             # Seçilen sporcunun filtrelenmiş verideki bilgileri
-            athlete_df = df[df['İsim'] == selected_athlete]
+            athlete_df = df[df[ATHLETE_ID_COLUMN] == selected_athlete]
             st.metric("📊 Filtrelenmiş Yarış", len(athlete_df))
             if not athlete_df.empty:
                 st.metric("🏛️ Kulüp", athlete_df['Kulüp'].iloc[0])
 
     if selected_athlete != 'Sporcu seçin...':
-        athlete_df = df[df['İsim'] == selected_athlete]
+        athlete_df = df[df[ATHLETE_ID_COLUMN] == selected_athlete]
 
         if not athlete_df.empty:
             # Sporcunun tüm yarışları - FINA puanına göre sıralama ile
-            st.subheader(f"🏊 {selected_athlete} - Yarış Sonuçları")
-
-            # Her yarış için sıralamayı hesapla
-            results_with_rank = []
-
-            for _, row in athlete_df.iterrows():
-                # Yarış kategorisini belirle
-                if 'Yarış_Kategori' in row and pd.notna(row['Yarış_Kategori']) and row['Yarış_Kategori'] != 'N/A':
-                    # Normalize edilmiş kategori kullan - filtrelenmiş veri içinde
-                    same_category = df[df['Yarış_Kategori'] == row['Yarış_Kategori']].copy()
-                    category_name = row['Yarış_Kategori']
-                else:
-                    # Fallback: Manuel kategori oluştur - filtrelenmiş veri içinde
-                    same_category = df[
-                        (df['Yarış'] == row['Yarış']) &
-                        (df['Cinsiyet'] == row['Cinsiyet']) &
-                        (df['Yaş'] == row['Yaş'])
-                        ].copy()
-                    category_name = f"{row['Yarış']} - {row['Cinsiyet']} {row['Yaş']} yaş"
-
-                if len(same_category) > 0:
-                    # DEĞİŞEN KISIM: FINA puanına göre sıralama (yüksek puan = daha iyi)
-                    same_category_sorted = same_category.sort_values('Puan', ascending=False)
-
-                    # Sporcunun bu kategorideki FINA puanını al
-                    athlete_score = row['Puan']
-
-                    # Sporcunun kaçıncı sırada olduğunu hesapla (puana göre)
-                    athlete_rank = 1
-                    for _, competitor in same_category_sorted.iterrows():
-                        if competitor['Puan'] > athlete_score:
-                            athlete_rank += 1
-                        elif competitor['Puan'] == athlete_score and competitor['İsim'] != row['İsim']:
-                            # Aynı puana sahip farklı sporcular varsa, alfabetik sıraya bak
-                            if competitor['İsim'] < row['İsim']:
-                                athlete_rank += 1
-
-                    total_athletes = len(same_category)
-
-                    # Debug için puan karşılaştırması
-                    better_scores = same_category[same_category['Puan'] > athlete_score]
-                    calculated_rank = len(better_scores) + 1
-
-                    results_with_rank.append({
-                        'Yarış': row['Yarış'],
-                        'Şehir': row['Şehir'],
-                        'Kategori': f"{row['Cinsiyet']} {row['Yaş']} yaş",
-                        'Zaman': row['Zaman'],
-                        'Puan_Debug': f"{athlete_score} FINA puan",
-                        'Puan': row['Puan'],
-                        'Sıralama': f"{calculated_rank}/{total_athletes}",
-                        'Derece': calculated_rank,
-                        'Yarış_Kategori': category_name,
-                        'Daha_Yüksek_Puan_Var': len(better_scores)
-                    })
+            st.subheader(f"🏊 {athlete_names[selected_athlete]} - Yarış Sonuçları")
+
+            # Kategori sıralamaları tüm veri için bir kez hesaplanır, sporcu satırları indeks ile eşlenir
+            ranks = get_category_ranks(data_key, df).loc[athlete_df.index]
+
+            results_df = pd.DataFrame({
+                'Yarış': athlete_df['Yarış'],
+                'Şehir': athlete_df['Şehir'],
+                'Kategori': athlete_df['Cinsiyet'].astype(str) + ' ' + athlete_df['Yaş'].astype(str) + ' yaş',
+                'Zaman': athlete_df['Zaman'],
+                'Puan_Debug': athlete_df['Puan'].astype(str) + ' FINA puan',
+                'Puan': athlete_df['Puan'],
+                'Sıralama': ranks['Derece'].astype(str) + '/' + ranks['Kategori_Sayısı'].astype(str),
+                'Derece': ranks['Derece'],
+                'Yarış_Kategori': ranks['Kategori_Adı'],
+                'Daha_Yüksek_Puan_Var': ranks['Derece'] - 1
+            }).reset_index(drop=True)
+            results_with_rank = results_df.to_dict('records')
 
             if results_with_rank:
-                # DataFrame oluştur ve en iyi dereceye göre sırala
-                results_df = pd.DataFrame(results_with_rank)
+                # En iyi dereceye göre sırala
                 results_df = results_df.sort_values('Derece', ascending=True)
 
                 # Sütun sıralaması - temiz görünüm
@@ -653,19 +464,10 @@ def show_athlete_analysis(df):
             st.warning("⚠️ Seçilen sporcu için veri bulunamadı.")
 
 
-def show_club_analysis(df):
-    """Kulüp bazında analiz"""
+def show_club_analysis(club_stats):
+    """Kulüp bazında analiz - özet dosya başına kısmi toplamlardan birleştirilmiştir"""
     st.subheader("Kulüp Bazında Performans")
 
-    club_stats = df.groupby('Kulüp').agg({
-        'Puan': ['mean', 'max', 'count'],
-        'Saniye': 'mean',
-        'Şehir': lambda x: ', '.join(sorted(x.unique()))
-    }).round(0)
-
-    club_stats.columns = ['Ortalama Puan', 'En Yüksek Puan', 'Sporcu Sayısı', 'Ortalama Süre', 'Katıldığı Şehirler']
-    club_stats = club_stats.sort_values('Ortalama Puan', ascending=False)
-
     # Sadece 2 veya daha fazla sporcusu olan kulüpleri göster
     club_stats_filtered = club_stats[club_stats['Sporcu Sayısı'] >= 2]
 
@@ -677,159 +479,326 @@ def show_club_analysis(df):
         st.caption("Tüm kulüpler gösteriliyor.")
 
 
-def process_files(uploaded_files):
-    """Dosyaları işler ve session state'e kaydeder"""
+def get_filter_index(df):
+    """Veri sürümü değiştiğinde filtre indeksini yeniden kurar"""
+    index = st.session_state.get('filter_index')
+    if index is None or index.version != st.session_state.data_version:
+        index = FilterIndex(df, version=st.session_state.data_version)
+        st.session_state.filter_index = index
+    return index
+
+
+def upload_hash(uploaded_file):
+    """Dosya hash'i yükleme nesnesi başına bir kez hesaplanır - yeniden çizimlerde dosya tekrar okunmaz"""
+    upload_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    hashes = st.session_state.upload_hashes
+    if upload_id not in hashes:
+        with timer("hash"):
+            hashes[upload_id] = get_file_hash(uploaded_file)
+    return upload_id, hashes[upload_id]
+
+
+def set_ingest_status(name, state, records=None, seconds=None):
+    st.session_state.ingest_status[name] = {
+        "Dosya": name,
+        "Durum": state,
+        "Kayıt": records,
+        "Süre (sn)": None if seconds is None else round(seconds, 2),
+    }
+
+
+def collect_upload(uploaded_file, key, metrics):
+    """
+    Dosyayı arka plan kuyruğuna gönderir ya da biten işin sonucunu alır.
+    Sonuç DataFrame'i (hata varsa boş) döner; iş sürüyorsa None.
+    """
+    file_hash, city_name = key
+    name = uploaded_file.name
+    queue = get_ingest_queue()
+    session_id = st.session_state.session_id
+
+    # Excel sayfasında ya da başka bir oturumda parse edilmiş olabilir
+    if file_hash in get_parse_store():
+        return load_meet(uploaded_file, city_name, file_hash=file_hash)["results"]
+
+    # Aynı dosyayı başka bir oturum göndermiş olabilir - iş paylaşılır, bu oturum da bekler
+    job = queue.watch(key, session_id)
+    if job is None:
+        job = queue.submit(key, name, read_pdf_bytes(uploaded_file), session_id)
+    st.session_state.ingest_jobs[key] = name
+
+    if not job.done():
+        set_ingest_status(name, "⚙️ İşleniyor" if job.state == RUNNING else "⏳ Sırada", seconds=job.seconds)
+        return None
+
+    queue.release(key, session_id)
+    st.session_state.ingest_jobs.pop(key, None)
+    meet, error, job_metrics = job.result()
+    if job_metrics:
+        metrics.merge(job_metrics)
+    if error:
+        set_ingest_status(name, f"❌ {error}", seconds=job.seconds)
+        return pd.DataFrame()
+
+    get_parse_store().put(file_hash, meet)
+    df = load_meet(uploaded_file, city_name, file_hash=file_hash)["results"]
+    set_ingest_status(name, "✅ Tamam", records=len(df), seconds=job.seconds)
+    return df
+
+
+def process_files(uploaded_files, show_text=False):
+    """
+    Yeni yüklenen dosyaları işleyip birleşik veriye bir kez ekler, kaldırılanları düşer.
+    Yeni dosyalar arka planda parse edilir; biten dosyalar geldikçe eklenir, beklerken
+    mevcut şehirlerle çalışılabilir. Dosya listesi değişmediyse birleşik DataFrame ve veri sürümü aynı kalır.
+    """
     if not uploaded_files:
         return pd.DataFrame()
 
-    all_data = []
+    dataset = st.session_state.dataset
+    data_keys = []
+    upload_ids = set()
+    pending = []
 
     for uploaded_file in uploaded_files:
-        file_hash = get_file_hash(uploaded_file)
-        city_name = get_city_name(uploaded_file.name)
-
-        # Eğer dosya daha önce işlenmişse cache'den al
-        if file_hash in st.session_state.processed_files:
-            all_data.append(st.session_state.processed_files[file_hash])
-            continue
+        metrics = Metrics(label=uploaded_file.name)
 
-        # Yeni dosya işle
-        text = extract_text(uploaded_file)
+        with metrics.activate():
+            upload_id, file_hash = upload_hash(uploaded_file)
+            upload_ids.add(upload_id)
+            city_name = get_city_name(uploaded_file.name)
+            key = (file_hash, city_name)
+            data_keys.append(key)
 
-        if text:
-            df = parse_results(text, city_name)
+            # Birleşik veride zaten var
+            if key in dataset:
+                continue
 
-            if not df.empty:
-                # Süreyi saniyeye çevir ve geçersiz kayıtları filtrele
-                df["Saniye"] = df["Zaman"].apply(time_to_seconds)
+            # Eğer dosya daha önce işlenmişse cache'den al
+            if file_hash in st.session_state.processed_files:
+                dataset.append(key, st.session_state.processed_files[file_hash])
+                continue
 
-                # Sıfır veya None süre değerlerini kaldır
-                df = df.dropna(subset=['Saniye'])
-                df = df[df['Saniye'] > 0]
+            # Başka bir oturumda işlenmişse disk önbelleğinden al
+            with timer("cache_read"):
+                df = get_parse_cache().get(file_hash)
+            if df is not None:
+                count("cache_hit")
+                df = enforce_schema(df.assign(Şehir=city_name))
+                st.session_state.processed_files[file_hash] = df
+                dataset.append(key, df)
+                st.session_state.file_metrics[uploaded_file.name] = metrics.as_dict()
+                continue
 
-                if df.empty:
+            if show_text:
+                # Çıkarılan metin gösterilecekse dosya bu çizimde işlenir - sayfalar çıkarıldıkça parse edilir
+                df = extract_and_parse(uploaded_file, city_name, file_hash=file_hash, show_text=show_text)
+            else:
+                # Arka plan kuyruğunda işlenir; bitmediyse biten şehirlerle devam edilir
+                df = collect_upload(uploaded_file, key, metrics)
+                if df is None:
+                    pending.append(key)
                     continue
+            dataset.append(key, df)
 
+            if not df.empty:
                 # Cache'e kaydet
                 st.session_state.processed_files[file_hash] = df
-                all_data.append(df)
 
-    # Tüm verileri birleştir
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
+                try:
+                    with timer("cache_write"):
+                        get_parse_cache().put(file_hash, df)
+                except Exception as e:
+                    st.warning(f"Önbelleğe yazılamadı: {str(e)}")
 
-        # Yarış_Kategori sütunu yoksa oluştur (eski cache'ler için)
-        if 'Yarış_Kategori' not in combined_df.columns:
-            combined_df['Yarış_Kategori'] = combined_df.apply(
-                lambda row: normalize_race_category_advanced(row['Yarış'], row['Cinsiyet'], row['Yaş']),
-                axis=1
-            )
+        st.session_state.file_metrics[uploaded_file.name] = metrics.as_dict()
+
+    # Yüklemeden kaldırılan ya da sonucu başka yoldan (önbellek, başka oturum) gelen dosyalar:
+    # bu oturum işi artık beklemez - başka bekleyen yoksa iş iptal edilir
+    dataset.retain(data_keys)
+    for key, name in list(st.session_state.ingest_jobs.items()):
+        if key in data_keys and key not in dataset:
+            continue
+        get_ingest_queue().release(key, st.session_state.session_id)
+        del st.session_state.ingest_jobs[key]
+        if key in dataset:
+            set_ingest_status(name, "✅ Tamam", records=len(st.session_state.processed_files.get(key[0], ())))
+    names = {uploaded_file.name for uploaded_file in uploaded_files}
+    st.session_state.ingest_status = {
+        name: status for name, status in st.session_state.ingest_status.items() if name in names
+    }
+    st.session_state.processing = bool(pending)
+    st.session_state.upload_hashes = {
+        upload_id: file_hash for upload_id, file_hash in st.session_state.upload_hashes.items()
+        if upload_id in upload_ids
+    }
 
-        st.session_state.all_data = combined_df
-        return combined_df
+    combined_df = dataset.frame()
+    st.session_state.all_data = combined_df
+    st.session_state.data_version = dataset.version
+    return combined_df
+
+
+def show_metrics_panel(render_metrics):
+    """Aşama ölçümleri paneli - dosya başına süreler, son çizim süreleri ve JSON indirme"""
+    if not st.sidebar.checkbox("⏱️ Performans ölçümleri", value=False):
+        return
+
+    with st.sidebar.expander("⏱️ Ölçümler", expanded=True):
+        file_metrics = st.session_state.file_metrics
+
+        if file_metrics:
+            rows = []
+            for name, metrics in file_metrics.items():
+                rows.append({
+                    "Dosya": name,
+                    "Toplam (sn)": metrics["total_seconds"],
+                    "Sayfa/sn": metrics.get("pages_per_second"),
+                    **metrics["timings"],
+                    **metrics["counters"],
+                })
+            st.dataframe(pd.DataFrame(rows).set_index("Dosya"), use_container_width=True)
+
+            for name, metrics in file_metrics.items():
+                st.download_button(
+                    label=f"📥 {name} (JSON)",
+                    data=json.dumps(metrics, ensure_ascii=False, indent=2),
+                    file_name=f"{os.path.splitext(name)[0]}_metrics.json",
+                    mime="application/json",
+                    key=f"metrics_{name}"
+                )
 
-    return pd.DataFrame()
+        st.caption("Son çizim (sekmeler)")
+        st.json(render_metrics.as_dict())
 
 
 # Ana uygulama mantığı
 if uploaded_files:
-    df = process_files(uploaded_files)
+    df = process_files(uploaded_files, show_text=show_text)
+    if st.session_state.processing:
+        watch_ingestion()
 
     if not df.empty:
         # Cache bilgisi
         st.sidebar.success(f"📁 {len(st.session_state.processed_files)} dosya hafızada")
         if st.sidebar.button("🔄 Yeniden İşle"):
+            for file_hash in st.session_state.processed_files:
+                get_parse_cache().delete(file_hash)
+                get_parse_store().delete(file_hash)
+            # Sayfa önbelleği de temizlenir - yoksa sayfa metinleri ve satırlar yeniden kullanılır
+            for uploaded_file in uploaded_files:
+                try:
+                    get_page_cache().delete(page_hashes(read_pdf_bytes(uploaded_file)))
+                except Exception:
+                    pass
             st.session_state.processed_files = {}
+            st.session_state.dataset.clear()
             st.session_state.all_data = pd.DataFrame()
             st.rerun()
 
         # Filtreler
         st.sidebar.header("🔍 Filtreler")
 
-        # Filtreleme için kopya oluştur
-        filtered_df = df.copy()
+        # Filtreler önceden hesaplanmış bitmap indeksinden cevaplanır - DataFrame kopyalanmaz
+        render_metrics = Metrics(label="render")
+        with render_metrics.timer("filter_index"):
+            filter_index = get_filter_index(df)
+        selections = {}
 
         # Şehir filtresi
-        city_options = ['Tümü'] + sorted(filtered_df['Şehir'].unique())
+        city_options = ['Tümü'] + filter_index.options('Şehir', selections)
         selected_city = st.sidebar.selectbox("🏙️ Şehir", city_options)
         if selected_city != 'Tümü':
-            filtered_df = filtered_df[filtered_df['Şehir'] == selected_city]
+            selections['Şehir'] = selected_city
 
         # Cinsiyet filtresi
-        if not filtered_df['Cinsiyet'].isna().all():
-            gender_options = ['Tümü'] + sorted(filtered_df['Cinsiyet'].dropna().unique())
+        gender_values = filter_index.options('Cinsiyet', selections)
+        if gender_values:
+            gender_options = ['Tümü'] + gender_values
             selected_gender = st.sidebar.selectbox("👫 Cinsiyet", gender_options)
             if selected_gender != 'Tümü':
-                filtered_df = filtered_df[filtered_df['Cinsiyet'] == selected_gender]
+                selections['Cinsiyet'] = selected_gender
 
         # Yaş filtresi
-        if not filtered_df['Yaş'].isna().all():
-            age_options = ['Tümü'] + sorted(filtered_df['Yaş'].dropna().unique())
+        age_values = filter_index.options('Yaş', selections)
+        if age_values:
+            age_options = ['Tümü'] + age_values
             selected_age = st.sidebar.selectbox("🎂 Yaş Grubu", age_options)
             if selected_age != 'Tümü':
-                filtered_df = filtered_df[filtered_df['Yaş'] == selected_age]
+                selections['Yaş'] = selected_age
 
         # Kulüp filtresi
-        club_options = ['Tümü'] + sorted(filtered_df['Kulüp'].unique())
+        club_options = ['Tümü'] + filter_index.options('Kulüp', selections)
         selected_club = st.sidebar.selectbox("🏊‍♀️ Kulüp", club_options)
         if selected_club != 'Tümü':
-            filtered_df = filtered_df[filtered_df['Kulüp'] == selected_club]
+            selections['Kulüp'] = selected_club
 
-        # Tabs için layout
-        tab1, tab2, tab3, tab4 = st.tabs(
-            ["📊 Tüm Sonuçlar", "🏆 Performanslar", "👤 Sporcu Analizi", "🏛️ Kulüp Analizi"])
+        with render_metrics.timer("filter_select"):
+            filtered_df = filter_index.select(selections)
+            # Sekmeler aynı satırları Arrow tablosu üzerinden okur (sayısal sütunlar bellek paylaşır)
+            filtered_table = take_rows(st.session_state.dataset.table(),
+                                       filter_index.positions(selections) if selections else None)
+        render_metrics.count("rows_filtered", len(filtered_df))
 
-        with tab1:
-            st.subheader("📊 Tüm Sonuçlar")
+        # Sekmelerdeki modül düzeyi ölçümler (ör. gönderilen veri boyutu) çizim ölçümlerine yazılır
+        with render_metrics.activate():
+            # Tabs için layout
+            tab1, tab2, tab3, tab4 = st.tabs(
+                ["📊 Tüm Sonuçlar", "🏆 Performanslar", "👤 Sporcu Analizi", "🏛️ Kulüp Analizi"])
 
-            # Sütun sıralaması - Yarış_Kategori sütununu gizle
-            display_columns = ['Şehir', 'Yarış', 'Cinsiyet', 'Yaş', 'İsim', 'YB', 'Kulüp', 'Zaman', 'Puan']
-            df_display = filtered_df[display_columns]
+            with tab1, render_metrics.timer("tab_results"):
+                st.subheader("📊 Tüm Sonuçlar")
 
-            st.dataframe(df_display, use_container_width=True, height=500)
+                # Tüm tablo yerine yalnızca görünen sayfa serileştirilir
+                show_results_table(filtered_table)
 
-            # İstatistik bilgisi
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("👥 Toplam Sporcu", len(filtered_df))
-            with col2:
-                st.metric("Farklı Yarış",
-                          filtered_df['Yarış_Kategori'].nunique() if 'Yarış_Kategori' in filtered_df.columns else
-                          filtered_df['Yarış'].nunique())
-            with col3:
-                st.metric("Ortalama Puan", f"{filtered_df['Puan'].mean():.1f}")
+                # İstatistik bilgisi
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("👥 Toplam Sporcu", filtered_table.num_rows)
+                with col2:
+                    st.metric("Farklı Yarış",
+                              count_distinct(filtered_table, 'Yarış_Kategori')
+                              if 'Yarış_Kategori' in filtered_table.column_names else
+                              count_distinct(filtered_table, 'Yarış'))
+                with col3:
+                    st.metric("Ortalama Puan", f"{mean(filtered_table, 'Puan'):.1f}")
+
+            with tab2, render_metrics.timer("tab_performance"):
+                # En iyi performanslar - lider tablosu veri sürümü başına bir kez kurulur
+                show_top_5_by_race(st.session_state.dataset.leaderboard(), st.session_state.dataset.table(),
+                                   filter_index.row_mask(selections))
 
-        with tab2:
-            # En iyi performanslar için güncelleme
-            show_top_5_by_race(filtered_df)
+                # Dağılım grafikleri
+                st.subheader("Katılımcı Dağılımları")
 
-            # Dağılım grafikleri
-            st.subheader("Katılımcı Dağılımları")
+                col1, col2, col3 = st.columns(3)
 
-            col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.write("**🏙Şehir Dağılımı**")
+                    city_dist = value_counts(filtered_table, 'Şehir')
+                    st.bar_chart(city_dist)
 
-            with col1:
-                st.write("**🏙Şehir Dağılımı**")
-                city_dist = filtered_df['Şehir'].value_counts()
-                st.bar_chart(city_dist)
+                with col2:
+                    st.write("**Yaş Grubu Dağılımı**")
+                    age_dist = value_counts(filtered_table, 'Yaş').sort_index()
+                    st.bar_chart(age_dist)
 
-            with col2:
-                st.write("**Yaş Grubu Dağılımı**")
-                age_dist = filtered_df['Yaş'].value_counts().sort_index()
-                st.bar_chart(age_dist)
+                with col3:
+                    st.write("**Cinsiyet Dağılımı**")
+                    gender_dist = value_counts(filtered_table, 'Cinsiyet')
+                    st.bar_chart(gender_dist)
 
-            with col3:
-                st.write("**Cinsiyet Dağılımı**")
-                gender_dist = filtered_df['Cinsiyet'].value_counts()
-                st.bar_chart(gender_dist)
+            with tab3, render_metrics.timer("tab_athlete"):
+                # Sporcu analizi - filtrelenmiş veri kullan
+                show_athlete_analysis(filtered_df, (st.session_state.data_version, tuple(sorted(selections.items()))),
+                                      st.session_state.dataset.athlete_labels())
 
-        with tab3:
-            # Sporcu analizi - filtrelenmiş veri kullan
-            show_athlete_analysis(filtered_df)
+            with tab4, render_metrics.timer("tab_club"):
+                # Kulüp analizi
+                show_club_analysis(st.session_state.dataset.club_summary(selections))
 
-        with tab4:
-            # Kulüp analizi
-            show_club_analysis(filtered_df)
+        show_metrics_panel(render_metrics)
 
     elif st.session_state.processing:
         st.info("⏳ Dosya işleniyor...")
@@ -838,4 +807,10 @@ if uploaded_files:
 
 else:
     # Session state temizle eğer dosya yoksa
-    st.session_state.all_data = pd.DataFrame()
\ No newline at end of file
+    st.session_state.all_data = pd.DataFrame()
+    st.session_state.dataset.clear()
+    for key in st.session_state.ingest_jobs:
+        get_ingest_queue().release(key, st.session_state.session_id)
+    st.session_state.ingest_jobs = {}
+    st.session_state.ingest_status = {}
+    st.session_state.processing = False
\ No newline at end of file
@@ -0,0 +1 @@
+"""Parser performans ölçümleri - python -m benchmarks.run"""
@@ -0,0 +1,260 @@
+"""
+Sporcu satırı tarayıcılarının doğruluk ve kötü durum (adversarial) kontrolü
+
+    python -m benchmarks.lines --samples 200000
+    python -m benchmarks.lines --max-length 32000
+
+1) Eşdeğerlik: parse_athlete_line_robust ve SwimmingParser._parse_individual_result,
+   eski regex sürümleriyle (aşağıda referans olarak saklanır) rastgele ve bozuk
+   satırlarda birebir aynı sonucu vermelidir.
+2) Kötü durum: geri izlemeyi tetikleyen uzun satır aileleri - süre satır
+   uzunluğuyla doğrusal büyümeli (üs ~1), regex sürümündeki gibi karesel (~2) değil.
+"""
+import re
+import sys
+import math
+import time
+import random
+import argparse
+
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES, generate_athlete_line
+from swim.meet_parser import SwimmingParser
+from swim.parsing import parse_athlete_line_robust
+
+# Süre ~ uzunluk^üs: doğrusal ~1, karesel ~2
+MAX_EXPONENT = 1.5
+
+
+def legacy_parse_athlete_line(line):
+    """parse_athlete_line_robust'un regex sürümü (referans)"""
+    match = re.match(
+        r"^([A-ZÇĞİÖŞÜ][a-zçğıöşüA-ZÇĞİÖŞÜ\s\-'İıĞğÇçŞşÖöÜü]+?)\s+(\d{2})\s+(.+?)\s+((?:\d+:)?\d{1,2}[.,]\d{2})\s+(\d+)$",
+        line
+    )
+    if match:
+        return {
+            "name": match.group(1).strip(),
+            "yb": int(match.group(2)),
+            "club": match.group(3).strip(),
+            "time": match.group(4).strip().replace(',', '.'),
+            "score": int(match.group(5))
+        }
+
+    time_point_match = re.search(r"(\d{1,2}[:.]\d{2})\s+(\d+)$", line)
+    if time_point_match:
+        time_raw = time_point_match.group(1).replace(':', '.')
+        score_raw = int(time_point_match.group(2))
+        remaining = re.sub(r"\s*\d{1,2}[:.]\d{2}\s+\d+$", "", line).strip()
+        name_yb_match = re.match(r"^([A-ZÇĞİÖŞÜ][a-zçğıöşüA-ZÇĞİÖŞÜ\s\-'İıĞğÇçŞşÖöÜü]+?)\s+(\d{2})\s+(.+)$", remaining)
+        if name_yb_match:
+            club_raw = name_yb_match.group(3).strip()
+            club_raw = re.sub(r"1ü:?$", "ü", club_raw)
+            club_raw = re.sub(r":+$", "", club_raw)
+            club_raw = re.sub(r"\d+$", "", club_raw).strip()
+            return {
+                "name": name_yb_match.group(1).strip(),
+                "yb": int(name_yb_match.group(2)),
+                "club": club_raw,
+                "time": time_raw,
+                "score": score_raw
+            }
+    return None
+
+
+def legacy_parse_individual(line):
+    """SwimmingParser._parse_individual_result'un regex sürümü (referans, yalnızca alanlar)"""
+    pattern = r'^([A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+(?:\s+[A-ZÇĞIİÖŞÜ][A-ZÇĞIİÖŞÜa-zçğıiöşü]*)*)\s+(\d{2})\s+(.+?)\s+(\d+:\d+\.\d+|\d+\.\d+)\s+(\d+)$'
+    match = re.search(pattern, line)
+    if not match:
+        return None
+    club = match.group(3).strip()
+    club = club.replace('Kulüb1ü', 'Kulübü')
+    club = club.replace('Kulub1ü', 'Kulübü')
+    club = club.replace('Kulub1', 'Kulübü')
+    club = re.sub(r'\d+$', '', club).strip()
+    return {
+        'Sporcu_Adı': match.group(1).strip(),
+        'Doğum_Yılı': 2000 + int(match.group(2)),
+        'Kulüp': club,
+        'Zaman': match.group(4),
+        'Puan': int(match.group(5))
+    }
+
+
+def parse_individual(line):
+    result = SwimmingParser()._parse_individual_result(line, {}, None, 1)
+    if result is None:
+        return None
+    return {key: result[key] for key in ('Sporcu_Adı', 'Doğum_Yılı', 'Kulüp', 'Zaman', 'Puan')}
+
+
+# Karşılaştırılan (yeni, referans) çiftleri
+PARSERS = {
+    "parse_athlete_line_robust": (parse_athlete_line_robust, legacy_parse_athlete_line),
+    "SwimmingParser._parse_individual_result": (parse_individual, legacy_parse_individual),
+}
+
+# Rastgele satırların yapı taşları - sınır durumları bilerek içerir
+NAME_TOKENS = FIRST_NAMES + LAST_NAMES + ["A", "Ab", "ab", "ALİ", "O'Neil", "Ayşe-Nur", "İpek", "Iİ", "Çağ1a"]
+YB_TOKENS = ["12", "09", "15", "1", "123", "1a", "١٢"]
+CLUB_TOKENS = ["Spor", "Kulübü", "Kulüb1ü:", "Kulub1", "Kulub1ü", "Spor1ü", "1ü:", "Club::", "X12", "1", "SK", "-", ":"]
+TIME_TOKENS = ["1:02.33", "02.33", "2.33", "2,33", "1:2.33", "12:02,33", "1.2.33", "1:02:33", "02.3",
+               ".33", "1:02.331", "12.33", "1:0233", "١:٠٢.٣٣", "Kulüb1ü1:02.33", "Kulübü:2:31.45"]
+SCORE_TOKENS = ["400", "0", "7", "4a", "٤٠٠", "1.5"]
+SEPARATORS = [" ", " ", " ", "  ", "   ", "\t", "\xa0", " \t ", ""]
+ALPHABET = "AaÇçİıŞşÜüKuülb1234567890:.,-' \t\xa0"
+
+
+def random_token_line(rng):
+    """Yapı taşlarından rastgele sırayla satır"""
+    parts = [rng.choice(NAME_TOKENS) for _ in range(rng.randint(0, 3))]
+    if rng.random() < 0.9:
+        parts.append(rng.choice(YB_TOKENS))
+    parts += [rng.choice(CLUB_TOKENS + NAME_TOKENS) for _ in range(rng.randint(0, 4))]
+    if rng.random() < 0.9:
+        parts.append(rng.choice(TIME_TOKENS))
+    if rng.random() < 0.9:
+        parts.append(rng.choice(SCORE_TOKENS))
+    if rng.random() < 0.2:
+        rng.shuffle(parts)
+
+    line = ""
+    for i, part in enumerate(parts):
+        line += (rng.choice(SEPARATORS) if i else "") + part
+    if rng.random() < 0.1:
+        line = rng.choice(SEPARATORS) + line + rng.choice(SEPARATORS)
+    return line
+
+
+def mutate(rng, line):
+    """Satıra karakter düzeyinde OCR benzeri bozulmalar ekler"""
+    chars = list(line)
+    for _ in range(rng.randint(1, 4)):
+        position = rng.randint(0, len(chars))
+        action = rng.random()
+        if action < 0.4:
+            chars.insert(position, rng.choice(ALPHABET))
+        elif chars and action < 0.7:
+            del chars[min(position, len(chars) - 1)]
+        elif chars:
+            chars[min(position, len(chars) - 1)] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def random_lines(samples, seed=0):
+    """Eşdeğerlik kontrolü için sentetik, yapı taşı ve tamamen rastgele satırlar"""
+    rng = random.Random(seed)
+    for i in range(samples):
+        kind = i % 4
+        if kind == 0:
+            yield generate_athlete_line(rng, garble_rate=0.3)
+        elif kind == 1:
+            yield mutate(rng, generate_athlete_line(rng, garble_rate=0.3))
+        elif kind == 2:
+            yield random_token_line(rng)
+        else:
+            yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 30)))
+
+
+def check_equivalence(samples, seed=0):
+    """Her parser için uyuşmayan satırları döndürür: {ad: [(satır, yeni, referans), ...]}"""
+    mismatches = {name: [] for name in PARSERS}
+    matched = {name: 0 for name in PARSERS}
+    for line in random_lines(samples, seed):
+        for name, (new, legacy) in PARSERS.items():
+            expected = legacy(line)
+            result = new(line)
+            if result != expected:
+                mismatches[name].append((line, result, expected))
+            elif result is not None:
+                matched[name] += 1
+    return mismatches, matched
+
+
+# Regex geri izlemesini tetikleyen satır aileleri (n: yaklaşık satır uzunluğu)
+ADVERSARIAL_LINES = {
+    "kulüpte uzun boşluk": lambda n: "Ali Veli 12 x" + " " * n + "y 1:02.33 400",
+    "kulüpte uzun boşluk, eşleşmez": lambda n: "Ali Veli 12 x" + " " * n + "y",
+    "isimde uzun boşluk": lambda n: "Ab" + " " * n + "x",
+    "kulüp sonunda rakamlar": lambda n: "Ali 12 Kulüp" + "1" * n + "a 1:02.33 400",
+    "kulüp sonunda iki nokta": lambda n: "Ali 12 Kulüp" + ":" * n + "a 1.02.33 400",
+    "bitişik süre, uzun boşluk": lambda n: "Ali 12 x" + " " * n + "1:02.33 400x 1.11 5",
+    "çok sayıda token": lambda n: "Ali 12 " + "a 1 " * (n // 4) + "x",
+    "çok sayıda süre": lambda n: "Ali 12 " + "1.11 " * (n // 5) + "x",
+    "uzun isim": lambda n: "Ali" + " B" * (n // 2) + " 12 Spor 1:02.33 400",
+}
+
+
+def best_time(func, line, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(line)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def check_adversarial(max_length=16000, legacy_max_length=4000, repeat=5):
+    """
+    Her aile ve parser için uzunluk ikiye katlandıkça süreleri ölçer.
+    Sonuç satırları: (aile, parser, [(uzunluk, yeni sn, referans sn | None)], büyüme üssü)
+    """
+    lengths = []
+    length = 1000
+    while length <= max_length:
+        lengths.append(length)
+        length *= 2
+
+    rows = []
+    for family, make_line in ADVERSARIAL_LINES.items():
+        for name, (new, legacy) in PARSERS.items():
+            timings = []
+            for length in lengths:
+                line = make_line(length)
+                legacy_seconds = best_time(legacy, line, 1) if length <= legacy_max_length else None
+                timings.append((length, best_time(new, line, repeat), legacy_seconds))
+            # En kısa ve en uzun satır arasındaki büyüme üssü; 50 µs taban ölçüm gürültüsünü bastırır
+            (first_length, first, _), (last_length, last, _) = timings[0], timings[-1]
+            exponent = (
+                math.log(max(last, 5e-5) / max(first, 5e-5)) / math.log(last_length / first_length)
+                if last_length > first_length else 0.0
+            )
+            rows.append((family, name, timings, exponent))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.lines",
+                                     description="Sporcu satırı tarayıcısı eşdeğerlik ve kötü durum kontrolü")
+    parser.add_argument("--samples", type=int, default=100000, help="Eşdeğerlik için rastgele satır sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-length", type=int, default=16000, help="Kötü durum satırlarının en büyük uzunluğu")
+    parser.add_argument("--legacy-max-length", type=int, default=4000,
+                        help="Regex sürümünün ölçüleceği en büyük uzunluk (karesel, yavaş)")
+    args = parser.parse_args(argv)
+    failed = False
+
+    mismatches, matched = check_equivalence(args.samples, args.seed)
+    print(f"Eşdeğerlik ({args.samples} satır)")
+    for name, rows in mismatches.items():
+        print(f"  {name:<42} eşleşen {matched[name]:>7}  uyuşmayan {len(rows)}")
+        for line, result, expected in rows[:5]:
+            print(f"    {line!r}\n      yeni:     {result}\n      referans: {expected}")
+        failed = failed or bool(rows)
+
+    print("\nKötü durum satırları (sn; parantez içi regex sürümü)")
+    for family, name, timings, exponent in check_adversarial(args.max_length, args.legacy_max_length):
+        cells = "  ".join(
+            f"{length}: {seconds:.5f}" + (f" ({legacy:.4f})" if legacy is not None else "")
+            for length, seconds, legacy in timings
+        )
+        status = "OK" if exponent <= MAX_EXPONENT else "YAVAŞ"
+        print(f"  {status:<5} {family:<32} {name:<40} üs {exponent:4.2f}  {cells}")
+        failed = failed or exponent > MAX_EXPONENT
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
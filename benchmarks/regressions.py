@@ -0,0 +1,168 @@
+"""
+Bilinen hatalar için regresyon kontrolleri
+
+    python -m benchmarks.regressions
+
+1) Sayfa önbelleği: aynı içerik akışıyla (q /X0 Do Q) farklı form XObject'leri çizen
+   sayfalar farklı hash almalı; ikinci (önbellekten) okuma ilkiyle aynı metni vermeli.
+   Sonuna sayfa eklenen dosyada (font alt kümeleri büyür) eski sayfalar önbellekten gelmeli.
+2) Sporcu kimliği: yakın ama farklı soyadları (Aslan / Arslan) farklı kulüplerde
+   birleşmemeli; Türkçe harf, sıra ve OCR farkları birleşmeye devam etmeli.
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_meet_lines, write_meet_pdf
+from swim.identity import AthleteResolver
+from swim.extraction import extract_pages
+from swim.instrumentation import Metrics
+from swim.pages import PageCache, iter_page_texts, page_hashes
+
+
+def xobject_pdf(texts):
+    """
+    Her sayfanın içerik akışı aynı ("q /X0 Do Q"); metin sayfaya özel form XObject'inde.
+    Sayfa başına bir nesne üçlüsü: sayfa, içerik akışı, XObject.
+    """
+    def stream(data):
+        return f"<< /Length {len(data)} >>\nstream\n{data}\nendstream".encode("latin-1")
+
+    page_ids = [4 + 3 * index for index in range(len(texts))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] "
+           f"/Count {len(texts)} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, text in zip(page_ids, texts):
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {page_id + 1} 0 R "
+                            f"/Resources << /XObject << /X0 {page_id + 2} 0 R >> >> >>").encode()
+        objects[page_id + 1] = stream("q /X0 Do Q")
+        content = f"BT /F1 24 Tf 72 700 Td ({text}) Tj ET"
+        objects[page_id + 2] = (
+            f"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Length {len(content)} >>\nstream\n{content}\nendstream"
+        ).encode("latin-1")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(pdf)
+        pdf += f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for number in sorted(objects):
+        pdf += f"{offsets[number]:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def check_xobject_pages(backend="pypdfium2"):
+    """Hata mesajları listesi (boşsa geçti)"""
+    errors = []
+    pdf_bytes = xobject_pdf(["Page one ALPHA", "Page two BETA"])
+    expected = [text.strip() for text in extract_pages(pdf_bytes, jobs=1, backend=backend)]
+
+    hashes = page_hashes(pdf_bytes)
+    if len(set(hashes)) != len(hashes):
+        errors.append(f"XObject sayfaları aynı hash'i aldı: {hashes}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        page_cache = PageCache(cache_dir)
+        for run in ("ilk", "önbellekten"):
+            texts = [text.strip() for _, text in iter_page_texts(pdf_bytes, page_cache, jobs=1, backend=backend)]
+            if texts != expected:
+                errors.append(f"{run} okuma: {texts} (beklenen {expected})")
+    return errors
+
+
+def check_appended_pages(pages=20, appended=7, lines_per_page=45, backend="pypdfium2"):
+    """Yeniden yayınlanan (sonuna sayfa eklenmiş) dosyada yalnızca yeni sayfalar çıkarılmalı"""
+    errors = []
+    lines = generate_meet_lines(races=80, seed=0)[:(pages + appended) * lines_per_page]
+    # Eklenen sayfalarda ilk sürümde olmayan harfler - font alt kümesi (ToUnicode, önek) değişir
+    lines[pages * lines_per_page] = "EK SONUÇLAR - Âlâ Îlkay Ûmran (düzeltme: 2 → 3) #1 @ 50% & ½"
+    with tempfile.TemporaryDirectory() as work_dir:
+        first = write_meet_pdf(os.path.join(work_dir, "ilk.pdf"), lines[:pages * lines_per_page], lines_per_page)
+        second = write_meet_pdf(os.path.join(work_dir, "ikinci.pdf"), lines, lines_per_page)
+        with open(first, "rb") as f:
+            first_bytes = f.read()
+        with open(second, "rb") as f:
+            second_bytes = f.read()
+
+        page_cache = PageCache(os.path.join(work_dir, "pages"))
+        list(iter_page_texts(first_bytes, page_cache, jobs=1, backend=backend))
+        metrics = Metrics()
+        with metrics.activate():
+            texts = [text for _, text in iter_page_texts(second_bytes, page_cache, jobs=1, backend=backend)]
+
+    cached = metrics.counters.get("pages_cached", 0)
+    if cached != pages:
+        errors.append(f"önbellekten gelen sayfa {cached} (beklenen {pages}), "
+                      f"çıkarılan {metrics.counters.get('pages_extracted', 0)}")
+    if texts != extract_pages(second_bytes, jobs=1, backend=backend):
+        errors.append("önbellekli metin doğrudan çıkarılanla aynı değil")
+    return errors
+
+
+# (isim, YB, kulüp) çiftleri - farklı sporcular
+DISTINCT_ATHLETES = [
+    (("Ahmet Aslan", "12", "A Kulübü"), ("Ahmet Arslan", "12", "B Kulübü")),
+    (("Elif Kaya", "11", "Kepez Spor Kulübü"), ("Elif Kara", "11", "Manavgat Yüzme Kulübü")),
+    (("Can Demir", "13", "Kepez Spor Kulübü"), ("Can Demirci", "13", "Alanya Gençlik Spor Kulübü")),
+    (("Zeynep Çetin", "10", "Kepez Spor Kulübü"), ("Zeynep Çelik", "10", "Konyaaltı Su Sporları Kulübü")),
+    (("Mehmet Yılmaz", "12", "Kepez Spor Kulübü"), ("Ahmet Yılmaz", "12", "Kepez Spor Kulübü")),
+]
+
+# (isim, YB, kulüp) çiftleri - aynı sporcunun farklı yazımları
+SAME_ATHLETES = [
+    (("Ayşe Öztürk", "12", "Kepez Spor Kulübü"), ("AYSE OZTURK", "12", "Kepez Spor Kulubu")),
+    (("Mehmet Yılmaz", "12", "Kepez Spor Kulübü"), ("Yılmaz Mehmet", "12", "Antalya Yüzme İhtisas Spor Kulübü")),
+    (("Ahmet Can Yılmaz", "13", "Kepez Spor Kulübü"), ("Ahmet Yılmaz", "13", "Muratpaşa Belediyesi Spor Kulübü")),
+    (("Ömer Şahin", "11", "Kepez Spor Kulübü"), ("Omer Sahn", "11", "Kepez Spor Kulubu")),
+]
+
+
+def _same_id(left, right):
+    resolver = AthleteResolver()
+    nodes = [resolver.add(pd.DataFrame([record], columns=["İsim", "YB", "Kulüp"])) for record in (left, right)]
+    ids = resolver.athlete_ids(np.concatenate(nodes))
+    return ids[0] == ids[1]
+
+
+def check_identity():
+    """Hata mesajları listesi (boşsa geçti)"""
+    errors = []
+    for left, right in DISTINCT_ATHLETES:
+        if _same_id(left, right):
+            errors.append(f"farklı sporcular birleşti: {left} / {right}")
+    for left, right in SAME_ATHLETES:
+        if not _same_id(left, right):
+            errors.append(f"aynı sporcu ayrı kaldı: {left} / {right}")
+    return errors
+
+
+CHECKS = {
+    "sayfa önbelleği - XObject sayfaları": check_xobject_pages,
+    "sayfa önbelleği - sonuna sayfa eklenen dosya": check_appended_pages,
+    "sporcu kimliği - benzer soyadları": check_identity,
+}
+
+
+def main(argv=None):
+    failed = False
+    for name, check in CHECKS.items():
+        errors = check()
+        print(f"  {'OK' if not errors else 'HATA':<5} {name}")
+        for error in errors:
+            print(f"        {error}")
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Parser throughput ölçümü
+
+    python -m benchmarks.run --races 80 --repeat 3
+    python -m benchmarks.run --pdf --jobs 4 --json bench.json
+    python -m benchmarks.run --pdf --backends pypdfium2 pdfplumber
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+from benchmarks.synthetic import (
+    generate_athlete_line,
+    generate_meet_lines,
+    generate_race_title,
+    write_meet_pdf,
+)
+from swim.cleaning import clean_lines, clean_pages
+from swim.extraction import BACKENDS, iter_pages
+from swim.meet_parser import SwimmingParser
+from swim.parsing import (
+    iter_records,
+    iter_record_batches,
+    normalize_race_category_advanced,
+    parse_athlete_line_robust,
+    records_to_frame,
+)
+
+
+def measure(func, repeat):
+    """En iyi süreyi ve son sonucu döndürür"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(args):
+    lines = generate_meet_lines(races=args.races, athletes_per_group=args.athletes, seed=args.seed,
+                                garble_rate=args.garble_rate)
+    text = '\n'.join(lines) + '\n'
+    rng = random.Random(args.seed)
+    athlete_lines = [generate_athlete_line(rng, args.garble_rate) for _ in range(args.samples)]
+    titles = [generate_race_title(rng, i % 60 + 1, single_age=rng.randint(9, 14)) for i in range(args.samples)]
+    results = []
+
+    def add(name, unit, count, seconds, **extra):
+        results.append({
+            "name": name,
+            "unit": unit,
+            "count": count,
+            "seconds": round(seconds, 6),
+            "per_second": round(count / seconds, 1) if seconds > 0 else None,
+            **extra,
+        })
+
+    if args.pdf:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = write_meet_pdf(os.path.join(tmp, "meet.pdf"), lines)
+            for backend in args.backends:
+                for jobs in sorted({1, args.jobs}) if BACKENDS[backend].parallel else [1]:
+                    seconds, pages = measure(lambda: list(iter_pages(pdf_path, jobs=jobs, backend=backend)),
+                                             args.repeat)
+                    add(f"extract_text ({backend}, jobs={jobs})", "sayfa", len(pages), seconds)
+            seconds, cleaned = measure(lambda: list(clean_pages(pages)), args.repeat)
+            add("extract_text/temizlik", "sayfa", len(pages), seconds)
+
+    seconds, df = measure(
+        lambda: records_to_frame(iter_record_batches(iter_records(clean_lines(text.splitlines()), "BENCH"))),
+        args.repeat,
+    )
+    add("parse_results", "satır", len(lines), seconds, rows=len(df))
+
+    def parse_all():
+        return sum(1 for line in athlete_lines if parse_athlete_line_robust(line))
+    seconds, matched = measure(parse_all, args.repeat)
+    add("parse_athlete_line_robust", "satır", len(athlete_lines), seconds, matched=matched)
+
+    def normalize_all():
+        return [normalize_race_category_advanced(title, "Kızlar", "11") for title in titles]
+    seconds, _ = measure(normalize_all, args.repeat)
+    add("normalize_race_category_advanced", "başlık", len(titles), seconds)
+
+    def process_text():
+        parser = SwimmingParser()
+        parser._process_text(text)
+        return parser
+    seconds, parser = measure(process_text, args.repeat)
+    add("SwimmingParser._process_text", "satır", len(lines), seconds,
+        rows=len(parser.individual_results), team_rows=len(parser.team_results),
+        disqualified=len(parser.disqualified))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Parser performans ölçümü")
+    parser.add_argument("--races", type=int, default=80, help="Sentetik yarışmadaki yarış sayısı")
+    parser.add_argument("--athletes", type=int, default=8, help="Yaş grubu başına sporcu sayısı")
+    parser.add_argument("--samples", type=int, default=20000, help="Satır/başlık mikro ölçümleri için örnek sayısı")
+    parser.add_argument("--garble-rate", type=float, default=0.05, help="OCR bozulması oranı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı (en iyi süre raporlanır)")
+    parser.add_argument("--pdf", action="store_true", help="Sentetik PDF üretip sayfa çıkarmayı da ölç")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="PDF çıkarma için işçi sayısı")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS),
+                        help="Ölçülecek PDF metin çıkarma arka uçları")
+    parser.add_argument("--json", help="Sonuçları JSON olarak bu dosyaya yaz")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+
+    print(f"{'ölçüm':<36} {'adet':>8} {'süre (sn)':>10} {'adet/sn':>12}")
+    for result in results:
+        print(f"{result['name']:<36} {result['count']:>8} {result['seconds']:>10.4f} "
+              f"{result['per_second'] or 0:>12.1f} {result['unit']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Gerçekçi yarış sonucu metni ve PDF'i üreten sentetik veri üreteci"""
+import random
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Mustafa", "Emre", "Can", "Burak", "Ege", "Deniz", "Kerem", "Ömer",
+    "Zeynep", "Elif", "Ayşe", "Defne", "Ecrin", "İrem", "Nehir", "Öykü", "Şevval", "Çağla",
+    "Ümit", "Işıl", "Gökçe", "Doğa", "Yağmur",
+]
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Özdemir", "Arslan",
+    "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek", "Güneş",
+    "YILMAZ", "KAYA", "ÇELİK",
+]
+CLUBS = [
+    "Antalya Yüzme İhtisas Spor Kulübü",
+    "Muratpaşa Belediyesi Spor Kulübü",
+    "Kepez Spor Kulübü",
+    "Konyaaltı Su Sporları Kulübü",
+    "Alanya Gençlik Spor Kulübü",
+    "Manavgat Yüzme Kulübü",
+    "Akdeniz Üniversitesi Spor Kulübü",
+]
+STYLES = ["Serbest", "Sırtüstü", "Kurbağalama", "Kelebek", "Karışık"]
+DISTANCES = ["50m", "100m", "200m"]
+
+# OCR'ın "Kulübü" kelimesini bozma biçimleri ("{t}" zaman yerine geçer)
+GARBLED_CLUB_ENDINGS = [
+    "Kulüb1ü {t}",
+    "Kulub1ü {t}",
+    "Kulub1 {t}",
+    "Kulübü{t}",
+    "Kulü3b:ü{t}",
+    "Kulü1b:ü{t}",
+]
+
+HEADER_LINES = [
+    "ANTALYA İL ETAP MÜSABAKASI",
+    "Splash Meet Manager, 11.00000 Registered to Türkiye Yüzme Federasyonu",
+    "Sonuçlar",
+]
+
+
+def _time(rng, seconds):
+    minutes, rest = divmod(seconds, 60)
+    if minutes:
+        return f"{int(minutes)}:{rest:05.2f}"
+    return f"{rest:.2f}"
+
+
+def generate_athlete_line(rng, garble_rate=0.05):
+    """Tek bir sporcu sonuç satırı: 'İsim Soyisim YB Kulüp Zaman Puan'"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    yb = rng.randint(10, 16)
+    club = rng.choice(CLUBS)
+    time_str = _time(rng, rng.uniform(28, 200))
+    points = rng.randint(40, 650)
+
+    if rng.random() < garble_rate and club.endswith("Kulübü"):
+        ending = rng.choice(GARBLED_CLUB_ENDINGS).format(t=time_str)
+        return f"{name} {yb} {club[:-len('Kulübü')]}{ending} {points}"
+
+    return f"{name} {yb} {club} {time_str} {points}"
+
+
+def generate_race_title(rng, race_no, single_age=None):
+    """Her iki parser'ın desteklediği biçimlerde yarış başlığı"""
+    gender = rng.choice(["Kızlar", "Erkekler", "Kız", "Erkek"])
+    event = f"{rng.choice(DISTANCES)} {rng.choice(STYLES)}"
+    if single_age is not None:
+        return f"Yarış {race_no}, {gender}, {event}, {single_age} yaş"
+    return f"Yarış {race_no} {gender}, {event} 10 - 12 yaşları arası"
+
+
+def generate_meet_lines(races=40, athletes_per_group=8, seed=0, garble_rate=0.05,
+                        split_rate=0.5, relay_every=10, dq_rate=0.03):
+    """Bir yarışmanın tüm sonuç satırlarını (başlıklar, yaş grupları, ara dereceler, bayrak, diskalifiye) üretir"""
+    rng = random.Random(seed)
+    lines = list(HEADER_LINES)
+
+    for race_no in range(1, races + 1):
+        if relay_every and race_no % relay_every == 0:
+            gender = rng.choice(["Kızlar", "Erkekler"])
+            lines.append(f"Yarış {race_no} {gender}, 4 x 100m Karışık 11 - 12 yaşları arası")
+            lines.append("YB Zaman Derece Puan")
+            for _ in range(athletes_per_group):
+                lines.append(f"{rng.choice(CLUBS)} {_time(rng, rng.uniform(240, 400))} {rng.randint(40, 500)}")
+            continue
+
+        if rng.random() < 0.5:
+            lines.append(generate_race_title(rng, race_no, single_age=rng.randint(9, 14)))
+            ages = [None]
+        else:
+            lines.append(generate_race_title(rng, race_no))
+            ages = [10, 11, 12]
+        lines.append("YB Zaman Derece Puan")
+
+        for age in ages:
+            if age is not None:
+                lines.append(f"{age} yaş")
+            for _ in range(athletes_per_group):
+                lines.append(generate_athlete_line(rng, garble_rate))
+                if rng.random() < split_rate:
+                    lines.append(f"50m: {rng.uniform(28, 45):.2f}")
+            if rng.random() < dq_rate:
+                lines.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} 12 SW 7.4 Dönüş kuralı ihlali")
+
+        lines.append("YAŞ KATILIM BARAJINI GEÇTİ")
+
+    lines.append("BAŞHAKEM")
+    return lines
+
+
+def generate_meet_text(**kwargs):
+    """generate_meet_lines çıktısını tek metin olarak döndürür"""
+    return '\n'.join(generate_meet_lines(**kwargs)) + '\n'
+
+
+def write_meet_pdf(path, lines, lines_per_page=45):
+    """Satırları metin katmanı olan (pdfplumber ile okunabilir) bir PDF'e yazar"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with matplotlib.rc_context({"pdf.fonttype": 42}):
+        with PdfPages(path) as pdf:
+            for start in range(0, len(lines), lines_per_page):
+                fig = plt.figure(figsize=(8.27, 11.69))
+                for i, line in enumerate(lines[start:start + lines_per_page]):
+                    fig.text(0.05, 0.97 - i * 0.021, line, fontsize=8)
+                pdf.savefig(fig)
+                plt.close(fig)
+    return path
@@ -1,206 +1,174 @@
 import streamlit as st
 import pandas as pd
-import pdfplumber
-import re
-import io
 from datetime import datetime
 
+from swim.cache import ParseCache
+from swim.export import ExportCache, archive_names, batch_key, combine_tables, read_export
+from swim.extraction import read_pdf_bytes
+from swim.ingest import convert_meets, get_city_name, get_file_hash, load_meet
+from swim.pages import PageCache
+from swim.store import get_parse_store
+
+BATCH_COMBINED = "Tek çalışma kitabı (şehir sütunlu)"
+BATCH_ZIP = "ZIP (dosya başına çalışma kitabı)"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Bellekte tutulan dışa aktarım dosyası sayısı (indirme butonları için)
+EXPORT_MEMORY_ENTRIES = 4
+
+
+def convert_pdf(pdf_file, file_hash):
+    """Dashboard ile paylaşılan depodan okur; yoksa PDF'i tek taramada parse eder"""
+    parsed = file_hash not in get_parse_store()
+    try:
+        data = load_meet(pdf_file, get_city_name(pdf_file.name), file_hash=file_hash, page_cache=PageCache())
+    except Exception as e:
+        st.error(f"Hata: {str(e)}")
+        return None
+
+    if parsed:
+        store_results(file_hash, data)
+
+    return data
+
+
+@st.cache_resource(max_entries=EXPORT_MEMORY_ENTRIES)
+def export_bytes(path):
+    """
+    Dışa aktarım dosyası yol (içerik hash'i) başına bir kez okunur; yeniden çizimlerde
+    indirme butonuna aynı nesne verilir - dosya her çizimde diskten belleğe okunmaz.
+    """
+    return read_export(path)
+
+
+def export_path(data, file_hash):
+    """Çalışma kitabı içerik hash'i başına bir kez üretilir; yeniden çizimlerde diskten okunur"""
+    try:
+        return ExportCache().get_or_create(file_hash, data)
+    except Exception as e:
+        st.error(f"Excel oluşturulamadı: {str(e)}")
+        return None
+
+
+def store_results(file_hash, data):
+    """Dashboard sonuçlarını disk önbelleğine yazar - aynı dosya orada yeniden parse edilmez"""
+    if data['results'].empty:
+        return
+    try:
+        ParseCache().put(file_hash, data['results'])
+    except Exception:
+        pass
+
+
+def convert_batch(uploaded_files):
+    """Dosyaları süreç havuzunda dönüştürür; dosya başına durum tablosunu canlı günceller"""
+    progress_bar = st.progress(0)
+    status_table = st.empty()
+
+    entries = [(uploaded_file.name, read_pdf_bytes(uploaded_file)) for uploaded_file in uploaded_files]
+    status = {name: {"Dosya": name, "Durum": "⏳ Bekliyor", "Kayıt": None, "Süre (sn)": None} for name, _ in entries}
+    status_table.dataframe(pd.DataFrame(status.values()), hide_index=True)
+
+    for done, (name, file_hash, data, seconds, error) in enumerate(convert_meets(entries), start=1):
+        if error:
+            status[name].update({"Durum": f"❌ {error}"})
+        else:
+            st.session_state.batch_results[file_hash] = data
+            store_results(file_hash, data)
+            status[name].update({"Durum": "✅ Tamam", "Kayıt": len(data['individual']), "Süre (sn)": round(seconds, 2)})
+
+        progress_bar.progress(done / len(entries))
+        status_table.dataframe(pd.DataFrame(status.values()), hide_index=True)
+
+    progress_bar.empty()
+    st.session_state.batch_status = list(status.values())
+
+
+def batch_export_path(converted, output):
+    """converted: [(şehir, dosya hash'i, tablolar)] - seçilen çıktı için önbellekteki dosya yolu"""
+    cache = ExportCache()
+    file_keys = [(file_hash, city_name) for city_name, file_hash, _ in converted]
+
+    if output == BATCH_COMBINED:
+        return cache.get_or_create(
+            batch_key(file_keys, "combined"),
+            lambda: combine_tables([(city_name, data) for city_name, _, data in converted]),
+        )
 
-class SwimmingParser:
-    def __init__(self):
-        self.individual_results = []
-        self.team_results = []
-        self.disqualified = []
-
-    def parse_pdf(self, pdf_file):
-        try:
-            with pdfplumber.open(pdf_file) as pdf:
-                all_text = ""
-                for page in pdf.pages:
-                    all_text += page.extract_text() + "\n"
-
-            self._process_text(all_text)
-
-            return {
-                'individual': pd.DataFrame(self.individual_results),
-                'team': pd.DataFrame(self.team_results),
-                'disqualified': pd.DataFrame(self.disqualified)
-            }
-
-        except Exception as e:
-            st.error(f"Hata: {str(e)}")
-            return None
-
-    def _process_text(self, text):
-        lines = text.split('\n')
-        current_race_info = {}
-        current_age = None
-        position = 1
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Yarış başlığı - Çeşitli formatları destekle
-            race_match = None
-
-            # Format 1: "Yarış 9, Kızlar, 200m Sırtüstü, 12 yaş"
-            race_match = re.search(r'Yarış\s+(\d+)[,.]?\s*([^,]+)[,.]?\s*([^,]+)[,.]?\s*(\d+)\s*yaş', line)
-
-            if not race_match:
-                # Format 2: "Yarış 8 Erkekler, 50m Serbest 10 - 12 yaşları arası"
-                race_match = re.search(r'Yarış\s+(\d+)\s+([^,]+)[,.]?\s*([^0-9]+?)\s+(\d+)(?:\s*-\s*\d+)?\s*yaş', line)
-
-            if not race_match:
-                # Format 3: "Yarış 13 Kızlar, 4 x 100m Karışık 11 - 12 yaşları arası"
-                race_match = re.search(r'Yarış\s+(\d+)\s+([^,]+)[,.]?\s*(.+?)\s+(\d+)(?:\s*-\s*\d+)?\s*yaş', line)
-
-            if race_match:
-                race_no = int(race_match.group(1))
-                gender_part = race_match.group(2).strip()
-                race_type = race_match.group(3).strip()
-                age = int(race_match.group(4))
-
-                # Cinsiyet belirleme
-                if 'Kızlar' in gender_part or 'Kız' in gender_part:
-                    cinsiyet = 'Kız'
-                elif 'Erkekler' in gender_part or 'Erkek' in gender_part:
-                    cinsiyet = 'Erkek'
-                else:
-                    cinsiyet = 'Karma'
-
-                current_race_info = {
-                    'yarış_no': race_no,
-                    'yarış_türü': race_type,
-                    'cinsiyet': cinsiyet,
-                    'yaş_kategorisi': age
-                }
-
-                current_age = current_race_info['yaş_kategorisi']
-                position = 1
-                continue
-
-            # Yaş kategorisi
-            age_match = re.search(r'^(\d+)\s*yaş', line)
-            if age_match:
-                current_age = int(age_match.group(1))
-                position = 1
-                continue
-
-            # Diskalifiye
-            if 'SW' in line:
-                self._parse_disqualified(line, current_race_info, current_age)
-                continue
-
-            # Takım yarışı
-            if 'x 100m' in current_race_info.get('yarış_türü', ''):
-                team_result = self._parse_team_result(line, current_race_info, current_age, position)
-                if team_result:
-                    self.team_results.append(team_result)
-                    position += 1
-                continue
-
-            # Bireysel sonuç
-            individual_result = self._parse_individual_result(line, current_race_info, current_age, position)
-            if individual_result:
-                self.individual_results.append(individual_result)
-                position += 1
-
-    def _parse_individual_result(self, line, race_info, age, position):
-        try:
-            # Zaman formatını sondan yakalayarak kulüp adını doğru çıkar
-            pattern = r'^([A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+(?:\s+[A-ZÇĞIİÖŞÜ][A-ZÇĞIİÖŞÜa-zçğıiöşü]*)*)\s+(\d{2})\s+(.+?)\s+(\d+:\d+\.\d+|\d+\.\d+)\s+(\d+)$'
-            match = re.search(pattern, line)
-
-            if not match:
-                return None
-
-            name = match.group(1).strip()
-            birth_year = 2000 + int(match.group(2))
-            club_part = match.group(3).strip()
-            time_str = match.group(4)
-            points = int(match.group(5))
-
-            # Kulüp adını temizle - OCR hatalarını düzelt
-            club = club_part
-            club = club.replace('Kulüb1ü', 'Kulübü')
-            club = club.replace('Kulub1ü', 'Kulübü')
-            club = club.replace('Kulub1', 'Kulübü')
-            club = re.sub(r'\d+$', '', club).strip()
-
-            return {
-                'Sıra': position,
-                'Yarış_No': race_info.get('yarış_no', ''),
-                'Yarış_Türü': race_info.get('yarış_türü', ''),
-                'Cinsiyet': race_info.get('cinsiyet', ''),
-                'Yaş': age,
-                'Sporcu_Adı': name,
-                'Doğum_Yılı': birth_year,
-                'Kulüp': club,
-                'Zaman': time_str,
-                'Puan': points
-            }
-
-        except Exception:
-            return None
-
-    def _parse_team_result(self, line, race_info, age, position):
-        try:
-            pattern = r'^([A-ZÇĞIİÖŞÜ].+?)\s+(\d+:\d+\.\d+)\s+(\d+)$'
-            match = re.search(pattern, line)
-
-            if not match:
-                return None
-
-            team_name = match.group(1).strip()
-            team_time = match.group(2)
-            team_points = int(match.group(3))
-
-            return {
-                'Sıra': position,
-                'Yarış_No': race_info.get('yarış_no', ''),
-                'Yarış_Türü': race_info.get('yarış_türü', ''),
-                'Cinsiyet': race_info.get('cinsiyet', ''),
-                'Yaş': age,
-                'Takım_Adı': team_name,
-                'Zaman': team_time,
-                'Puan': team_points
-            }
-
-        except Exception:
-            return None
-
-    def _parse_disqualified(self, line, race_info, age):
-        try:
-            name_match = re.search(r'^([A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+(?:\s+[A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+)*)', line)
-
-            if name_match:
-                name = name_match.group(1)
-                reason = line[len(name):].strip()
-
-                self.disqualified.append({
-                    'Yarış_No': race_info.get('yarış_no', ''),
-                    'Yarış_Türü': race_info.get('yarış_türü', ''),
-                    'Cinsiyet': race_info.get('cinsiyet', ''),
-                    'Yaş': age,
-                    'Sporcu_Adı': name,
-                    'Neden': reason
-                })
-
-        except Exception:
-            pass
-
-
-def create_excel_file(data_dict):
-    output = io.BytesIO()
-
-    # Sadece bireysel sonuçları Excel'e yaz
-    if not data_dict['individual'].empty:
-        data_dict['individual'].to_excel(output, index=False)
-
-    output.seek(0)
-    return output
+    # Aynı şehre düşen dosyalar ayrı adlarla eklenir - ZIP'te yinelenen ad olmaz
+    members = [
+        (name, cache.get_or_create(file_hash, data))
+        for name, (_, file_hash, data) in zip(archive_names(file_keys), converted)
+        if name is not None
+    ]
+    return cache.get_or_create_zip(batch_key(file_keys, "zip"), members)
+
+
+def upload_hash(uploaded_file):
+    """Dosya hash'i yükleme nesnesi başına bir kez hesaplanır - yeniden çizimlerde dosya tekrar okunmaz"""
+    upload_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    hashes = st.session_state.batch_upload_hashes
+    if upload_id not in hashes:
+        hashes[upload_id] = get_file_hash(uploaded_file)
+    return upload_id, hashes[upload_id]
+
+
+def show_batch():
+    """Toplu dönüştürme - çok sayıda PDF, tek çalışma kitabı ya da ZIP"""
+    if 'batch_results' not in st.session_state:
+        st.session_state.batch_results = {}
+    if 'batch_status' not in st.session_state:
+        st.session_state.batch_status = None
+    if 'batch_upload_hashes' not in st.session_state:
+        st.session_state.batch_upload_hashes = {}
+
+    uploaded_files = st.file_uploader("PDF dosyalarını seçin", type=['pdf'], accept_multiple_files=True,
+                                      key="batch_files")
+    output = st.radio("Çıktı", [BATCH_COMBINED, BATCH_ZIP], horizontal=True)
+
+    if not uploaded_files:
+        return
+
+    if st.button("Toplu Dönüştür"):
+        convert_batch(uploaded_files)
+    elif st.session_state.batch_status:
+        st.dataframe(pd.DataFrame(st.session_state.batch_status), hide_index=True)
+
+    # Yüklenen dosyalardan dönüştürülmüş olanlar (yükleme sırasıyla)
+    converted = []
+    upload_ids = set()
+    for uploaded_file in uploaded_files:
+        upload_id, file_hash = upload_hash(uploaded_file)
+        upload_ids.add(upload_id)
+        data = st.session_state.batch_results.get(file_hash)
+        if data is not None:
+            converted.append((get_city_name(uploaded_file.name), file_hash, data))
+    st.session_state.batch_upload_hashes = {
+        upload_id: file_hash for upload_id, file_hash in st.session_state.batch_upload_hashes.items()
+        if upload_id in upload_ids
+    }
+
+    if not converted:
+        return
+
+    try:
+        path = batch_export_path(converted, output)
+    except Exception as e:
+        st.error(f"Dışa aktarım oluşturulamadı: {str(e)}")
+        return
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    if output == BATCH_COMBINED:
+        st.download_button(label=f"Excel İndir ({len(converted)} dosya)", data=export_bytes(path),
+                           file_name=f"sonuclar_{stamp}.xlsx", mime=XLSX_MIME)
+    else:
+        st.download_button(label=f"ZIP İndir ({len(converted)} dosya)", data=export_bytes(path),
+                           file_name=f"sonuclar_{stamp}.zip", mime="application/zip")
+
+    if st.button("🗑️ Toplu Verileri Temizle"):
+        st.session_state.batch_results = {}
+        st.session_state.batch_status = None
+        st.rerun()
 
 
 def main():
@@ -208,27 +176,31 @@ def main():
 
     st.title("PDF → Excel Dönüştürücü")
 
+    mode = st.radio("Mod", ["Tek dosya", "Toplu dönüştürme"], horizontal=True)
+    if mode == "Toplu dönüştürme":
+        show_batch()
+        return
+
     # Session state başlatma
     if 'converted_data' not in st.session_state:
         st.session_state.converted_data = None
-    if 'file_name' not in st.session_state:
-        st.session_state.file_name = None
+    if 'file_hash' not in st.session_state:
+        st.session_state.file_hash = None
 
     uploaded_file = st.file_uploader("PDF dosyası seçin", type=['pdf'])
 
-    # Dosya değiştiğinde session state'i temizle
+    # Dosya içeriği değiştiğinde session state'i temizle
     if uploaded_file is not None:
-        current_file_name = uploaded_file.name
-        if st.session_state.file_name != current_file_name:
+        current_file_hash = get_file_hash(uploaded_file)
+        if st.session_state.file_hash != current_file_hash:
             st.session_state.converted_data = None
-            st.session_state.file_name = current_file_name
+            st.session_state.file_hash = current_file_hash
 
     # Dönüştür butonu
     if uploaded_file is not None:
         if st.button("Dönüştür") or st.session_state.converted_data is None:
             with st.spinner("İşleniyor..."):
-                parser = SwimmingParser()
-                data = parser.parse_pdf(uploaded_file)
+                data = convert_pdf(uploaded_file, current_file_hash)
 
                 if data is not None:
                     # Session state'e kaydet
@@ -239,14 +211,15 @@ def main():
     if st.session_state.converted_data is not None:
         data = st.session_state.converted_data
 
-        # Excel indirme butonu
-        excel_file = create_excel_file(data)
-        st.download_button(
-            label="Excel İndir",
-            data=excel_file,
-            file_name=f"sonuclar_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        # Excel indirme butonu - bireysel, bayrak ve diskalifiye sayfaları
+        excel_path = export_path(data, st.session_state.file_hash)
+        if excel_path is not None:
+            st.download_button(
+                label="Excel İndir",
+                data=export_bytes(excel_path),
+                file_name=f"sonuclar_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                mime=XLSX_MIME
+            )
 
         # Veri önizleme
         if not data['individual'].empty:
@@ -256,7 +229,7 @@ def main():
         # Temizle butonu
         if st.button("🗑️ Verileri Temizle"):
             st.session_state.converted_data = None
-            st.session_state.file_name = None
+            st.session_state.file_hash = None
             st.rerun()
 
 
@@ -0,0 +1 @@
+"""Yüzme yarış sonuçları için Streamlit'ten bağımsız işleme modülleri"""
@@ -0,0 +1,112 @@
+"""
+Komut satırı arayüzü
+
+    python -m swim ingest <dizin> --out results.parquet --jobs 8
+    python -m swim fidelity <dosya.pdf> --backends pypdfium2 pdfplumber
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from swim.extraction import BACKENDS, DEFAULT_BACKEND
+from swim.fidelity import compare_backends
+from swim.ingest import combine_results, find_pdfs, ingest_files, write_results
+
+
+def cmd_ingest(args):
+    paths = find_pdfs(args.directory)
+    if not paths:
+        print(f"PDF bulunamadı: {args.directory}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    frames = []
+    failed = 0
+
+    if args.metrics:
+        os.makedirs(args.metrics, exist_ok=True)
+
+    for path, df, pages, seconds, cached, error, metrics in ingest_files(paths, jobs=args.jobs,
+                                                                        use_cache=not args.no_cache,
+                                                                        backend=args.backend):
+        if args.metrics:
+            metrics_path = os.path.join(args.metrics, os.path.splitext(os.path.basename(path))[0] + ".json")
+            with open(metrics_path, 'w', encoding='utf-8') as f:
+                json.dump(metrics, f, ensure_ascii=False, indent=2)
+
+        if error:
+            failed += 1
+            print(f"HATA  {path}: {error}", file=sys.stderr)
+            continue
+
+        if cached:
+            print(f"CACHE {path}: {len(df)} kayıt, {seconds:.2f} sn")
+        else:
+            rate = pages / seconds if seconds > 0 else 0
+            print(f"OK    {path}: {pages} sayfa, {len(df)} kayıt, {seconds:.2f} sn ({rate:.1f} sayfa/sn)")
+
+        if not df.empty:
+            frames.append(df)
+
+    combined_df = combine_results(frames)
+    elapsed = time.perf_counter() - started
+
+    if not combined_df.empty:
+        write_results(combined_df, args.out)
+
+    print(f"Toplam: {len(paths)} dosya, {len(combined_df)} kayıt, {failed} hata, {elapsed:.2f} sn -> {args.out}")
+    return 1 if failed else 0
+
+
+def cmd_fidelity(args):
+    report = compare_backends(args.file, backends=tuple(args.backends))
+    left, right = report["backends"]
+
+    for name in report["backends"]:
+        print(f"{name:<12} {report['rows'][name]:>6} kayıt, çıkarma {report['seconds'][name]:.2f} sn")
+
+    for name in report["backends"]:
+        only = report["only"][name]
+        print(f"\nYalnızca {name}: {len(only)} satır")
+        if not only.empty:
+            print(only.head(args.limit).to_string(index=False))
+
+    if report["pages"]:
+        print(f"\nSonuç satırı sayısı farklı sayfalar ({left} / {right}):")
+        for page, left_count, right_count in report["pages"]:
+            label = "sayfa sayısı" if page is None else f"sayfa {page}"
+            print(f"  {label}: {left_count} / {right_count}")
+
+    differs = any(not only.empty for only in report["only"].values())
+    return 1 if differs else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m swim", description="Yüzme yarış sonuçları işleme")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Dizindeki PDF'leri arayüz olmadan işler")
+    ingest.add_argument("directory", help="PDF dosyalarının bulunduğu dizin")
+    ingest.add_argument("--out", default="results.parquet", help="Çıktı dosyası (.parquet ya da .csv)")
+    ingest.add_argument("--jobs", type=int, default=None, help="Paralel işçi sayısı (varsayılan: çekirdek sayısı)")
+    ingest.add_argument("--no-cache", action="store_true", help="Disk önbelleğini kullanma")
+    ingest.add_argument("--metrics", metavar="DIZIN", help="Dosya başına aşama ölçümlerini JSON olarak bu dizine yaz")
+    ingest.add_argument("--backend", default=DEFAULT_BACKEND, choices=["auto", *BACKENDS],
+                        help="PDF metin çıkarma arka ucu (auto: hızlı arka uç, satır kaybında pdfplumber)")
+    ingest.set_defaults(func=cmd_ingest)
+
+    fidelity = subparsers.add_parser("fidelity", help="İki arka ucun sonuçlarını satır düzeyinde karşılaştırır")
+    fidelity.add_argument("file", help="PDF dosyası")
+    fidelity.add_argument("--backends", nargs=2, default=["pypdfium2", "pdfplumber"], choices=list(BACKENDS),
+                          metavar="ARKA_UC", help=f"Karşılaştırılacak iki arka uç ({', '.join(BACKENDS)})")
+    fidelity.add_argument("--limit", type=int, default=20, help="Gösterilecek en fazla farklı satır")
+    fidelity.set_defaults(func=cmd_fidelity)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
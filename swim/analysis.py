@@ -0,0 +1,33 @@
+"""Sekmelerde kullanılan vektörel analiz hesapları"""
+import pandas as pd
+
+
+def _rank_within(scores, keys):
+    groups = scores.groupby(keys, sort=False, observed=True)
+    return groups.rank(method='min', ascending=False), groups.transform('size')
+
+
+def category_ranks(df):
+    """
+    Tüm veri için kategori içi FINA puanı sıralamasını tek seferde hesaplar.
+    Kategori normalize edilmiş Yarış_Kategori'dir; yoksa (Yarış, Cinsiyet, Yaş) yedeği
+    tüm satırlar içinde kullanılır. Derece = daha yüksek puanlı kayıt sayısı + 1.
+    """
+    fallback_names = df['Yarış'].astype(str) + ' - ' + df['Cinsiyet'].astype(str) + ' ' + df['Yaş'].astype(str) + ' yaş'
+    rank, size = _rank_within(df['Puan'], [df['Yarış'], df['Cinsiyet'], df['Yaş']])
+    names = fallback_names
+
+    if 'Yarış_Kategori' in df.columns:
+        has_category = df['Yarış_Kategori'].notna() & (df['Yarış_Kategori'] != 'N/A')
+        categorized = df.loc[has_category]
+        category_rank, category_size = _rank_within(categorized['Puan'], categorized['Yarış_Kategori'])
+
+        rank = category_rank.reindex(df.index).where(has_category, rank)
+        size = category_size.reindex(df.index).where(has_category, size)
+        names = df['Yarış_Kategori'].astype(str).where(has_category, fallback_names)
+
+    return pd.DataFrame({
+        'Kategori_Adı': names,
+        'Derece': rank.astype(int),
+        'Kategori_Sayısı': size.astype(int),
+    }, index=df.index)
@@ -0,0 +1,114 @@
+"""Parse edilmiş sonuçlar için diskte kalıcı, içerik adresli önbellek"""
+import os
+import glob
+import tempfile
+
+import pandas as pd
+
+# Parse kuralları ya da çıktı şeması değiştiğinde artırın - eski kayıtlar geçersiz olur
+PARSER_VERSION = 3
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SWIM_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".parse_cache")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("SWIM_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+
+class ParseCache:
+    """
+    Dosya hash'i (MD5) ile adreslenen Parquet önbelleği.
+    Her kayıt parser sürümü ile damgalanır; toplam boyut max_bytes'ı aşınca
+    en uzun süredir kullanılmayan kayıtlar silinir (LRU).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, version=PARSER_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, file_hash):
+        return os.path.join(self.cache_dir, f"{file_hash}-v{self.version}.parquet")
+
+    def get(self, file_hash):
+        """Önbellekteki DataFrame'i döndürür, yoksa None"""
+        path = self._path(file_hash)
+        try:
+            df = pd.read_parquet(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+        # LRU için son kullanım zamanını güncelle
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return df
+
+    def put(self, file_hash, df):
+        """DataFrame'i atomik olarak yazar ve gerekirse eski kayıtları temizler"""
+        path = self._path(file_hash)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Aynı dosyanın eski sürüm kayıtlarını sil
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{file_hash}-v*.parquet")):
+            if stale != path:
+                self._remove(stale)
+
+        self.evict()
+
+    def evict(self):
+        """Toplam boyut sınırı aşılırsa en eski kullanılan kayıtları siler"""
+        evict_lru(os.path.join(self.cache_dir, "*.parquet"), self.max_bytes)
+
+    def delete(self, file_hash):
+        """Bir dosyanın tüm sürümlerdeki kayıtlarını siler"""
+        for path in glob.glob(os.path.join(self.cache_dir, f"{file_hash}-v*.parquet")):
+            self._remove(path)
+
+    def clear(self):
+        """Tüm önbelleği siler"""
+        for path in glob.glob(os.path.join(self.cache_dir, "*.parquet")):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+def evict_lru(pattern, max_bytes):
+    """Desene uyan dosyaların toplam boyutu max_bytes'ı aşarsa en eski kullanılanları siler"""
+    entries = []
+    for path in glob.glob(pattern):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,92 @@
+"""Satır temizleme - gürültü satırlarını atar ve OCR hatalarını tek geçişte düzeltir"""
+import re
+
+from swim.instrumentation import count
+
+# Gürültü kuralları: (tür, metin) - "prefix" satır başında, "contains" herhangi bir yerde aranır
+NOISE_RULES = [
+    ("prefix", "SW"),
+    ("prefix", "Puanlar"),
+    ("prefix", "Splash"),
+    ("prefix", "ANTALYA"),
+    ("prefix", "50m:"),
+    ("contains", "KATILIM BARAJINI GEÇTİ"),
+    ("contains", "BAŞHAKEM"),
+    ("contains", "MÜSABAKASI"),
+    ("contains", "BARAJLARI"),
+    ("contains", "Sonuçlar"),
+    ("contains", "YB Zaman Derece"),
+    ("contains", "50m:"),
+    ("contains", "100m:"),
+    ("contains", "150m:"),
+    ("contains", "200m:"),
+]
+
+# OCR düzeltmeleri: (desen, yerine) - sırayla uygulanır
+OCR_REPAIRS = [
+    (r'Kulü(\d+)b:ü(\d+\.\d+)', r'Kulübü \1:\2'),
+    (r'Kulüb(\d+)ü:(\d+\.\d+)', r'Kulübü \1:\2'),
+    # ü ile rakam arasına boşluk ekle (sadece boşluk yoksa)
+    (r'Kulübü(?! )(\d+\.\d+)', r'Kulübü \1'),
+    (r'Kulü3b:ü', 'Kulübü '),
+    (r'Kulü1b:ü', 'Kulübü '),
+    (r'Kulüb1ü', 'Kulübü'),
+    (r'Kulub1ü', 'Kulübü'),
+    (r'Kulub1', 'Kulübü'),
+    (r'Kulübü(\d+):(\d+\.\d+)', r'Kulübü \1:\2'),
+]
+
+
+def _compile_noise(rules):
+    prefixes = [re.escape(text) for kind, text in rules if kind == "prefix"]
+    contains = [re.escape(text) for kind, text in rules if kind == "contains"]
+    return re.compile(f"^(?:{'|'.join(prefixes)})|{'|'.join(contains)}")
+
+
+_NOISE_RE = _compile_noise(NOISE_RULES)
+_REPAIRS = [(re.compile(pattern), repl) for pattern, repl in OCR_REPAIRS]
+# Hiçbir düzeltme deseni eşleşmeyen satırlar (büyük çoğunluk) zincire hiç girmez
+_REPAIR_TRIGGER_RE = re.compile('|'.join(f"(?:{pattern})" for pattern, _ in OCR_REPAIRS))
+
+
+def is_noise(line):
+    """Kırpılmış satır gürültü (başlık, ara derece vb.) ise True"""
+    return _NOISE_RE.search(line) is not None
+
+
+def repair_line(line):
+    """Satırdaki OCR hatalarını düzeltir"""
+    if not _REPAIR_TRIGGER_RE.search(line):
+        return line
+    for pattern, repl in _REPAIRS:
+        line = pattern.sub(repl, line)
+    return line
+
+
+def clean_line(line):
+    """Satırı sınıflandırır: gürültüyse None, değilse düzeltilmiş ve kırpılmış satır"""
+    line = line.strip()
+    if is_noise(line):
+        return None
+    return repair_line(line)
+
+
+def clean_lines(lines):
+    """Satırları tek geçişte temizler, boş ve gürültü satırlarını atar (generator)"""
+    for line in lines:
+        cleaned = clean_line(line)
+        if cleaned:
+            yield cleaned
+
+
+def clean_pages(pages):
+    """Sayfa metinlerinden temizlenmiş satırları sayfa sayfa üretir (generator)"""
+    for page_text in pages:
+        lines = page_text.split('\n')
+        count("lines_seen", len(lines))
+        yield from clean_lines(lines)
+
+
+def clean_text(text):
+    """Metni tek geçişte temizler"""
+    return '\n'.join(clean_lines(text.split('\n')))
@@ -0,0 +1,103 @@
+"""
+Kulüp istatistikleri - dosya başına kısmi toplamlardan birleştirilir.
+Her dosya eklendiğinde (kulüp, şehir, cinsiyet, yaş) grupları için toplam/sayı/en büyük değer
+bir kez hesaplanır; kulüp özeti bu küçük tablodan üretilir, satırlar yeniden taranmaz.
+Kenar çubuğu filtreleri aynı sütunlar üzerinde olduğu için filtreli özet de kesindir.
+"""
+import pandas as pd
+
+# Kısmi toplamların gruplandığı sütunlar - kenar çubuğu filtreleriyle aynı
+GROUP_COLUMNS = ["Kulüp", "Şehir", "Cinsiyet", "Yaş"]
+
+SUMMARY_COLUMNS = ["Ortalama Puan", "En Yüksek Puan", "Sporcu Sayısı", "Ortalama Süre", "Katıldığı Şehirler"]
+
+
+def partial_aggregates(df):
+    """Bir dosyanın (kulüp, şehir, cinsiyet, yaş) grupları için puan ve süre toplamları"""
+    if df.empty:
+        return pd.DataFrame(columns=GROUP_COLUMNS)
+
+    keys = pd.DataFrame({column: df[column].astype(object) for column in GROUP_COLUMNS})
+    values = pd.DataFrame({
+        "Puan": df["Puan"].astype("float64"),
+        "Süre_cs": df["Süre_cs"].astype("float64"),
+    })
+    grouped = pd.concat([keys, values], axis=1).groupby(GROUP_COLUMNS, dropna=False, sort=False)
+    return grouped.agg(
+        points_sum=("Puan", "sum"),
+        points_count=("Puan", "count"),
+        points_max=("Puan", "max"),
+        time_sum=("Süre_cs", "sum"),
+        time_count=("Süre_cs", "count"),
+    ).reset_index()
+
+
+def summarize(partials):
+    """Kısmi toplamlardan kulüp özeti - ortalama puana göre azalan, eşitlikte kulüp adına göre"""
+    if partials.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS, index=pd.Index([], name="Kulüp"))
+
+    clubs = partials.groupby("Kulüp", dropna=False, sort=False).agg(
+        points_sum=("points_sum", "sum"),
+        points_count=("points_count", "sum"),
+        points_max=("points_max", "max"),
+        time_sum=("time_sum", "sum"),
+        time_count=("time_count", "sum"),
+    )
+    # Şehir listeleri: (kulüp, şehir) çiftleri bir kez sıralanır, kulüp başına birleştirilir
+    cities = (
+        partials[["Kulüp", "Şehir"]].dropna(subset=["Şehir"]).drop_duplicates()
+        .sort_values("Şehir", kind="stable").groupby("Kulüp", dropna=False, sort=False)["Şehir"]
+        .agg(", ".join)
+    )
+
+    summary = pd.DataFrame({
+        "Ortalama Puan": clubs["points_sum"] / clubs["points_count"],
+        "En Yüksek Puan": clubs["points_max"].astype("Int64"),
+        "Sporcu Sayısı": clubs["points_count"],
+        "Ortalama Süre": clubs["time_sum"] / clubs["time_count"] / 100,
+        "Katıldığı Şehirler": cities.reindex(clubs.index).fillna(""),
+    }).round(0)
+    summary.index.name = "Kulüp"
+
+    return summary.sort_index().sort_values("Ortalama Puan", ascending=False, kind="stable")
+
+
+class ClubAggregates:
+    """
+    Dosya (satır sahibi numarası) başına kısmi toplamlar. Eklenen dosya için yalnızca o dosyanın
+    satırları gruplanır, kaldırılan dosyanın toplamları atılır. Birleşik kısmi tablo ve
+    filtre seçimi başına özetler değişiklik olana kadar saklanır.
+    """
+
+    def __init__(self):
+        self._partials = {}    # dosya numarası -> kısmi toplamlar
+        self._merged = None
+        self._summaries = {}
+
+    def add(self, slot, df):
+        self._partials[slot] = partial_aggregates(df)
+        self._merged = None
+        self._summaries = {}
+
+    def remove(self, slot):
+        if self._partials.pop(slot, None) is not None:
+            self._merged = None
+            self._summaries = {}
+
+    def partials(self):
+        """Tüm dosyaların kısmi toplamları tek tabloda"""
+        if self._merged is None:
+            frames = [frame for frame in self._partials.values() if not frame.empty]
+            self._merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=GROUP_COLUMNS)
+        return self._merged
+
+    def summary(self, selections=None):
+        """Filtre seçimine (sütun -> değer) uyan kısmi toplamlardan kulüp özeti"""
+        key = tuple(sorted((selections or {}).items()))
+        if key not in self._summaries:
+            partials = self.partials()
+            for column, value in key:
+                partials = partials[partials[column] == value]
+            self._summaries[key] = summarize(partials)
+        return self._summaries[key]
@@ -0,0 +1,124 @@
+"""
+Birleşik sonuçların Arrow tablosu ve sekmelerde kullanılan pyarrow.compute işlemleri.
+Metin sütunları sözlük kodlu (dictionary), süre ve puanlar tamsayıdır; sayısal sütunlar
+pandas tablosuyla aynı belleği paylaşır. Tablolar st.dataframe'e doğrudan (pandas'a
+çevrilmeden) verilir.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def to_arrow(df):
+    """Şemaya uygun DataFrame'i Arrow tablosuna çevirir (kategorik -> dictionary, indeks atılır)"""
+    if df.empty:
+        return pa.table({})
+    return pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+
+
+def take_rows(table, positions):
+    """Satır konumlarını seçer; positions None ise tablo kopyalanmadan döner"""
+    if positions is None:
+        return table
+    return table.take(pa.array(positions, type=pa.int64()))
+
+
+def _dictionary(column):
+    """Sözlük kodlu sütunu tek parça DictionaryArray olarak döndürür; değilse None"""
+    if not pa.types.is_dictionary(column.type):
+        return None
+    return column.unify_dictionaries().combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+
+
+def count_distinct(table, column):
+    """Farklı (boş olmayan) değer sayısı - pc.count_distinct sözlük kodlu sütunları desteklemez"""
+    unique = pc.unique(table[column])
+    return len(unique) - unique.null_count
+
+
+def mean(table, column):
+    value = pc.mean(table[column]).as_py()
+    return float("nan") if value is None else value
+
+
+def value_counts(table, column):
+    """pandas value_counts karşılığı: değer -> satır sayısı, çoktan aza"""
+    array = _dictionary(table[column])
+    if array is not None:
+        # Sözlük kodlarının histogramı - metinler karşılaştırılmaz
+        codes = pc.drop_null(array.indices).to_numpy()
+        counts = np.bincount(codes, minlength=len(array.dictionary))
+        present = np.flatnonzero(counts)
+        series = pd.Series(counts[present], index=pd.Index(array.dictionary.take(present).to_pylist(), name=column),
+                           name="count")
+    else:
+        counts = table.group_by(column).aggregate([([], "count_all")])
+        series = pd.Series(counts["count_all"].to_numpy(), index=pd.Index(counts[column].to_pylist(), name=column),
+                           name="count")
+    return series.sort_values(ascending=False, kind="stable")
+
+
+def search_mask(table, columns, text):
+    """Sütunlardan herhangi birinde metni (büyük/küçük harf duyarsız) içeren satırların maskesi"""
+    mask = None
+    for column in columns:
+        array = _dictionary(table[column])
+        if array is not None:
+            # Arama yalnızca sözlük değerlerinde yapılır, sonuç kodlarla satırlara taşınır
+            matches = pc.match_substring(array.dictionary, text, ignore_case=True)
+            column_mask = pc.take(matches, array.indices)
+        else:
+            values = table[column]
+            if not pa.types.is_string(values.type):
+                values = pc.cast(values, pa.string())
+            column_mask = pc.match_substring(values, text, ignore_case=True)
+        column_mask = pc.fill_null(column_mask, False)
+        mask = column_mask if mask is None else pc.or_(mask, column_mask)
+    return mask
+
+
+def sort_indices(table, column, ascending=True):
+    """
+    Sütuna göre kararlı sıralama indeksleri. Sözlük kodlu sütunlarda önce (küçük) sözlük
+    sıralanır, satırlar değer sıra numarasıyla sıralanır; boş değerler sonda kalır.
+    """
+    order = "ascending" if ascending else "descending"
+    array = _dictionary(table[column])
+    if array is None:
+        return pc.sort_indices(table.select([column]), sort_keys=[(column, order)], null_placement="at_end")
+
+    size = len(array.dictionary)
+    ranks = np.empty(size + 1, dtype=np.int32)
+    ranks[pc.sort_indices(array.dictionary).to_numpy()] = np.arange(size, dtype=np.int32)
+    ranks[size] = size if ascending else -1
+    codes = pc.fill_null(array.indices, size).to_numpy(zero_copy_only=False)
+    keys = pa.table({column: ranks[codes]})
+    return pc.sort_indices(keys, sort_keys=[(column, order)])
+
+
+def page(table, offset, limit, indices=None):
+    """Görünen dilim: indices verilirse o sırayla, yoksa tablo sırasıyla"""
+    if indices is None:
+        return table.slice(offset, limit)
+    return table.take(indices.slice(offset, limit))
+
+
+def compact(table):
+    """
+    Sözlük kodlu sütunları düz metne çevirir. Küçük dilimlerde gereklidir: dilim tüm sözlüğü
+    (ör. bütün sporcu isimleri) taşır ve tarayıcıya onunla birlikte gönderilir.
+    """
+    columns = [
+        pc.cast(column, column.type.value_type) if pa.types.is_dictionary(column.type) else column
+        for column in table.columns
+    ]
+    return pa.table(columns, names=table.column_names)
+
+
+def payload_size(table):
+    """Tablonun Arrow IPC olarak serileştirilmiş boyutu (bayt) - tarayıcıya giden yükün ölçüsü"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
@@ -0,0 +1,170 @@
+"""Dosya dosya büyüyen birleşik sonuç tablosu (yalnızca ekleme + silme işaretleri)"""
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from swim.clubs import ClubAggregates
+from swim.columnar import to_arrow
+from swim.identity import ATHLETE_ID_COLUMN, AthleteResolver
+from swim.instrumentation import count, timer
+from swim.leaderboard import Leaderboard
+from swim.parsing import race_categories
+from swim.schema import enforce_schema
+
+
+def _align_categories(left, right):
+    """Ortak kategorik sütunları aynı kategori kümesine getirir; concat kategorik tipi korur"""
+    for column in left.columns.intersection(right.columns):
+        left_dtype, right_dtype = left[column].dtype, right[column].dtype
+        if not (isinstance(left_dtype, pd.CategoricalDtype) and isinstance(right_dtype, pd.CategoricalDtype)):
+            continue
+        if left_dtype == right_dtype:
+            continue
+        # Sıralı birleşim - tüm dosyalar bir kerede birleştirilmiş gibi; yalnızca tamsayı kodlar yeniden eşlenir
+        categories = left_dtype.categories.union(right_dtype.categories)
+        left[column] = left[column].cat.set_categories(categories)
+        right[column] = right[column].cat.set_categories(categories)
+    return left, right
+
+
+class CombinedDataset:
+    """
+    Yüklenen dosyaların birleşik sonuç tablosu.
+    Yeni dosyalar bir kez sona eklenir, kaldırılan dosyalar işaretlenip tablo istendiğinde
+    maske ile düşülür. Her değişiklikte sürüm artar; sürüm değişmedikçe aynı DataFrame
+    ve aynı Arrow tablosu (ve lider tablosu) döner.
+    """
+
+    def __init__(self):
+        self.uid = uuid.uuid4().hex[:12]
+        self.revision = 0
+        self._slots = {}       # anahtar -> satır sahibi numarası
+        self._next_slot = 0
+        self._tombstones = set()
+        self._frame = pd.DataFrame()
+        self._owners = np.empty(0, dtype=np.int32)
+        self._resolver = AthleteResolver()
+        self._clubs = ClubAggregates()
+        self._athlete_nodes = np.empty(0, dtype=np.int32)
+        self._table = None
+        self._table_revision = None
+        self._labels = {}
+        self._labels_revision = None
+        self._leaderboard = None
+        self._leaderboard_revision = None
+
+    @property
+    def version(self):
+        """Oturumlar arası da tekil sürüm anahtarı (st.cache_data anahtarlarında kullanılır)"""
+        return f"{self.uid}.{self.revision}"
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def keys(self):
+        return list(self._slots)
+
+    def append(self, key, df):
+        """Bir dosyanın sonuçlarını sona ekler; anahtar zaten varsa hiçbir şey yapmaz"""
+        if key in self._slots:
+            return
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[key] = slot
+
+        if df.empty:
+            return
+
+        with timer("dataset_append"):
+            # Yarış_Kategori sütunu yoksa oluştur (eski cache'ler için)
+            if 'Yarış_Kategori' not in df.columns:
+                df = df.assign(Yarış_Kategori=race_categories(df))
+            df = enforce_schema(df.drop(columns=[ATHLETE_ID_COLUMN], errors="ignore"))
+
+            if self._frame.empty:
+                frame = df.reset_index(drop=True)
+            else:
+                base = self._frame.drop(columns=[ATHLETE_ID_COLUMN])
+                base, new = _align_categories(base, df.copy(deep=False))
+                frame = pd.concat([base, new], ignore_index=True)
+
+            self._owners = np.concatenate([self._owners, np.full(len(df), slot, dtype=np.int32)])
+
+        # Kulüp istatistikleri için yalnızca yeni dosyanın kısmi toplamları hesaplanır
+        with timer("club_aggregates"):
+            self._clubs.add(slot, df)
+
+        # Yeni dosyanın sporcuları mevcut kimliklerle eşleştirilir; birleşen kümeler tüm satırlara yansır
+        with timer("identity"):
+            self._athlete_nodes = np.concatenate([self._athlete_nodes, self._resolver.add(df)])
+            frame[ATHLETE_ID_COLUMN] = self._resolver.athlete_ids(self._athlete_nodes)
+        self._frame = frame
+
+        count("dataset_rows_appended", len(df))
+        self.revision += 1
+
+    def remove(self, key):
+        """Dosyayı silindi olarak işaretler; satırlar bir sonraki frame() çağrısında düşülür"""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        self._tombstones.add(slot)
+        self._clubs.remove(slot)
+        self.revision += 1
+
+    def retain(self, keys):
+        """Verilen anahtarlar dışındaki dosyaları kaldırır"""
+        keys = set(keys)
+        for key in [key for key in self._slots if key not in keys]:
+            self.remove(key)
+
+    def clear(self):
+        self.__init__()
+
+    def frame(self):
+        """Birleşik DataFrame; silinmiş dosyaların satırları yalnızca gerektiğinde düşülür"""
+        if self._tombstones:
+            with timer("dataset_compact"):
+                keep = ~np.isin(self._owners, list(self._tombstones))
+                frame = self._frame[keep].reset_index(drop=True)
+                for column in frame.columns:
+                    if isinstance(frame[column].dtype, pd.CategoricalDtype):
+                        frame[column] = frame[column].cat.remove_unused_categories()
+                self._frame = frame if not frame.empty else pd.DataFrame()
+                self._owners = self._owners[keep]
+                self._athlete_nodes = self._athlete_nodes[keep]
+                self._tombstones.clear()
+        return self._frame
+
+    def athlete_labels(self):
+        """Sporcu kimliği -> görünen isim - sürüm başına bir kez hesaplanır"""
+        if self._labels_revision != self.revision:
+            self._labels = self._resolver.labels()
+            self._labels_revision = self.revision
+        return self._labels
+
+    def club_summary(self, selections=None):
+        """Kulüp özeti - dosya başına kısmi toplamlardan, filtre seçimi başına bir kez"""
+        return self._clubs.summary(selections)
+
+    def leaderboard(self):
+        """Yarış bazlı sıralama indeksi - sürüm başına bir kez kurulur"""
+        if self._leaderboard_revision != self.revision:
+            frame = self.frame()
+            with timer("dataset_leaderboard"):
+                self._leaderboard = Leaderboard(frame)
+            self._leaderboard_revision = self.revision
+        return self._leaderboard
+
+    def table(self):
+        """Birleşik verinin Arrow tablosu - sürüm başına bir kez kurulur"""
+        if self._table_revision != self.revision:
+            frame = self.frame()
+            with timer("dataset_arrow"):
+                self._table = to_arrow(frame)
+            self._table_revision = self.revision
+        return self._table
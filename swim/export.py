@@ -0,0 +1,184 @@
+"""
+Excel dışa aktarımı - XlsxWriter sabit bellek (constant_memory) modunda satır satır yazar.
+Çalışma kitapları içerik hash'i ile diskte önbelleğe alınır; aynı veri için yeniden üretilmez.
+"""
+import os
+import hashlib
+import tempfile
+import zipfile
+
+import pandas as pd
+import xlsxwriter
+
+from swim.cache import DEFAULT_CACHE_DIR, PARSER_VERSION, evict_lru
+
+# (tablo anahtarı, sayfa adı) - çalışma kitabındaki sırayla
+SHEETS = [
+    ("individual", "Bireysel"),
+    ("team", "Bayrak"),
+    ("disqualified", "Diskalifiye"),
+]
+
+# Çalışma kitabı ya da ZIP düzeni değiştiğinde artırın - eski dosyalar geçersiz olur
+EXPORT_VERSION = 2
+
+DEFAULT_EXPORT_DIR = os.path.join(DEFAULT_CACHE_DIR, "exports")
+DEFAULT_EXPORT_MAX_BYTES = int(os.environ.get("SWIM_EXPORT_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Satırlar bu büyüklükte parçalarla Python nesnelerine çevrilir
+ROW_CHUNK_SIZE = 5000
+
+# Sütun genişliği için bakılan satır sayısı
+WIDTH_SAMPLE_ROWS = 200
+
+
+def _column_widths(df):
+    sample = df.head(WIDTH_SAMPLE_ROWS).astype(str)
+    return [
+        min(60, max([len(str(column))] + sample[column].str.len().tolist()) + 2)
+        for column in df.columns
+    ]
+
+
+def _iter_rows(df):
+    """DataFrame satırlarını parça parça, boş değerleri None olan Python listeleri olarak üretir"""
+    for start in range(0, len(df), ROW_CHUNK_SIZE):
+        chunk = df.iloc[start:start + ROW_CHUNK_SIZE].astype(object)
+        yield from chunk.where(chunk.notna(), None).values.tolist()
+
+
+def write_sheet(workbook, name, df, header_format=None):
+    """Tabloyu yeni bir sayfaya sırayla yazar (sabit bellek modunda satırlar artan sırada olmalı)"""
+    worksheet = workbook.add_worksheet(name)
+    for column, width in enumerate(_column_widths(df)):
+        worksheet.set_column(column, column, width)
+
+    worksheet.write_row(0, 0, [str(column) for column in df.columns], header_format)
+    for row_number, row in enumerate(_iter_rows(df), start=1):
+        worksheet.write_row(row_number, 0, row)
+
+    if len(df.columns):
+        worksheet.freeze_panes(1, 0)
+        worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+    return worksheet
+
+
+def write_workbook(tables, path, sheets=SHEETS):
+    """Boş olmayan tabloları (bireysel, bayrak, diskalifiye) ayrı sayfalara yazar"""
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "tmpdir": os.path.dirname(path) or None})
+    header_format = workbook.add_format({"bold": True})
+
+    written = 0
+    for key, name in sheets:
+        df = tables.get(key)
+        if df is None or df.empty:
+            continue
+        write_sheet(workbook, name, df, header_format)
+        written += 1
+
+    if not written:
+        # Geçerli bir dosya için en az bir sayfa gerekir
+        workbook.add_worksheet(sheets[0][1])
+
+    workbook.close()
+
+
+class ExportCache:
+    """İçerik hash'i ile adreslenen .xlsx/.zip önbelleği; boyut aşılınca en eski dosyalar silinir"""
+
+    def __init__(self, cache_dir=DEFAULT_EXPORT_DIR, max_bytes=DEFAULT_EXPORT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}-v{PARSER_VERSION}.{EXPORT_VERSION}.{extension}")
+
+    def _get_or_write(self, key, extension, write):
+        path = self._path(key, extension)
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=f".{extension}.tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        evict_lru(os.path.join(self.cache_dir, "*-v*.*"), self.max_bytes)
+        return path
+
+    def get_or_create(self, key, tables):
+        """
+        Önbellekteki çalışma kitabının yolunu döndürür; yoksa tables'tan bir kez üretir.
+        tables bir sözlük ya da sözlük döndüren bir çağrı olabilir (yalnızca gerekirse çağrılır).
+        """
+        return self._get_or_write(key, "xlsx", lambda path: write_workbook(tables() if callable(tables) else tables,
+                                                                          path))
+
+    def get_or_create_zip(self, key, members):
+        """members: [(arşivdeki ad, dosya yolu)] - dosyalar ZIP'e sıkıştırmadan eklenir (xlsx zaten sıkıştırılmış)"""
+        def write(path):
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+                for name, member_path in members:
+                    archive.write(member_path, arcname=name)
+
+        return self._get_or_write(key, "zip", write)
+
+
+def batch_key(file_keys, kind):
+    """(dosya hash'i, şehir) çiftlerinden toplu dışa aktarım anahtarı - dosya sırasından bağımsız"""
+    digest = hashlib.md5(kind.encode())
+    for file_hash, city_name in sorted(file_keys):
+        digest.update(f"{file_hash}:{city_name};".encode())
+    return digest.hexdigest()
+
+
+def archive_names(file_keys, extension="xlsx"):
+    """
+    (dosya hash'i, şehir) çiftleri için ZIP içindeki benzersiz adlar, aynı sırayla.
+    Aynı şehre düşen farklı dosyalara hash öneki eklenir ("ANTALYA_1b5abfcf.xlsx"); ad
+    yükleme sırasından bağımsızdır. Aynı (hash, şehir) çifti tekrar ederse None döner - atlanır.
+    """
+    cities = {}
+    for file_hash, city_name in set(file_keys):
+        cities.setdefault(city_name, []).append(file_hash)
+
+    names, seen = [], set()
+    for key in file_keys:
+        file_hash, city_name = key
+        if key in seen:
+            names.append(None)
+            continue
+        seen.add(key)
+        suffix = f"_{file_hash[:8]}" if len(cities[city_name]) > 1 else ""
+        names.append(f"{city_name}{suffix}.{extension}")
+    return names
+
+
+def combine_tables(named_tables, city_column="Şehir"):
+    """
+    [(şehir, tablo sözlüğü)] listesini tek tablo sözlüğünde birleştirir;
+    her tablonun başına şehir sütunu eklenir.
+    """
+    combined = {}
+    for key, _ in SHEETS:
+        frames = [
+            tables[key].assign(**{city_column: city_name})
+            for city_name, tables in named_tables
+            if tables.get(key) is not None and not tables[key].empty
+        ]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            combined[key] = df[[city_column] + [column for column in df.columns if column != city_column]]
+    return combined
+
+
+def read_export(path):
+    with open(path, "rb") as f:
+        return f.read()
@@ -0,0 +1,323 @@
+"""PDF'den sayfa metni çıkarma - seçilebilir arka uçlar, paralel (process pool) destekli"""
+import os
+import io
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+import pypdfium2
+from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+from pdfminer.layout import LAParams, LTTextContainer
+from pdfminer.pdfpage import PDFPage
+
+from swim.instrumentation import count
+from swim.linescan import scan_tail
+from swim.pool import spawn_pool
+
+# Her işçiye gönderilecek sayfa sayısı
+DEFAULT_CHUNK_SIZE = 8
+
+# "auto": hızlı arka uç (pypdfium2), örnek sayfalarda satır kaybederse pdfplumber;
+# hızlı arka uçla çıkarılan her sayfa ayrıca denetlenir (bkz. verify_page)
+DEFAULT_BACKEND = os.environ.get("SWIM_PDF_BACKEND", "auto")
+FAST_BACKEND = "pypdfium2"
+REFERENCE_BACKEND = "pdfplumber"
+
+# auto modunda iki arka ucun karşılaştırıldığı örnek sayfa sayısı
+PROBE_PAGES = 3
+
+# Bundan az sayfalı dosyalar tek süreçte çıkarılır - süreçlere dağıtmanın maliyeti kazancı geçer
+MIN_PARALLEL_PAGES = int(os.environ.get("SWIM_MIN_PARALLEL_PAGES", "24"))
+
+# İşçi sayısı -> uzun ömürlü süreç havuzu (dosyalar arasında paylaşılır; süreç açılışı bir kez ödenir)
+_pools = {}
+_pools_lock = threading.Lock()
+
+# PDFium thread-safe değil; Streamlit oturumları ayrı thread'lerde çalışır
+_pdfium_lock = threading.Lock()
+
+
+class PdfPlumberBackend:
+    """Karakter konumlarından satır kurar - en doğru ama en yavaş"""
+    name = "pdfplumber"
+    parallel = True
+
+    @staticmethod
+    def page_count(pdf_bytes):
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            return len(pdf.pages)
+
+    @staticmethod
+    def extract_range(pdf_bytes, start, stop):
+        texts = []
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            for page in pdf.pages[start:stop]:
+                texts.append(page.extract_text() or "")
+        return texts
+
+
+class PdfiumBackend:
+    """PDFium (C++) metin katmanı - pdfplumber'dan onlarca kat hızlı"""
+    name = "pypdfium2"
+    parallel = False
+
+    @staticmethod
+    def page_count(pdf_bytes):
+        with _pdfium_lock:
+            pdf = pypdfium2.PdfDocument(pdf_bytes)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    @staticmethod
+    def extract_range(pdf_bytes, start, stop):
+        texts = []
+        with _pdfium_lock:
+            pdf = pypdfium2.PdfDocument(pdf_bytes)
+            try:
+                for index in range(start, min(stop, len(pdf))):
+                    page = pdf[index]
+                    text_page = page.get_textpage()
+                    text = text_page.get_text_bounded()
+                    text_page.close()
+                    page.close()
+                    texts.append(text.replace("\r\n", "\n").replace("\r", "\n"))
+            finally:
+                pdf.close()
+        return texts
+
+
+class PdfMinerBackend:
+    """pdfminer.six düzen analizi (LAParams) - metin kutularını sırayla birleştirir"""
+    name = "pdfminer"
+    parallel = True
+
+    @staticmethod
+    def page_count(pdf_bytes):
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(pdf_bytes)))
+
+    @staticmethod
+    def extract_range(pdf_bytes, start, stop):
+        texts = []
+        layouts = pdfminer_extract_pages(io.BytesIO(pdf_bytes), page_numbers=range(start, stop), laparams=LAParams())
+        for layout in layouts:
+            texts.append("".join(element.get_text() for element in layout if isinstance(element, LTTextContainer)))
+        return texts
+
+
+BACKENDS = {backend.name: backend for backend in (PdfiumBackend, PdfPlumberBackend, PdfMinerBackend)}
+
+
+def get_backend(name):
+    """Ada göre arka uç; bilinmeyen adda ValueError"""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen PDF arka ucu: {name} (seçenekler: auto, {', '.join(BACKENDS)})")
+
+
+def count_result_lines(text):
+    """Süre ve puanla biten (sonuç olabilecek) satır sayısı - arka uçları karşılaştırmak için"""
+    total = 0
+    for line in text.splitlines():
+        line = line.strip()
+        tail = scan_tail(line)
+        if tail and any(char in ".,:" for char in line[tail[1]:tail[2]]):
+            total += 1
+    return total
+
+
+def probe_pages(total_pages, samples=PROBE_PAGES):
+    """Karşılaştırma için baş, orta ve son sayfalardan örnek"""
+    if total_pages <= samples:
+        return list(range(total_pages))
+    step = (total_pages - 1) / (samples - 1)
+    return sorted({round(i * step) for i in range(samples)})
+
+
+def choose_backend(pdf_bytes, total_pages):
+    """
+    auto modu: örnek sayfalarda hızlı arka uç pdfplumber'dan daha az sonuç satırı
+    çıkarırsa ya da hata verirse dosyanın tamamı pdfplumber ile işlenir.
+    """
+    fast = BACKENDS[FAST_BACKEND]
+    reference = BACKENDS[REFERENCE_BACKEND]
+    try:
+        for index in probe_pages(total_pages):
+            fast_text = fast.extract_range(pdf_bytes, index, index + 1)
+            reference_text = reference.extract_range(pdf_bytes, index, index + 1)
+            if count_result_lines("\n".join(fast_text)) < count_result_lines("\n".join(reference_text)):
+                count("backend_fallback")
+                return REFERENCE_BACKEND
+    except Exception:
+        count("backend_fallback")
+        return REFERENCE_BACKEND
+    return FAST_BACKEND
+
+
+def verify_page(pdf_bytes, index, text):
+    """
+    auto modunda sayfa denetimi: hızlı arka ucun metni boş değil ama hiç sonuç satırı yoksa
+    sayfa pdfplumber ile yeniden çıkarılır; daha çok sonuç satırı veren metin kullanılır.
+    Örnek sayfalarda görünmeyen satır kayıpları böylece sayfa bazında yakalanır.
+    """
+    if not text.strip() or count_result_lines(text):
+        return text
+    try:
+        reference_text = BACKENDS[REFERENCE_BACKEND].extract_range(pdf_bytes, index, index + 1)[0]
+    except Exception:
+        return text
+    if count_result_lines(reference_text):
+        count("page_fallback")
+        return reference_text
+    return text
+
+
+def default_jobs(backend=REFERENCE_BACKEND):
+    """Varsayılan işçi sayısı - yavaş arka uçlarda çekirdek sayısı, hızlılarda süreç açmaya değmez"""
+    if not get_backend(backend).parallel:
+        return 1
+    return os.cpu_count() or 1
+
+
+def read_pdf_bytes(pdf_file):
+    """Dosya yolu, bytes ya da dosya benzeri nesneden PDF içeriğini okur"""
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as f:
+            return f.read()
+
+    pdf_file.seek(0)
+    content = pdf_file.read()
+    pdf_file.seek(0)
+    return content
+
+
+def split_page_range(total_pages, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sayfa aralığını (başlangıç, bitiş) parçalarına böler"""
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, total_pages))
+            for start in range(0, total_pages, chunk_size)]
+
+
+def split_page_list(pages, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sıralı sayfa numaralarını ardışık (başlangıç, bitiş) parçalarına böler"""
+    chunk_size = max(1, chunk_size)
+    chunks = []
+    for page in pages:
+        if chunks and chunks[-1][1] == page and chunks[-1][1] - chunks[-1][0] < chunk_size:
+            chunks[-1] = (chunks[-1][0], page + 1)
+        else:
+            chunks.append((page, page + 1))
+    return chunks
+
+
+def extract_page_range(pdf_bytes, start, stop, backend=REFERENCE_BACKEND):
+    """[start, stop) aralığındaki sayfaların metinlerini sırayla döndürür"""
+    return get_backend(backend).extract_range(pdf_bytes, start, stop)
+
+
+def _extract_chunk(pdf_bytes, start, stop, backend):
+    return start, extract_page_range(pdf_bytes, start, stop, backend)
+
+
+def _pool(jobs):
+    """jobs işçili paylaşılan süreç havuzu; ilk kullanımda açılır, süreçler dosyalar arasında yaşar"""
+    with _pools_lock:
+        executor = _pools.get(jobs)
+        if executor is None:
+            executor = _pools[jobs] = spawn_pool(jobs)
+        return executor
+
+
+def _submit_chunks(pdf_bytes, chunks, backend, jobs):
+    """Parçaları paylaşılan havuza gönderir; havuz çökmüşse yenisi açılır"""
+    executor = _pool(jobs)
+    try:
+        return [executor.submit(_extract_chunk, pdf_bytes, start, stop, backend) for start, stop in chunks]
+    except BrokenProcessPool:
+        with _pools_lock:
+            if _pools.get(jobs) is executor:
+                del _pools[jobs]
+        executor = _pool(jobs)
+        return [executor.submit(_extract_chunk, pdf_bytes, start, stop, backend) for start, stop in chunks]
+
+
+def resolve_backend(pdf_bytes, backend=None):
+    """Arka uç adını çözer; "auto" ise dosyaya göre seçer. Sonuç: (ad, sayfa sayısı)"""
+    backend = backend or DEFAULT_BACKEND
+    if backend != "auto":
+        return backend, get_backend(backend).page_count(pdf_bytes)
+
+    try:
+        total_pages = BACKENDS[FAST_BACKEND].page_count(pdf_bytes)
+    except Exception:
+        count("backend_fallback")
+        return REFERENCE_BACKEND, BACKENDS[REFERENCE_BACKEND].page_count(pdf_bytes)
+    return choose_backend(pdf_bytes, total_pages), total_pages
+
+
+def iter_pages(pdf_file, jobs=None, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None, backend=None, pages=None,
+               verify=None):
+    """
+    PDF'in sayfa metinlerini sayfa sırasıyla üretir (generator).
+    backend: "auto", "pypdfium2", "pdfplumber" ya da "pdfminer" (varsayılan: SWIM_PDF_BACKEND / auto).
+    pages verilirse yalnızca bu (sıralı, 0 tabanlı) sayfalar çıkarılır.
+    verify: hızlı arka ucun sayfaları verify_page ile denetlensin mi (varsayılan: auto modunda evet).
+    jobs > 1 ise (ve en az MIN_PARALLEL_PAGES sayfa varsa) sayfa parçaları paylaşılan süreç
+    havuzunda çıkarılır; ilk parça biter bitmez sayfalar tüketiciye akar.
+    on_progress(biten, toplam) her parçada çağrılır.
+    """
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    auto = (backend or DEFAULT_BACKEND) == "auto"
+    backend, total_pages = resolve_backend(pdf_bytes, backend)
+    count(f"backend_{backend}")
+    if verify is None:
+        verify = auto
+    verify = verify and backend == FAST_BACKEND
+
+    if pages is None:
+        chunks = split_page_range(total_pages, chunk_size)
+    else:
+        chunks = split_page_list([page for page in pages if page < total_pages], chunk_size)
+        total_pages = sum(stop - start for start, stop in chunks)
+    if not chunks:
+        return
+    jobs = min(jobs or default_jobs(backend), len(chunks))
+    if total_pages < MIN_PARALLEL_PAGES:
+        jobs = 1
+    done = 0
+
+    if jobs <= 1:
+        for start, stop in chunks:
+            texts = extract_page_range(pdf_bytes, start, stop, backend)
+            if verify:
+                texts = [verify_page(pdf_bytes, start + offset, text) for offset, text in enumerate(texts)]
+            done += len(texts)
+            if on_progress:
+                on_progress(done, total_pages)
+            yield from texts
+        return
+
+    futures = _submit_chunks(pdf_bytes, chunks, backend, jobs)
+    try:
+        # Parçalar sırayla beklenir; sonraki parçalar bu sırada arka planda çıkarılır
+        for future in futures:
+            start, texts = future.result()
+            if verify:
+                texts = [verify_page(pdf_bytes, start + offset, text) for offset, text in enumerate(texts)]
+            done += len(texts)
+            if on_progress:
+                on_progress(done, total_pages)
+            yield from texts
+    finally:
+        # Tüketici erken bırakırsa (ya da hata olursa) kalan parçalar paylaşılan havuzu meşgul etmesin
+        for future in futures:
+            future.cancel()
+
+
+def extract_pages(pdf_file, jobs=None, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None, backend=None):
+    """PDF'in tüm sayfa metinlerini sayfa sırasıyla liste olarak döndürür"""
+    return list(iter_pages(pdf_file, jobs=jobs, chunk_size=chunk_size, on_progress=on_progress, backend=backend))
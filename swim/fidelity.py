@@ -0,0 +1,66 @@
+"""İki metin çıkarma arka ucunun sonuçlarını satır düzeyinde karşılaştırma"""
+import time
+
+import pandas as pd
+
+from swim.cleaning import clean_pages
+from swim.extraction import FAST_BACKEND, REFERENCE_BACKEND, count_result_lines, extract_pages, read_pdf_bytes
+from swim.ingest import finalize_results
+from swim.parsing import iter_records, iter_record_batches, records_to_frame
+
+# Bir sonuç satırını tanımlayan sütunlar (Şehir her iki tarafta aynıdır)
+ROW_COLUMNS = ["Yarış", "Cinsiyet", "Yaş", "YB", "İsim", "Kulüp", "Zaman", "Puan"]
+
+
+def row_differences(left, right):
+    """
+    İki sonuç tablosunu çoklu küme olarak karşılaştırır (aynı satır birden çok kez olabilir).
+    Sonuç: (yalnızca soldaki satırlar, yalnızca sağdaki satırlar)
+    """
+    def keyed(df):
+        frame = df.reindex(columns=ROW_COLUMNS).astype(str)
+        frame["_n"] = frame.groupby(ROW_COLUMNS, sort=False).cumcount()
+        return frame
+
+    merged = keyed(left).merge(keyed(right), how="outer", on=ROW_COLUMNS + ["_n"], indicator=True)
+    only_left = merged.loc[merged["_merge"] == "left_only", ROW_COLUMNS].reset_index(drop=True)
+    only_right = merged.loc[merged["_merge"] == "right_only", ROW_COLUMNS].reset_index(drop=True)
+    return only_left, only_right
+
+
+def compare_backends(pdf_file, backends=(FAST_BACKEND, REFERENCE_BACKEND), city_name=""):
+    """
+    PDF'i iki arka uçla ayrı ayrı çıkarıp parse eder.
+    Sonuç sözlüğü: arka uç başına kayıt sayısı ve süre, yalnızca bir tarafta olan satırlar
+    ve sonuç satırı sayısı farklı olan sayfalar [(sayfa no, sol, sağ)].
+    """
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    results = {}
+    page_counts = {}
+    seconds = {}
+
+    for name in backends:
+        started = time.perf_counter()
+        pages = extract_pages(pdf_bytes, jobs=1, backend=name)
+        seconds[name] = time.perf_counter() - started
+        page_counts[name] = [count_result_lines(text) for text in pages]
+        df = records_to_frame(iter_record_batches(iter_records(clean_pages(pages), city_name)))
+        results[name] = finalize_results(df) if not df.empty else pd.DataFrame(columns=ROW_COLUMNS)
+
+    left, right = backends
+    only_left, only_right = row_differences(results[left], results[right])
+    pages = [
+        (index + 1, left_count, right_count)
+        for index, (left_count, right_count) in enumerate(zip(page_counts[left], page_counts[right]))
+        if left_count != right_count
+    ]
+    if len(page_counts[left]) != len(page_counts[right]):
+        pages.append((None, len(page_counts[left]), len(page_counts[right])))
+
+    return {
+        "backends": list(backends),
+        "rows": {name: len(df) for name, df in results.items()},
+        "seconds": seconds,
+        "only": {left: only_left, right: only_right},
+        "pages": pages,
+    }
@@ -0,0 +1,82 @@
+"""Kenar çubuğu filtreleri için önceden hesaplanmış bitmap indeksi"""
+import numpy as np
+
+FILTER_COLUMNS = ["Şehir", "Cinsiyet", "Yaş", "Kulüp"]
+
+
+class FilterIndex:
+    """
+    Her filtre sütunu için değer -> satır bitmap'i (np.packbits) tutar.
+    Filtre kombinasyonları bitmap kesişimi ile cevaplanır; seçenek listeleri
+    (sütun, üst seçimler) anahtarıyla önbelleğe alınır.
+    """
+
+    def __init__(self, df, version=None, columns=FILTER_COLUMNS):
+        self.df = df
+        self.version = version
+        self.size = len(df)
+        self.codes = {}
+        self.values = {}
+        self.bitmaps = {}
+        self._options_cache = {}
+
+        for column in columns:
+            if column not in df.columns:
+                continue
+
+            series = df[column]
+            if hasattr(series, 'cat'):
+                codes = series.cat.codes.to_numpy()
+                values = series.cat.categories.tolist()
+            else:
+                codes, uniques = series.factorize(sort=False)
+                values = uniques.tolist()
+
+            self.codes[column] = codes
+            self.values[column] = values
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(values)
+            }
+
+    def mask(self, selections):
+        """Seçimlerin (sütun -> değer) kesişimini paketli bitmap olarak döndürür; seçim yoksa None"""
+        result = None
+        for column, value in selections.items():
+            bitmap = self.bitmaps[column].get(value)
+            if bitmap is None:
+                bitmap = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            result = bitmap if result is None else np.bitwise_and(result, bitmap)
+        return result
+
+    def positions(self, selections):
+        """Seçimlere uyan satır konumları"""
+        mask = self.mask(selections)
+        if mask is None:
+            return np.arange(self.size)
+        return np.flatnonzero(np.unpackbits(mask, count=self.size))
+
+    def row_mask(self, selections):
+        """Seçimlere uyan satırlar için bool dizi; seçim yoksa None"""
+        mask = self.mask(selections)
+        if mask is None:
+            return None
+        return np.unpackbits(mask, count=self.size).view(bool)
+
+    def select(self, selections):
+        """Seçimlere uyan satırlar; seçim yoksa DataFrame kopyalanmadan döner"""
+        if not selections:
+            return self.df
+        return self.df.iloc[self.positions(selections)]
+
+    def options(self, column, selections):
+        """Üst seçimlere uyan satırlarda görülen (boş olmayan) değerlerin sıralı listesi"""
+        key = (column, tuple(sorted(selections.items(), key=lambda item: item[0])))
+        if key not in self._options_cache:
+            codes = self.codes[column]
+            if selections:
+                codes = codes[self.positions(selections)]
+            present = np.unique(codes)
+            values = self.values[column]
+            self._options_cache[key] = sorted(values[code] for code in present if code >= 0)
+        return self._options_cache[key]
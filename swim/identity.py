@@ -0,0 +1,230 @@
+"""
+Şehirler arası sporcu kimliği eşleştirme.
+OCR farklılıkları yüzünden aynı sporcu farklı yazılmış isimlerle görünebilir. Adaylar doğum
+yılı (YB) ve isim parçası anahtarlarıyla bloklanır; benzerlik yalnızca blok içinde hesaplanır.
+Eşleşen kayıtlar birleşim-bul (union-find) ile kümelenir, her kümeye kararlı bir sporcu
+kimliği verilir. Yeni dosyalar geldikçe yalnızca yeni (isim, YB) çiftleri işlenir.
+"""
+import hashlib
+import unicodedata
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# Birleşik tabloda kimlik sütunu
+ATHLETE_ID_COLUMN = "Sporcu_ID"
+
+# Türkçe harfler ve sık OCR karışıklıkları ASCII karşılıklarına indirgenir
+_FOLD = str.maketrans({
+    "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+    "â": "a", "î": "i", "û": "u",
+})
+
+# Bir isim parçasından üretilen ek (baş/son) uzunluğu
+KEY_LENGTH = 3
+
+# Parça başına en düşük benzerlik. Kulüp benzer değilse isim parçaları (Türkçe harf ve büyük/küçük
+# harf indirgemesinden sonra) birebir aynı olmalı - yalnızca sıra farkı ya da eksik ikinci ad;
+# "Aslan" / "Arslan" gibi yakın ama farklı soyadları yalnızca kulüp de benzerse birleşir.
+NAME_THRESHOLD = 1.0
+NAME_WITH_CLUB_THRESHOLD = 0.8
+CLUB_THRESHOLD = 0.8
+
+# Kulüp adlarında ayırt edici olmayan kelimeler - "A Kulübü" / "B Kulübü" benzer sayılmasın
+CLUB_STOPWORDS = {
+    "spor", "sporlari", "kulubu", "kulup", "kulub", "sk", "yuzme", "ihtisas", "su", "genclik", "ve",
+}
+
+
+def normalize_name(name):
+    """Küçük harf, Türkçe karakterler ASCII, harf dışı karakterler boşluk, tek boşluk"""
+    text = str(name).replace("İ", "i").replace("I", "ı").lower().translate(_FOLD)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char if char.isalpha() else " " for char in text if not unicodedata.combining(char))
+    return " ".join(text.split())
+
+
+def club_key(club):
+    """Kulüp karşılaştırma anahtarı: normalize ad, genel kelimeler atılır (yalnızca onlardan oluşuyorsa kalır)"""
+    normalized = normalize_name(club)
+    tokens = [token for token in normalized.split() if token not in CLUB_STOPWORDS]
+    return " ".join(tokens) if tokens else normalized
+
+
+def _affixes(token):
+    return "^" + token[:KEY_LENGTH], token[-KEY_LENGTH:] + "$"
+
+
+def block_keys(normalized, birth_year):
+    """
+    (YB, ek, ek) blokları: iki farklı isim parçasının baş/son eklerinin sırasız çiftleri.
+    Tek bir parçadaki OCR hatası eklerden en çok birini bozar, en az bir blok ortak kalır;
+    parça sırası (soyad önce) blokları değiştirmez. Tek parçalı isimlerde ekler tek başına kullanılır.
+    """
+    tokens = normalized.split()
+    if len(tokens) < 2:
+        return {(birth_year, affix) for token in tokens for affix in _affixes(token)}
+
+    keys = set()
+    for left, right in combinations(tokens, 2):
+        for left_affix in _affixes(left):
+            for right_affix in _affixes(right):
+                keys.add((birth_year,) + tuple(sorted((left_affix, right_affix))))
+    return keys
+
+
+def name_similarity(left, right):
+    """
+    Parça bazında benzerlik: kısa isimdeki her parça uzun isimdeki en benzer (kullanılmamış)
+    parçayla eşlenir, en zayıf eşleşme döner. Sıra farkı ve eksik ikinci ad tolere edilir;
+    "Mehmet" / "Ahmet" gibi farklı adlar tüm ismin benzerliğine rağmen ayrılır.
+    """
+    left_tokens, right_tokens = left.split(), right.split()
+    if len(left_tokens) > len(right_tokens):
+        left_tokens, right_tokens = right_tokens, left_tokens
+    if not left_tokens or (len(left_tokens) != len(right_tokens) and len(left_tokens) < 2):
+        return 0.0
+
+    remaining = list(right_tokens)
+    weakest = 1.0
+    for token in left_tokens:
+        if token in remaining:
+            remaining.remove(token)
+            continue
+        best, best_index = 0.0, None
+        for index, candidate in enumerate(remaining):
+            matcher = SequenceMatcher(None, token, candidate)
+            if matcher.real_quick_ratio() <= best or matcher.quick_ratio() <= best:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best:
+                best, best_index = ratio, index
+        if best_index is None:
+            return 0.0
+        remaining.pop(best_index)
+        weakest = min(weakest, best)
+    return weakest
+
+
+def _club_similarity(left_clubs, right_clubs):
+    best = 0.0
+    for left in left_clubs:
+        for right in right_clubs:
+            best = max(best, 1.0 if left == right else SequenceMatcher(None, left, right).ratio())
+    return best
+
+
+class AthleteResolver:
+    """
+    Artımlı kimlik eşleştirici. Her farklı (normalize isim, YB) bir düğümdür; düğümler
+    benzerse birleştirilir. Kümenin kimliği en önce görülen düğümden türetilir, böylece
+    yeni dosyalar mevcut sporcuların kimliğini değiştirmez (iki küme birleşirse eskisininki kalır).
+    """
+
+    def __init__(self):
+        self._nodes = {}          # (normalize isim, YB) -> düğüm no
+        self._names = []          # düğüm no -> normalize isim
+        self._clubs = []          # düğüm no -> görülen kulüp anahtarları
+        self._parent = []
+        self._ids = []            # düğüm no -> kimlik (yalnızca kökler için anlamlı)
+        self._labels = {}         # düğüm no -> ilk görülen yazım
+        self._blocks = {}         # (YB, anahtar) -> düğüm listesi
+        self._raw = {}            # (ham isim, YB) -> düğüm no
+
+    def __len__(self):
+        return len(self._names)
+
+    def _find(self, node):
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, left, right):
+        left, right = self._find(left), self._find(right)
+        if left == right:
+            return
+        # Eski düğüm kök kalır - kimlik değişmez
+        if right < left:
+            left, right = right, left
+        self._parent[right] = left
+
+    def _add_node(self, normalized, birth_year, raw_name):
+        node = len(self._names)
+        self._nodes[(normalized, birth_year)] = node
+        self._names.append(normalized)
+        self._clubs.append(set())
+        self._parent.append(node)
+        digest = hashlib.md5(f"{normalized}|{birth_year}".encode("utf-8")).hexdigest()[:10]
+        self._ids.append(f"S{digest}")
+        self._labels[node] = raw_name
+        return node
+
+    def _match(self, node, birth_year):
+        """Yeni düğümü aynı bloklardaki adaylarla karşılaştırır ve eşleşenlerle birleştirir"""
+        name = self._names[node]
+        candidates = set()
+        keys = block_keys(name, birth_year)
+        for key in keys:
+            candidates.update(self._blocks.get(key, ()))
+
+        for candidate in candidates:
+            if self._find(candidate) == self._find(node):
+                continue
+            similarity = name_similarity(name, self._names[candidate])
+            if similarity >= NAME_THRESHOLD or (
+                similarity >= NAME_WITH_CLUB_THRESHOLD
+                and _club_similarity(self._clubs[node], self._clubs[candidate]) >= CLUB_THRESHOLD
+            ):
+                self._union(node, candidate)
+
+        for key in keys:
+            self._blocks.setdefault(key, []).append(node)
+
+    def add(self, df):
+        """
+        DataFrame'deki (İsim, YB, Kulüp) kayıtlarını ekler; satır başına düğüm numaralarını döndürür.
+        Yalnızca ilk kez görülen (isim, YB) çiftleri için benzerlik hesaplanır.
+        """
+        if df.empty:
+            return np.empty(0, dtype=np.int32)
+
+        frame = pd.DataFrame({
+            "İsim": df["İsim"].astype(str).to_numpy(),
+            "YB": df["YB"].astype(str).to_numpy(),
+            "Kulüp": df["Kulüp"].astype(str).to_numpy(),
+        })
+        codes, uniques = pd.MultiIndex.from_frame(frame).factorize()
+
+        new_nodes = []
+        unique_nodes = np.empty(len(uniques), dtype=np.int32)
+        for position, (raw_name, birth_year, club) in enumerate(uniques):
+            node = self._raw.get((raw_name, birth_year))
+            if node is None:
+                normalized = normalize_name(raw_name)
+                node = self._nodes.get((normalized, birth_year))
+                if node is None:
+                    node = self._add_node(normalized, birth_year, raw_name)
+                    new_nodes.append((node, birth_year))
+                self._raw[(raw_name, birth_year)] = node
+            self._clubs[node].add(club_key(club))
+            unique_nodes[position] = node
+
+        for node, birth_year in new_nodes:
+            self._match(node, birth_year)
+
+        return unique_nodes[codes]
+
+    def athlete_ids(self, nodes):
+        """Düğüm numaralarından kimlik sütunu (kategorik)"""
+        roots = np.fromiter((self._find(node) for node in range(len(self._names))), dtype=np.int32,
+                            count=len(self._names))
+        categories, root_codes = np.unique(roots, return_inverse=True)
+        return pd.Categorical.from_codes(root_codes[nodes], [self._ids[root] for root in categories])
+
+    def labels(self):
+        """Kimlik -> görünen isim (kümenin ilk görülen yazımı)"""
+        return {self._ids[node]: self._labels[node] for node in range(len(self._names)) if self._find(node) == node}
@@ -0,0 +1,277 @@
+"""Streamlit'ten bağımsız dosya işleme - dashboard ve komut satırı ortak kullanır"""
+import os
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from swim.cache import ParseCache
+from swim.extraction import read_pdf_bytes
+from swim.instrumentation import Metrics, count, timed_iter, timer
+from swim.meet_parser import SwimmingParser
+from swim.pages import PageCache, iter_page_records, iter_page_texts
+from swim.parsing import iter_record_batches, race_categories, records_to_frame
+from swim.pool import spawn_pool
+from swim.schema import enforce_schema, time_to_centiseconds
+from swim.store import get_parse_store
+
+
+def get_file_hash(file):
+    """Dosya hash'ini hesaplar"""
+    return hashlib.md5(read_pdf_bytes(file)).hexdigest()
+
+
+def get_city_name(filename):
+    """Dosya adından şehir ismini çıkarır"""
+    # .pdf uzantısını kaldır ve büyük harfe çevir
+    city_name = os.path.splitext(os.path.basename(filename))[0].upper()
+    return city_name
+
+
+def parse_pdf(pdf_file, city_name, jobs=None, on_progress=None, on_line=None, backend=None, page_cache=None):
+    """
+    PDF'i akış halinde çıkarır, temizler ve parse eder; ham sonuç DataFrame'ini döndürür.
+    page_cache verilirse yalnızca önbellekte olmayan sayfalar çıkarılır ve parse edilir.
+    """
+    pages = timed_iter("extract", iter_page_texts(pdf_file, page_cache, jobs=jobs, on_progress=on_progress,
+                                                  backend=backend), counter="pages")
+    records = timed_iter("parse", iter_page_records(pages, city_name, page_cache, on_line), counter="rows_parsed")
+    batches = timed_iter("dataframe", iter_record_batches(records))
+    with timer("concat"):
+        return records_to_frame(batches)
+
+
+def parse_meet(pdf_file, city_name, jobs=None, on_progress=None, on_line=None, backend=None, page_cache=None):
+    """
+    PDF'i tek seferde çıkarır; ham sayfalar Excel tablolarını (bireysel, bayrak,
+    diskalifiye), temizlenmiş satırlar dashboard sonuçlarını besler.
+    Sonuç: {"results", "individual", "team", "disqualified"} DataFrame sözlüğü
+    """
+    meet_parser = SwimmingParser()
+    pages = timed_iter("extract", iter_page_texts(pdf_file, page_cache, jobs=jobs, on_progress=on_progress,
+                                                  backend=backend), counter="pages")
+    pages = timed_iter("tables", _tap(pages, lambda page: meet_parser.feed_page(page[1])))
+    records = timed_iter("parse", iter_page_records(pages, city_name, page_cache, on_line), counter="rows_parsed")
+    batches = timed_iter("dataframe", iter_record_batches(records))
+    with timer("concat"):
+        meet = {"results": records_to_frame(batches)}
+    with timer("tables"):
+        meet.update(meet_parser.tables())
+    return meet
+
+
+def load_meet(pdf_file, city_name, file_hash=None, jobs=None, on_progress=None, on_line=None, backend=None,
+              page_cache=None):
+    """
+    Paylaşılan parse deposundan okur; yoksa PDF'i parse_meet ile bir kez işleyip depoya yazar.
+    Dashboard sonuçları finalize_results'tan geçmiş ve şehir adı ile döner.
+    """
+    store = get_parse_store()
+    file_hash = file_hash or get_file_hash(pdf_file)
+
+    meet = store.get(file_hash)
+    if meet is not None:
+        count("store_hit")
+    else:
+        meet = parse_meet(pdf_file, city_name, jobs=jobs, on_progress=on_progress, on_line=on_line, backend=backend,
+                          page_cache=page_cache)
+        meet["results"] = finalize_results(meet["results"])
+        store.put(file_hash, meet)
+
+    results = meet["results"]
+    if not results.empty and results["Şehir"].iloc[0] != city_name:
+        # Aynı içerik farklı adla yüklenmiş olabilir
+        meet = dict(meet, results=enforce_schema(results.assign(Şehir=city_name)))
+    return meet
+
+
+def _tap(items, callback):
+    for item in items:
+        callback(item)
+        yield item
+
+
+def finalize_results(df):
+    """Geçersiz süreli kayıtları filtreler ve şemayı uygular (görüntülenen Zaman süreden türetilir)"""
+    if df.empty:
+        return df
+
+    with timer("finalize"):
+        if "Süre_cs" not in df.columns:
+            # Eski kayıtlar: metin süre tek seferde vektörel çevrilir
+            df = df.assign(Süre_cs=time_to_centiseconds(df["Zaman"]))
+
+        # Sıfır veya None süre değerlerini kaldır
+        df = df.dropna(subset=['Süre_cs'])
+        df = df[df['Süre_cs'] > 0]
+        df = enforce_schema(df)
+
+    count("rows", len(df))
+    return df
+
+
+def combine_results(frames):
+    """Dosya sonuçlarını tek DataFrame'de birleştirir"""
+    if not frames:
+        return pd.DataFrame()
+
+    # Farklı kategori kümeleri birleşince object'e döner; şema sonda yeniden uygulanır
+    combined_df = pd.concat(frames, ignore_index=True)
+
+    # Yarış_Kategori sütunu yoksa oluştur (eski cache'ler için)
+    if 'Yarış_Kategori' not in combined_df.columns:
+        combined_df['Yarış_Kategori'] = race_categories(combined_df)
+
+    return enforce_schema(combined_df)
+
+
+def ingest_file(path, use_cache=True, backend=None):
+    """
+    Tek bir PDF'i işler (işçi sürecinde çalışır).
+    Sonuç: dosya, DataFrame, sayfa sayısı, süre, önbellekten mi, hata mesajı, aşama ölçümleri
+    """
+    started = time.perf_counter()
+    metrics = Metrics(label=os.path.basename(path))
+    cached = False
+    error = None
+    df = pd.DataFrame()
+
+    with metrics.activate():
+        try:
+            with timer("read"):
+                pdf_bytes = read_pdf_bytes(path)
+            with timer("hash"):
+                file_hash = hashlib.md5(pdf_bytes).hexdigest()
+            city_name = get_city_name(path)
+            cache = ParseCache() if use_cache else None
+            page_cache = PageCache() if use_cache else None
+
+            with timer("cache_read"):
+                cached_df = cache.get(file_hash) if cache else None
+
+            if cached_df is not None:
+                cached = True
+                df = enforce_schema(cached_df.assign(Şehir=city_name))
+            else:
+                # Dosyalar zaten paralel işlendiği için sayfa çıkarma bu süreçte seri yapılır
+                df = finalize_results(parse_pdf(pdf_bytes, city_name, jobs=1, backend=backend,
+                                                  page_cache=page_cache))
+                if cache and not df.empty:
+                    with timer("cache_write"):
+                        cache.put(file_hash, df)
+
+        except Exception as e:
+            error = str(e)
+
+    pages = metrics.counters.get("pages", 0)
+    return path, df, pages, time.perf_counter() - started, cached, error, metrics.as_dict()
+
+
+def find_pdfs(directory):
+    """Dizindeki (alt dizinler dahil) PDF dosyalarını sıralı döndürür"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith('.pdf'):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def ingest_files(paths, jobs=None, use_cache=True, backend=None):
+    """PDF'leri süreç havuzunda paralel işler; biten dosyaları tamamlanma sırasıyla üretir"""
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+
+    if jobs == 1:
+        for path in paths:
+            yield ingest_file(path, use_cache, backend)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(ingest_file, path, use_cache, backend) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def convert_meet(name, pdf_bytes, backend=None, use_cache=True):
+    """
+    Tek bir PDF'in tüm tablolarını üretir (toplu dönüştürmede işçi sürecinde çalışır).
+    Sonuç: dosya adı, dosya hash'i, tablo sözlüğü (hata varsa None), süre, hata mesajı
+    """
+    started = time.perf_counter()
+    file_hash = hashlib.md5(pdf_bytes).hexdigest()
+    try:
+        page_cache = PageCache() if use_cache else None
+        meet = parse_meet(pdf_bytes, get_city_name(name), jobs=1, backend=backend, page_cache=page_cache)
+        meet["results"] = finalize_results(meet["results"])
+    except Exception as e:
+        return name, file_hash, None, time.perf_counter() - started, str(e)
+    return name, file_hash, meet, time.perf_counter() - started, None
+
+
+def ingest_upload(name, pdf_bytes, backend=None, use_cache=True):
+    """
+    Dashboard'a yüklenen PDF'i arka plan işçi sürecinde işler.
+    Sonuç: tablo sözlüğü (hata varsa None), hata mesajı, aşama ölçümleri
+    """
+    metrics = Metrics(label=name)
+    with metrics.activate():
+        _, _, meet, _, error = convert_meet(name, pdf_bytes, backend, use_cache)
+    return meet, error, metrics.as_dict()
+
+
+def convert_meets(files, jobs=None, backend=None, use_cache=True):
+    """
+    [(dosya adı, PDF baytları)] listesini süreç havuzunda dönüştürür; biten dosyaları
+    tamamlanma sırasıyla convert_meet sonucu olarak üretir. Paylaşılan depoda olan dosyalar
+    yeniden parse edilmez, yeni parse edilenler depoya yazılır. Bir dosyanın hatası
+    diğerlerini etkilemez.
+    """
+    store = get_parse_store()
+    pending = []
+    for name, pdf_bytes in files:
+        file_hash = hashlib.md5(pdf_bytes).hexdigest()
+        meet = store.get(file_hash)
+        if meet is not None:
+            count("store_hit")
+            yield name, file_hash, meet, 0.0, None
+        else:
+            pending.append((name, pdf_bytes))
+
+    if not pending:
+        return
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if jobs == 1:
+        results = (convert_meet(name, pdf_bytes, backend, use_cache) for name, pdf_bytes in pending)
+    else:
+        results = _convert_in_pool(pending, jobs, backend, use_cache)
+
+    for result in results:
+        _, file_hash, meet, _, _ = result
+        if meet is not None:
+            store.put(file_hash, meet)
+        yield result
+
+
+def _convert_in_pool(pending, jobs, backend, use_cache):
+    with spawn_pool(jobs) as executor:
+        futures = {
+            executor.submit(convert_meet, name, pdf_bytes, backend, use_cache): (name, pdf_bytes)
+            for name, pdf_bytes in pending
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # İşçi süreci çöktüyse yalnızca o dosya hatalı sayılır
+                name, pdf_bytes = futures[future]
+                yield name, hashlib.md5(pdf_bytes).hexdigest(), None, 0.0, str(e)
+
+
+def write_results(df, out_path):
+    """Birleşik sonucu uzantıya göre Parquet ya da CSV olarak yazar"""
+    if out_path.lower().endswith('.csv'):
+        df.to_csv(out_path, index=False)
+    else:
+        df.to_parquet(out_path, index=False)
@@ -0,0 +1,107 @@
+"""
+Hafif aşama ölçümü: süre ve sayaçlar.
+Aktif bir Metrics yoksa yardımcılar hiçbir şey yapmaz; parser kodu ölçüm olmadan da aynen çalışır.
+"""
+import json
+import time
+import contextvars
+from contextlib import contextmanager, nullcontext
+
+_active = contextvars.ContextVar("swim_metrics", default=None)
+
+
+class Metrics:
+    """
+    Bir dosya ya da bir sayfa çizimi için aşama süreleri ve sayaçları.
+    Süreler iç içe aşamalarda 'kendi süresi' olarak tutulur (alt aşamanın süresi
+    üst aşamadan düşülür), böylece toplamları gerçek süreyi verir.
+    """
+
+    def __init__(self, label=None):
+        self.label = label
+        self.timings = {}
+        self.counters = {}
+        self._stack = []
+
+    @contextmanager
+    def timer(self, stage):
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            child = self._stack.pop()
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed - child
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed_iter(self, stage, iterable, counter=None):
+        """Iterable'dan her öğe çekilişini aşama süresine ekler; counter verilirse öğeleri sayar"""
+        iterator = iter(iterable)
+        while True:
+            with self.timer(stage):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            if counter:
+                self.count(counter)
+            yield item
+
+    def merge(self, other):
+        """Başka bir süreçte toplanan ölçümleri (as_dict çıktısı) ekler"""
+        for stage, seconds in other.get("timings", {}).items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        for name, n in other.get("counters", {}).items():
+            self.count(name, n)
+
+    @contextmanager
+    def activate(self):
+        """Bu blok içinde modül düzeyindeki timer/count çağrıları bu nesneye yazılır"""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def as_dict(self):
+        total = sum(self.timings.values())
+        result = {
+            "label": self.label,
+            "total_seconds": round(total, 6),
+            "timings": {stage: round(seconds, 6) for stage, seconds in self.timings.items()},
+            "counters": dict(self.counters),
+        }
+        pages = self.counters.get("pages")
+        extract_seconds = self.timings.get("extract")
+        if pages and extract_seconds:
+            result["pages_per_second"] = round(pages / extract_seconds, 2)
+        return result
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False, indent=2)
+
+
+def current():
+    """Aktif Metrics nesnesi (yoksa None)"""
+    return _active.get()
+
+
+def timer(stage):
+    metrics = _active.get()
+    return metrics.timer(stage) if metrics else nullcontext()
+
+
+def count(name, n=1):
+    metrics = _active.get()
+    if metrics:
+        metrics.count(name, n)
+
+
+def timed_iter(stage, iterable, counter=None):
+    metrics = _active.get()
+    return metrics.timed_iter(stage, iterable, counter) if metrics else iterable
@@ -0,0 +1,150 @@
+"""
+Arka plan dosya işleme kuyruğu. Yüklenen PDF'ler süreç havuzunda parse edilir; Streamlit
+betiği beklemeden çizmeye devam eder, biten işler sonraki çizimlerde toplanır.
+"""
+import os
+import time
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+from swim.ingest import ingest_upload
+from swim.pool import spawn_pool
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 0 ya da tanımsız: işlemci sayısı kadar işçi
+DEFAULT_INGEST_JOBS = int(os.environ.get("SWIM_INGEST_JOBS", "0")) or None
+
+# Biten işin sonucu toplanmazsa (bekleyen oturum kapandıysa) bu kadar saniye sonra atılır
+DEFAULT_JOB_TTL = float(os.environ.get("SWIM_INGEST_JOB_TTL", "600"))
+
+
+class IngestJob:
+    """Kuyruktaki bir dosya; sonuç alınana kadar future ve işi bekleyen oturumlar tutulur"""
+
+    def __init__(self, key, name, future):
+        self.key = key
+        self.name = name
+        self.future = future
+        self.waiters = set()
+        self.submitted = time.perf_counter()
+        self.finished = None
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        self.finished = time.perf_counter()
+
+    def done(self):
+        return self.future.done()
+
+    @property
+    def state(self):
+        if not self.future.done():
+            return RUNNING if self.future.running() else QUEUED
+        return FAILED if self.result()[1] else DONE
+
+    @property
+    def seconds(self):
+        """Gönderilmesinden bitişine (bitmediyse şu ana) kadar geçen süre"""
+        return (self.finished or time.perf_counter()) - self.submitted
+
+    def result(self):
+        """(tablolar, hata, ölçümler) - işçi süreci çöktüyse hata olarak döner"""
+        try:
+            return self.future.result()
+        except Exception as e:
+            return None, str(e) or type(e).__name__, None
+
+
+class IngestQueue:
+    """
+    Süreç genelinde tek kuyruk - oturumlar aynı işçi havuzunu paylaşır. İşler (dosya hash'i, şehir)
+    anahtarıyla tutulur; aynı dosyayı isteyen her oturum işe bekleyen olarak eklenir, iş bir kez
+    çalışır. Bekleyen kalmayınca iş kuyruktan çıkar (başlamadıysa iptal edilir); bekleyeni
+    kapanan oturumlardan kalan biten işler ttl saniye sonra atılır. Bir işçi çöküp havuz
+    kullanılamaz hale gelirse sonraki gönderimde yeniden kurulur.
+    """
+
+    def __init__(self, jobs=DEFAULT_INGEST_JOBS, backend=None, use_cache=True, ttl=DEFAULT_JOB_TTL):
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.backend = backend
+        self.use_cache = use_cache
+        self.ttl = ttl
+        self._executor = None
+        self._jobs = {}
+        # Streamlit oturumları ayrı thread'lerde çalışır
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = spawn_pool(self.jobs)
+        return self._executor
+
+    def _submit(self, name, pdf_bytes):
+        return self._pool().submit(ingest_upload, name, pdf_bytes, self.backend, self.use_cache)
+
+    def _expire(self):
+        """Sonucu ttl süresince toplanmayan biten işleri atar (kilit altında çağrılır)"""
+        now = time.perf_counter()
+        for key in [key for key, job in self._jobs.items()
+                    if job.finished is not None and now - job.finished > self.ttl]:
+            del self._jobs[key]
+
+    def submit(self, key, name, pdf_bytes, waiter=None):
+        """Dosyayı kuyruğa ekler; anahtar zaten kuyruktaysa mevcut işi döndürür. waiter işe eklenir."""
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(key)
+            if job is None:
+                try:
+                    future = self._submit(name, pdf_bytes)
+                except BrokenProcessPool:
+                    self._executor = None
+                    future = self._submit(name, pdf_bytes)
+                job = self._jobs[key] = IngestJob(key, name, future)
+            if waiter is not None:
+                job.waiters.add(waiter)
+            return job
+
+    def watch(self, key, waiter):
+        """Kuyruktaki işe waiter'ı ekleyip döndürür; iş yoksa None (dosya gönderilmeden)"""
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(key)
+            if job is not None:
+                job.waiters.add(waiter)
+            return job
+
+    def get(self, key):
+        with self._lock:
+            self._expire()
+            return self._jobs.get(key)
+
+    def release(self, key, waiter):
+        """
+        waiter işi artık beklemiyor (sonucu aldı ya da dosyayı kaldırdı). Başka bekleyen yoksa iş
+        kuyruktan çıkar; henüz başlamadıysa iptal edilir, başladıysa sonucu atılır.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            job.waiters.discard(waiter)
+            if job.waiters:
+                return
+            del self._jobs[key]
+        job.future.cancel()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._jobs.clear()
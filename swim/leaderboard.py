@@ -0,0 +1,129 @@
+"""
+Yarış bazlı lider tablosu - veri sürümü başına bir kez kurulan sıralama indeksi.
+Yarış seçmek ya da filtre değiştirmek sıralama yapmaz; önceden sıralanmış satırlardan okunur.
+"""
+import numpy as np
+import pandas as pd
+
+# Performanslar sekmesinde gösterilen satır sayısı
+LEADERBOARD_SIZE = 100
+
+# Filtreli okumada maskenin bir seferde uygulandığı en küçük parça
+MIN_SCAN_CHUNK = 4096
+
+ORDER_TIME = "time"
+ORDER_POINTS = "points"
+
+
+def race_labels(df):
+    """Yarış anahtarı: normalize Yarış_Kategori; yoksa ya da 'N/A' ise ham Yarış başlığı"""
+    races = df['Yarış'].astype(str)
+    if 'Yarış_Kategori' not in df.columns:
+        return races
+    categories = df['Yarış_Kategori'].astype(object)
+    valid = categories.notna() & (categories != 'N/A')
+    return categories.where(valid, races).astype(str)
+
+
+def _ranks(order, codes, values, offsets):
+    """Sıralı düzende yarış içi derece (eşit değerler aynı dereceyi alır - 'min' yöntemi)"""
+    size = len(order)
+    if size == 0:
+        return np.empty(0, dtype=np.int32)
+    sorted_codes, sorted_values = codes[order], values[order]
+    starts = np.empty(size, dtype=bool)
+    starts[0] = True
+    starts[1:] = (sorted_codes[1:] != sorted_codes[:-1]) | (sorted_values[1:] != sorted_values[:-1])
+    run_first = np.maximum.accumulate(np.where(starts, np.arange(size), 0))
+
+    ranks = np.empty(size, dtype=np.int32)
+    ranks[order] = run_first - offsets[sorted_codes] + 1
+    return ranks
+
+
+def _first(order, mask, k):
+    """Sıralı satırlardan maskeye uyan ilk k tanesi - maske parça parça uygulanır, erken durur"""
+    if mask is None:
+        return order[:k]
+    chunk_size = max(MIN_SCAN_CHUNK, 8 * k)
+    found = []
+    remaining = k
+    for start in range(0, len(order), chunk_size):
+        chunk = order[start:start + chunk_size]
+        chunk = chunk[mask[chunk]][:remaining]
+        found.append(chunk)
+        remaining -= len(chunk)
+        if remaining <= 0:
+            break
+    return np.concatenate(found) if found else order[:0]
+
+
+class Leaderboard:
+    """
+    Satırlar yarış içinde süreye (artan) ve FINA puanına (azalan) göre bir kez sıralanır,
+    yarışlar ardışık bloklar halinde tutulur (yarış -> [başlangıç, bitiş)). Tüm veri için
+    de iki sıralama saklanır. Eşitlikte tablodaki sıra korunur.
+    Filtre seçimi sıralı bloğa maske olarak uygulanır; ilk k uyan satır alınır.
+    """
+
+    def __init__(self, df):
+        size = len(df)
+        if size == 0:
+            self.races = []
+            self._codes = np.empty(0, dtype=np.int32)
+        else:
+            codes, races = pd.factorize(race_labels(df), sort=True)
+            self.races = races.tolist()
+            self._codes = codes.astype(np.int32)
+        self._race_codes = {race: code for code, race in enumerate(self.races)}
+
+        # Eksik süre en sona, eksik puan en sona kalır
+        times = df['Süre_cs'].to_numpy(dtype='float64', na_value=np.inf) if size else np.empty(0)
+        points = -df['Puan'].to_numpy(dtype='float64', na_value=-np.inf) if size else np.empty(0)
+
+        counts = np.bincount(self._codes, minlength=len(self.races))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        # np.lexsort kararlıdır: yarış, sonra değer, eşitlikte satır sırası
+        self._race_orders = {
+            ORDER_TIME: np.lexsort((times, self._codes)),
+            ORDER_POINTS: np.lexsort((points, self._codes)),
+        }
+        self._global_orders = {
+            ORDER_TIME: np.argsort(times, kind='stable'),
+            ORDER_POINTS: np.argsort(points, kind='stable'),
+        }
+        self.time_ranks = _ranks(self._race_orders[ORDER_TIME], self._codes, times, self._offsets)
+        self.points_ranks = _ranks(self._race_orders[ORDER_POINTS], self._codes, points, self._offsets)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _order(self, race, by):
+        if race is None:
+            return self._global_orders[by]
+        code = self._race_codes.get(race)
+        if code is None:
+            return self._global_orders[by][:0]
+        return self._race_orders[by][self._offsets[code]:self._offsets[code + 1]]
+
+    def race_options(self, mask=None):
+        """Satırlarda (mask verilirse yalnızca uyanlarda) görülen yarışlar, sıralı"""
+        if mask is None:
+            return [race for race, count in zip(self.races, np.diff(self._offsets)) if count]
+        return [self.races[code] for code in np.unique(self._codes[mask])]
+
+    def top(self, race=None, k=LEADERBOARD_SIZE, by=ORDER_TIME, mask=None):
+        """
+        Yarıştaki (race None ise tüm verideki) ilk k satırın konumları.
+        mask: satır başına bool dizi (filtre seçimi) - verilmezse sonuç bir dilimdir.
+        """
+        return _first(self._order(race, by), mask, k)
+
+    def count(self, race=None, mask=None):
+        """Yarıştaki (race None ise tüm verideki) maskeye uyan satır sayısı"""
+        if mask is None:
+            return len(self._order(race, ORDER_TIME))
+        if race is None:
+            return int(np.count_nonzero(mask))
+        return int(np.count_nonzero(mask[self._order(race, ORDER_TIME)]))
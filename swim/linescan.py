@@ -0,0 +1,86 @@
+"""
+Sonuç satırlarını regex kullanmadan tarayan yardımcılar.
+Her fonksiyon satır üzerinde tek yönde ilerler; geri izleme (backtracking) yoktur,
+bu yüzden bozuk OCR satırlarında da süre satır uzunluğuyla doğrusal kalır.
+
+Boşluk ve rakam tanımları regex'tekiyle aynıdır: \\s -> str.isspace, \\d -> str.isdecimal.
+Satırların tek satır olduğu (içinde '\\n' bulunmadığı) varsayılır.
+"""
+
+
+def skip_space(line, start):
+    """start'tan itibaren boşlukları atlar; ilk boşluk olmayan konumu döndürür"""
+    n = len(line)
+    while start < n and line[start].isspace():
+        start += 1
+    return start
+
+
+def skip_space_back(line, end):
+    """end'den geriye boşlukları atlar; boşluk koşusunun başladığı konumu döndürür"""
+    while end > 0 and line[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def token_start(line, end):
+    """end'de biten (boşluk içermeyen) token'ın başlangıcını döndürür"""
+    while end > 0 and not line[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def digits_start(line, end):
+    """end'de biten rakam koşusunun başlangıcını döndürür"""
+    while end > 0 and line[end - 1].isdecimal():
+        end -= 1
+    return end
+
+
+def strip_trailing_digits(text):
+    """Sondaki rakamları siler - re.sub(r"\\d+$", "", text) karşılığı"""
+    return text[:digits_start(text, len(text))]
+
+
+def is_two_digit_token(line, start):
+    """start'ta tam iki rakamlı ve ardından boşluk gelen bir token var mı (doğum yılı)"""
+    return (
+        start + 2 < len(line)
+        and line[start].isdecimal()
+        and line[start + 1].isdecimal()
+        and line[start + 2].isspace()
+    )
+
+
+def scan_tail(line):
+    """
+    Satırı sağdan tarar: en sondaki rakam token'ı puan, ondan önceki token süredir.
+    Sonuç: (kulüp sonu, süre başı, süre sonu, puan başı) ya da None
+    """
+    n = len(line)
+    score_start = digits_start(line, n)
+    if score_start == n or score_start == 0 or not line[score_start - 1].isspace():
+        return None
+
+    time_end = skip_space_back(line, score_start)
+    time_start = token_start(line, time_end)
+    if time_start == time_end or time_start == 0:
+        return None
+
+    return skip_space_back(line, time_start), time_start, time_end, score_start
+
+
+def scan_club(line, yb_start, time_start, club_end):
+    """
+    Doğum yılı ile süre arasındaki kulüp metni.
+    Arada yalnızca boşluk varsa regex'teki gibi en az üç boşlukta boş kulüp, aksi halde None
+    """
+    if time_start <= yb_start + 2:
+        return None
+
+    club_start = skip_space(line, yb_start + 2)
+    if club_start < time_start:
+        return line[club_start:club_end]
+    if time_start - (yb_start + 2) >= 3:
+        return ""
+    return None
@@ -0,0 +1,257 @@
+"""Excel dönüştürücünün bireysel / bayrak / diskalifiye tablo parser'ı"""
+import re
+
+import pandas as pd
+
+from swim.extraction import iter_pages
+from swim.linescan import is_two_digit_token, scan_club, scan_tail, skip_space, strip_trailing_digits
+
+UPPER_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZÇĞIİÖŞÜ")
+LOWER_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzçğıiöşü")
+
+
+def _scan_words_yb(line):
+    """
+    İsim kelimeleri ve iki haneli doğum yılı: ilk kelime büyük harf + küçük harfler,
+    sonrakiler büyük harfle başlar. Sonuç: (isim sonu, YB başı) ya da None
+    """
+    n = len(line)
+    if n == 0 or line[0] not in UPPER_CHARS:
+        return None
+
+    end = 1
+    while end < n and line[end] in LOWER_CHARS:
+        end += 1
+    if end < 2:
+        return None
+
+    while True:
+        start = skip_space(line, end)
+        if start == end or start == n:
+            return None
+        if line[start] not in UPPER_CHARS:
+            break
+        word_end = start + 1
+        while word_end < n and (line[word_end] in UPPER_CHARS or line[word_end] in LOWER_CHARS):
+            word_end += 1
+        if word_end == n or not line[word_end].isspace():
+            return None
+        end = word_end
+
+    if not is_two_digit_token(line, start):
+        return None
+    return end, start
+
+
+def _is_result_time(token):
+    """dk:ss.cc ya da ss.cc - \\d+:\\d+\\.\\d+|\\d+\\.\\d+"""
+    head, dot, fraction = token.partition(".")
+    if not dot or not fraction.isdecimal():
+        return False
+    minutes, colon, seconds = head.partition(":")
+    if colon:
+        return minutes.isdecimal() and seconds.isdecimal()
+    return head.isdecimal()
+
+
+class SwimmingParser:
+    """
+    Bireysel, bayrak (takım) ve diskalifiye tablolarını üretir.
+    Yarış/yaş durumu nesnede tutulur; sayfalar feed_page ile sırayla verilebilir.
+    """
+
+    def __init__(self):
+        self.individual_results = []
+        self.team_results = []
+        self.disqualified = []
+        self._race_info = {}
+        self._age = None
+        self._position = 1
+
+    def parse_pdf(self, pdf_file, backend=None):
+        for page_text in iter_pages(pdf_file, jobs=1, backend=backend):
+            self.feed_page(page_text)
+        return self.tables()
+
+    def feed_page(self, page_text):
+        """Bir sayfanın ham (temizlenmemiş) metnini işler"""
+        self._process_text(page_text)
+
+    def tables(self):
+        return {
+            'individual': pd.DataFrame(self.individual_results),
+            'team': pd.DataFrame(self.team_results),
+            'disqualified': pd.DataFrame(self.disqualified)
+        }
+
+    def _process_text(self, text):
+        lines = text.split('\n')
+        current_race_info = self._race_info
+        current_age = self._age
+        position = self._position
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Yarış başlığı - Çeşitli formatları destekle
+            race_match = None
+
+            # Format 1: "Yarış 9, Kızlar, 200m Sırtüstü, 12 yaş"
+            race_match = re.search(r'Yarış\s+(\d+)[,.]?\s*([^,]+)[,.]?\s*([^,]+)[,.]?\s*(\d+)\s*yaş', line)
+
+            if not race_match:
+                # Format 2: "Yarış 8 Erkekler, 50m Serbest 10 - 12 yaşları arası"
+                race_match = re.search(r'Yarış\s+(\d+)\s+([^,]+)[,.]?\s*([^0-9]+?)\s+(\d+)(?:\s*-\s*\d+)?\s*yaş', line)
+
+            if not race_match:
+                # Format 3: "Yarış 13 Kızlar, 4 x 100m Karışık 11 - 12 yaşları arası"
+                race_match = re.search(r'Yarış\s+(\d+)\s+([^,]+)[,.]?\s*(.+?)\s+(\d+)(?:\s*-\s*\d+)?\s*yaş', line)
+
+            if race_match:
+                race_no = int(race_match.group(1))
+                gender_part = race_match.group(2).strip()
+                race_type = race_match.group(3).strip()
+                age = int(race_match.group(4))
+
+                # Cinsiyet belirleme
+                if 'Kızlar' in gender_part or 'Kız' in gender_part:
+                    cinsiyet = 'Kız'
+                elif 'Erkekler' in gender_part or 'Erkek' in gender_part:
+                    cinsiyet = 'Erkek'
+                else:
+                    cinsiyet = 'Karma'
+
+                current_race_info = {
+                    'yarış_no': race_no,
+                    'yarış_türü': race_type,
+                    'cinsiyet': cinsiyet,
+                    'yaş_kategorisi': age
+                }
+
+                current_age = current_race_info['yaş_kategorisi']
+                position = 1
+                continue
+
+            # Yaş kategorisi
+            age_match = re.search(r'^(\d+)\s*yaş', line)
+            if age_match:
+                current_age = int(age_match.group(1))
+                position = 1
+                continue
+
+            # Diskalifiye
+            if 'SW' in line:
+                self._parse_disqualified(line, current_race_info, current_age)
+                continue
+
+            # Takım yarışı
+            if 'x 100m' in current_race_info.get('yarış_türü', ''):
+                team_result = self._parse_team_result(line, current_race_info, current_age, position)
+                if team_result:
+                    self.team_results.append(team_result)
+                    position += 1
+                continue
+
+            # Bireysel sonuç
+            individual_result = self._parse_individual_result(line, current_race_info, current_age, position)
+            if individual_result:
+                self.individual_results.append(individual_result)
+                position += 1
+
+        self._race_info = current_race_info
+        self._age = current_age
+        self._position = position
+
+    def _parse_individual_result(self, line, race_info, age, position):
+        try:
+            # Satır sağdan taranır: puan, süre, kulüp; soldan isim kelimeleri ve doğum yılı
+            head = _scan_words_yb(line)
+            tail = scan_tail(line)
+            if head is None or tail is None:
+                return None
+
+            name_end, yb_start = head
+            club_end, time_start, time_end, score_start = tail
+            time_str = line[time_start:time_end]
+            if not _is_result_time(time_str):
+                return None
+
+            club_part = scan_club(line, yb_start, time_start, club_end)
+            if club_part is None:
+                return None
+
+            name = line[:name_end]
+            birth_year = 2000 + int(line[yb_start:yb_start + 2])
+            club_part = club_part.strip()
+            points = int(line[score_start:])
+
+            # Kulüp adını temizle - OCR hatalarını düzelt
+            club = club_part
+            club = club.replace('Kulüb1ü', 'Kulübü')
+            club = club.replace('Kulub1ü', 'Kulübü')
+            club = club.replace('Kulub1', 'Kulübü')
+            club = strip_trailing_digits(club).strip()
+
+            return {
+                'Sıra': position,
+                'Yarış_No': race_info.get('yarış_no', ''),
+                'Yarış_Türü': race_info.get('yarış_türü', ''),
+                'Cinsiyet': race_info.get('cinsiyet', ''),
+                'Yaş': age,
+                'Sporcu_Adı': name,
+                'Doğum_Yılı': birth_year,
+                'Kulüp': club,
+                'Zaman': time_str,
+                'Puan': points
+            }
+
+        except Exception:
+            return None
+
+    def _parse_team_result(self, line, race_info, age, position):
+        try:
+            pattern = r'^([A-ZÇĞIİÖŞÜ].+?)\s+(\d+:\d+\.\d+)\s+(\d+)$'
+            match = re.search(pattern, line)
+
+            if not match:
+                return None
+
+            team_name = match.group(1).strip()
+            team_time = match.group(2)
+            team_points = int(match.group(3))
+
+            return {
+                'Sıra': position,
+                'Yarış_No': race_info.get('yarış_no', ''),
+                'Yarış_Türü': race_info.get('yarış_türü', ''),
+                'Cinsiyet': race_info.get('cinsiyet', ''),
+                'Yaş': age,
+                'Takım_Adı': team_name,
+                'Zaman': team_time,
+                'Puan': team_points
+            }
+
+        except Exception:
+            return None
+
+    def _parse_disqualified(self, line, race_info, age):
+        try:
+            name_match = re.search(r'^([A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+(?:\s+[A-ZÇĞIİÖŞÜ][a-zçğıiöşü]+)*)', line)
+
+            if name_match:
+                name = name_match.group(1)
+                reason = line[len(name):].strip()
+
+                self.disqualified.append({
+                    'Yarış_No': race_info.get('yarış_no', ''),
+                    'Yarış_Türü': race_info.get('yarış_türü', ''),
+                    'Cinsiyet': race_info.get('cinsiyet', ''),
+                    'Yaş': age,
+                    'Sporcu_Adı': name,
+                    'Neden': reason
+                })
+
+        except Exception:
+            pass
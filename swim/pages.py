@@ -0,0 +1,424 @@
+"""
+Sayfa düzeyinde artımlı işleme.
+Yeniden yayınlanan bir PDF'te yalnızca değişen/eklenen sayfalar çıkarılır ve parse edilir:
+sayfa metni sayfa içerik hash'i ile, parse edilen satırlar ise sayfa metni ve sayfaya
+girerken parser durumu ile önbelleğe alınır.
+"""
+import os
+import io
+import re
+import json
+import hashlib
+import tempfile
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+from swim.cache import DEFAULT_CACHE_DIR, PARSER_VERSION, evict_lru
+from swim.cleaning import clean_pages
+from swim.extraction import BACKENDS, DEFAULT_BACKEND, iter_pages, read_pdf_bytes, resolve_backend
+from swim.instrumentation import count, timer
+from swim.parsing import RESULT_COLUMNS, RecordParser
+
+DEFAULT_PAGE_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "pages")
+DEFAULT_PAGE_CACHE_MAX_BYTES = int(os.environ.get("SWIM_PAGE_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Sayfa satırlarında saklanan sütunlar (şehir dosya adından gelir, saklanmaz)
+PAGE_ROW_COLUMNS = [column for column in RESULT_COLUMNS if column != "Şehir"]
+
+# Bir sayfa metni için saklanan farklı giriş durumu sayısı
+MAX_PARSES_PER_PAGE = 4
+
+
+# Metin çıkarmayı etkileyen sayfa kutuları (PdfReader miras alınanları sayfaya kopyalar)
+_PAGE_BOXES = ("/MediaBox", "/CropBox", "/Rotate")
+
+# İçerik akışı parçaları: metin dizeleri, adlar (font / XObject) ve operatörler; sayılar atlanır
+_CONTENT_TOKEN = re.compile(rb"""
+    \((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\)
+  | <[0-9A-Fa-f\s]*>
+  | /[^\s/\[\]()<>{}%]*
+  | [A-Za-z'"]+
+""", re.S | re.X)
+
+# Satır içi görüntü verisi - ikili içerik dize sanılmasın
+_INLINE_IMAGE = re.compile(rb"\bBI\b.*?\bID\b.*?\bEI\b", re.S)
+
+_LITERAL_ESCAPE = re.compile(rb"\\([0-7]{1,3}|\r\n|[\r\n]|.)", re.S)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+# ToUnicode CMap bölümleri ve öğeleri
+_CMAP_SECTION = re.compile(rb"begin(bfchar|bfrange)(.*?)end\1", re.S)
+_CMAP_TOKEN = re.compile(rb"<([0-9A-Fa-f\s]*)>|\[|\]")
+
+# Alt küme font öneki (ABCDEF+) - aynı font, yeniden yayınlanan dosyada başka önek alabilir
+_SUBSET_TAG = re.compile(r"^/[A-Z]{6}\+")
+
+
+def _resolve(obj):
+    return obj.get_object() if isinstance(obj, IndirectObject) else obj
+
+
+def _stream_data(stream):
+    try:
+        return stream.get_data()
+    except Exception:
+        return stream._data or b""
+
+
+def _literal_bytes(token):
+    def unescape(match):
+        value = match.group(1)
+        if value[:1] in b"01234567":
+            return bytes([int(value, 8) & 0xFF])
+        if value in (b"\r\n", b"\r", b"\n"):
+            return b""
+        return _ESCAPES.get(value, value)
+
+    return _LITERAL_ESCAPE.sub(unescape, token[1:-1])
+
+
+def _hex_bytes(token):
+    digits = b"".join(token[1:-1].split())
+    return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+
+
+def _scan_content(data):
+    """İçerik akışında font adı başına çizilen dizeler ve çağrılan XObject adları"""
+    strings = {}
+    xobjects = set()
+    font = operand = None
+    for token in _CONTENT_TOKEN.findall(_INLINE_IMAGE.sub(b" ", data)):
+        first = token[:1]
+        if first == b"/":
+            operand = token
+        elif first == b"(":
+            strings.setdefault(font, set()).add(_literal_bytes(token))
+        elif first == b"<":
+            strings.setdefault(font, set()).add(_hex_bytes(token))
+        elif token == b"Tf":
+            font = operand
+        elif token == b"Do" and operand is not None:
+            xobjects.add(operand)
+    return strings, xobjects
+
+
+def _parse_cmap(data):
+    """ToUnicode CMap: (tek kod -> bayt, [(alt, üst, hedef bayt ya da hedef listesi)], çözülmüş kodlar)"""
+    chars, ranges = {}, []
+    for kind, body in _CMAP_SECTION.findall(data):
+        tokens, array = [], None
+        for match in _CMAP_TOKEN.finditer(body):
+            if match.group(1) is not None:
+                value = _hex_bytes(match.group(0))
+                if array is not None:
+                    array.append(value)
+                else:
+                    tokens.append(value)
+            elif match.group(0) == b"[":
+                array = []
+            elif array is not None:
+                tokens.append(array)
+                array = None
+        if kind == b"bfchar":
+            chars.update(zip(tokens[0::2], tokens[1::2]))
+        else:
+            ranges.extend(zip(tokens[0::3], tokens[1::3], tokens[2::3]))
+    return chars, ranges, {}
+
+
+def _unicode_of(cmap, code):
+    chars, ranges, resolved = cmap
+    if code in resolved:
+        return resolved[code]
+    target = chars.get(code)
+    if target is None:
+        for low, high, destination in ranges:
+            if len(low) == len(code) and low <= code <= high:
+                offset = int.from_bytes(code, "big") - int.from_bytes(low, "big")
+                if isinstance(destination, list):
+                    target = destination[offset] if offset < len(destination) else None
+                elif destination:
+                    value = int.from_bytes(destination, "big") + offset
+                    if value.bit_length() <= 8 * len(destination):
+                        target = value.to_bytes(len(destination), "big")
+                break
+    resolved[code] = None if target is None else target.decode("utf-16-be", "replace")
+    return resolved[code]
+
+
+def _font_digest(font, strings, cmaps):
+    """
+    Fontun metne etkisi: alt küme öneki atılmış adı, kodlaması ve yalnızca bu sayfada çizilen
+    kodların ToUnicode / Differences karşılıkları. Dosyaya sayfa eklenince değişen alt küme
+    tabloları (font programı, genişlikler, çizilmeyen kodlar) hash'e girmez.
+    """
+    subtype = font.get("/Subtype")
+    width = 2 if subtype == "/Type0" else 1
+    codes = sorted({string[i:i + width] for string in strings for i in range(0, len(string) - width + 1, width)})
+
+    digest = hashlib.md5(f"{subtype}|{_SUBSET_TAG.sub('/', str(font.get('/BaseFont')))}|".encode("utf-8"))
+    differences = {}
+    encoding = _resolve(font.raw_get("/Encoding")) if "/Encoding" in font else None
+    if isinstance(encoding, DictionaryObject):
+        digest.update(str(encoding.get("/BaseEncoding")).encode("utf-8"))
+        code = 0
+        for item in _resolve(encoding.raw_get("/Differences")) if "/Differences" in encoding else ():
+            item = _resolve(item)
+            if isinstance(item, int):
+                code = item
+            else:
+                differences[code] = str(item)
+                code += 1
+    else:
+        digest.update(str(encoding).encode("utf-8"))
+
+    cmap = ({}, [], {})
+    if "/ToUnicode" in font:
+        reference = font.raw_get("/ToUnicode")
+        key = (reference.idnum, reference.generation) if isinstance(reference, IndirectObject) else id(reference)
+        if key not in cmaps:
+            cmaps[key] = _parse_cmap(_stream_data(_resolve(reference)))
+        cmap = cmaps[key]
+
+    for code in codes:
+        mapped = (_unicode_of(cmap, code), differences.get(code[0]) if width == 1 else None)
+        digest.update(code + repr(mapped).encode("utf-8"))
+    return digest.digest()
+
+
+def _content_digest(data, resources, cmaps, active=()):
+    """
+    İçerik akışı ile metni belirleyen kaynakları: kullanılan fontlar (_font_digest) ve
+    çağrılan form XObject'leri (kendi içerik akışı ve kaynaklarıyla, özyinelemeli).
+    """
+    digest = hashlib.md5(data)
+    strings, xobjects = _scan_content(data)
+    resources = _resolve(resources)
+    if not isinstance(resources, DictionaryObject):
+        return digest.digest()
+
+    fonts = _resolve(resources.raw_get("/Font")) if "/Font" in resources else {}
+    for name in sorted(name for name in strings if name is not None):
+        font = fonts.get(name.decode("latin-1"))
+        digest.update(name)
+        if font is not None:
+            digest.update(_font_digest(_resolve(font), strings[name], cmaps))
+
+    xobject_refs = _resolve(resources.raw_get("/XObject")) if "/XObject" in resources else {}
+    for name in sorted(xobjects):
+        key = name.decode("latin-1")
+        if key not in xobject_refs:
+            continue
+        reference = xobject_refs.raw_get(key)
+        identity = (reference.idnum, reference.generation) if isinstance(reference, IndirectObject) else None
+        if identity is not None and identity in active:
+            continue
+        xobject = _resolve(reference)
+        subtype = xobject.get("/Subtype")
+        digest.update(f"{key}={subtype};".encode("utf-8"))
+        if subtype == "/Form":
+            # Kaynağı olmayan form, çağıran akışın kaynaklarını kullanır
+            form_resources = xobject.raw_get("/Resources") if "/Resources" in xobject else resources
+            digest.update(_content_digest(_stream_data(xobject), form_resources, cmaps, active + (identity,)))
+    return digest.digest()
+
+
+def page_hashes(pdf_bytes):
+    """
+    Sayfa başına içerik hash'i: içerik akışı (content stream), sayfa kutuları, çizilen
+    form XObject'leri ve kullanılan fontların bu sayfada çizilen kodlarının metin karşılıkları.
+    Aynı akışla farklı XObject çizen sayfalar farklı hash alır; dosyaya sayfa eklenip font
+    alt kümeleri büyüse de değişmeyen sayfaların hash'i aynı kalır.
+    """
+    hashes = []
+    cmaps = {}
+    for page in PdfReader(io.BytesIO(pdf_bytes)).pages:
+        contents = _resolve(page.raw_get("/Contents")) if "/Contents" in page else None
+        if isinstance(contents, ArrayObject):
+            data = b"\n".join(_stream_data(_resolve(stream)) for stream in contents)
+        else:
+            data = _stream_data(contents) if contents is not None else b""
+
+        boxes = []
+        for key in _PAGE_BOXES:
+            value = _resolve(page.raw_get(key)) if key in page else None
+            if isinstance(value, ArrayObject):
+                value = [float(_resolve(item)) for item in value]
+            boxes.append(f"{key}={value}")
+
+        digest = hashlib.md5(";".join(boxes).encode("utf-8"))
+        digest.update(_content_digest(data, page.raw_get("/Resources") if "/Resources" in page else None, cmaps))
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
+def text_hash(text):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    Diskte sayfa önbelleği (JSON dosyaları):
+    - {sayfa hash'i}-{arka uç}-v{sürüm}.json: çıkarılan sayfa metni
+    - {metin hash'i}-rows-v{sürüm}.json: giriş durumu başına parse edilen satırlar ve bitiş durumu
+    """
+
+    def __init__(self, cache_dir=DEFAULT_PAGE_CACHE_DIR, max_bytes=DEFAULT_PAGE_CACHE_MAX_BYTES,
+                 version=PARSER_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key, kind):
+        return os.path.join(self.cache_dir, f"{key}-{kind}-v{self.version}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_text(self, page_hash, backend):
+        entry = self._read(self._path(page_hash, backend))
+        return entry["text"] if entry else None
+
+    def put_text(self, page_hash, backend, text):
+        self._write(self._path(page_hash, backend), {"text": text})
+
+    def known_backend(self, hashes):
+        """Bu sayfalardan en çoğu hangi arka uçla önbellekte - önceki sürümün seçimi"""
+        hits = {
+            backend: sum(os.path.exists(self._path(page_hash, backend)) for page_hash in hashes)
+            for backend in BACKENDS
+        }
+        backend, best = max(hits.items(), key=lambda item: item[1])
+        return backend if best else None
+
+    def get_rows(self, page_text_hash, state):
+        """Aynı metin ve giriş durumu için (satırlar, bitiş durumu), yoksa None"""
+        entry = self._read(self._path(page_text_hash, "rows"))
+        for parse in (entry or {}).get("parses", []):
+            if tuple(parse["state"]) == tuple(state):
+                return parse["rows"], tuple(parse["end"])
+        return None
+
+    def put_rows(self, page_text_hash, state, rows, end_state):
+        path = self._path(page_text_hash, "rows")
+        parses = [parse for parse in (self._read(path) or {}).get("parses", [])
+                  if tuple(parse["state"]) != tuple(state)]
+        parses.append({"state": list(state), "end": list(end_state), "rows": rows})
+        self._write(path, {"parses": parses[-MAX_PARSES_PER_PAGE:]})
+
+    def delete(self, hashes):
+        """Sayfaların tüm arka uçlardaki metinlerini ve bu metinlerden parse edilen satırları siler"""
+        for page_hash in hashes:
+            for backend in BACKENDS:
+                path = self._path(page_hash, backend)
+                entry = self._read(path)
+                if entry is not None:
+                    self._remove(self._path(text_hash(entry["text"]), "rows"))
+                self._remove(path)
+
+    def evict(self):
+        evict_lru(os.path.join(self.cache_dir, "*.json"), self.max_bytes)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def iter_page_texts(pdf_file, page_cache=None, jobs=None, on_progress=None, backend=None):
+    """
+    Sayfaları sırayla (sayfa hash'i, metin) olarak üretir. Önbellekte olan sayfalar
+    çıkarılmaz; auto modunda dosyanın önceki sürümü için seçilen arka uç yeniden kullanılır.
+    page_cache yoksa (ya da sayfa hash'leri okunamazsa) tüm sayfalar çıkarılır, hash None olur.
+    """
+    pdf_bytes = read_pdf_bytes(pdf_file)
+
+    hashes = None
+    if page_cache is not None:
+        try:
+            hashes = page_hashes(pdf_bytes)
+        except Exception:
+            hashes = None
+
+    if hashes is None:
+        for text in iter_pages(pdf_bytes, jobs=jobs, on_progress=on_progress, backend=backend):
+            yield None, text
+        return
+
+    backend = backend or DEFAULT_BACKEND
+    verify = backend == "auto"
+    if verify:
+        backend = page_cache.known_backend(hashes) or resolve_backend(pdf_bytes, backend)[0]
+
+    texts = [page_cache.get_text(page_hash, backend) for page_hash in hashes]
+    missing = [index for index, text in enumerate(texts) if text is None]
+    count("pages_cached", len(hashes) - len(missing))
+    count("pages_extracted", len(missing))
+
+    extracted = iter_pages(pdf_bytes, jobs=jobs, on_progress=on_progress, backend=backend, pages=missing,
+                           verify=verify)
+    for page_hash, text in zip(hashes, texts):
+        if text is None:
+            text = next(extracted)
+            page_cache.put_text(page_hash, backend, text)
+        yield page_hash, text
+
+
+def iter_page_records(pages, city_name, page_cache=None, on_line=None):
+    """
+    (sayfa hash'i, metin) akışından sporcu kayıtları. Parser durumu sayfadan sayfaya
+    devredilir; aynı metin aynı durumla önbellekteyse satırlar yeniden parse edilmez.
+    """
+    parser = RecordParser(city_name)
+    written = False
+
+    for page_hash, text in pages:
+        state = parser.state
+        key = text_hash(text) if page_cache is not None and page_hash is not None else None
+
+        cached = page_cache.get_rows(key, state) if key and on_line is None else None
+        if cached is not None:
+            rows, parser.state = cached
+            count("pages_reused")
+            for row in rows:
+                record = dict(zip(PAGE_ROW_COLUMNS, row))
+                record["Şehir"] = city_name
+                yield record
+            continue
+
+        with timer("clean"):
+            lines = list(clean_pages([text]))
+        count("lines_clean", len(lines))
+        if on_line:
+            for line in lines:
+                on_line(line)
+
+        with timer("parse"):
+            records = list(parser.parse(lines))
+        if key:
+            page_cache.put_rows(key, state, [[record[column] for column in PAGE_ROW_COLUMNS] for record in records],
+                                parser.state)
+            written = True
+        yield from records
+
+    if written:
+        page_cache.evict()
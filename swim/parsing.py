@@ -0,0 +1,384 @@
+"""Temizlenmiş satırlardan sporcu kayıtları üreten akış (streaming) parser"""
+import re
+import functools
+
+import numpy as np
+import pandas as pd
+
+from swim.instrumentation import count
+from swim.schema import parse_centiseconds
+from swim.linescan import (
+    digits_start,
+    is_two_digit_token,
+    scan_club,
+    scan_tail,
+    skip_space,
+    skip_space_back,
+    strip_trailing_digits,
+)
+
+# Akışın DataFrame'e çevrildiği parça boyutu (satır)
+DEFAULT_BATCH_SIZE = 500
+
+# Süre_cs: tamsayı santisaniye - görüntülenen Zaman şema uygulanırken bundan türetilir
+RESULT_COLUMNS = ["Şehir", "Yarış", "Yarış_Kategori", "Cinsiyet", "Yaş", "YB", "İsim", "Kulüp", "Süre_cs", "Puan"]
+
+
+class RecordParser:
+    """
+    Temizlenmiş satırları sırayla okuyup sporcu kayıtlarını (dict) üretir.
+    Yarış/yaş/cinsiyet durumu nesnede taşınır: sayfalar ayrı ayrı parse edilebilir,
+    bir sayfanın bitiş durumu sonraki sayfanın başlangıç durumudur.
+    """
+
+    # Başlangıç durumu: (yarış başlığı, yaş, cinsiyet)
+    INITIAL_STATE = ("", "", "")
+
+    def __init__(self, city_name, state=INITIAL_STATE):
+        self.city_name = city_name
+        self.state = tuple(state)
+
+    def parse(self, lines):
+        """Satırları parse eder; akış tükendiğinde self.state güncellenir"""
+        current_race_base, current_age, current_gender = self.state
+        # Yarış adı ve kategorisi yalnızca başlık/yaş değişince yeniden hesaplanır
+        race_key = None
+        current_race = race_category = ""
+
+        for line in lines:
+            line = line.strip()
+
+            # Yarış başlığı yakala
+            if line.startswith("Yarış") and "4 x" not in line and "4x" not in line:
+                current_race_base = line
+
+                # Cinsiyet belirle ve normalize et
+                if "Kızlar" in line:
+                    current_gender = "Kızlar"
+                elif "Erkekler" in line:
+                    current_gender = "Erkekler"
+                elif "Kız" in line:
+                    current_gender = "Kızlar"  # Normalize et
+                elif "Erkek" in line:
+                    current_gender = "Erkekler"  # Normalize et
+                else:
+                    current_gender = ""
+
+                # Tek yaş formatı kontrolü
+                single_age_match = re.search(r"(\d{1,2}) yaş$", line.strip())
+                if single_age_match:
+                    current_age = single_age_match.group(1)
+                    current_race_base = re.sub(r",?\s*\d{1,2}\s*yaş$", "", line).strip()
+                else:
+                    # Yaş aralığını temizle
+                    current_race_base = re.sub(r"\s*\d{1,2}\s*-\s*\d{1,2}\s*yaşları?\s*arası", "", line).strip()
+                    current_race_base = re.sub(r"\s*\d{1,2}\s*yaş", "", current_race_base).strip()
+                    current_race_base = re.sub(r"\s*yaşları\s*arası", "", current_race_base).strip()
+                    current_age = ""
+                continue
+
+            # Yaş grubu başlığı
+            age_match = re.match(r"^(\d{1,2}) yaş$", line.strip())
+            if age_match and current_race_base:
+                current_age = age_match.group(1)
+                continue
+
+            # Sporcu satırı yakala
+            if current_race_base and current_age and current_gender:
+                # OCR tolerant parsing
+                parsed_athlete = parse_athlete_line_robust(line)
+
+                if parsed_athlete:
+                    # Zaman kontrolü - süre burada bir kez tamsayı santisaniyeye çevrilir
+                    centiseconds = parse_centiseconds(parsed_athlete["time"])
+                    if not centiseconds:
+                        continue
+
+                    if race_key != (current_race_base, current_age, current_gender):
+                        race_key = (current_race_base, current_age, current_gender)
+
+                        # Yarış başlığını oluştur
+                        current_race = f"{current_race_base}, {current_age} yaş" if current_age else current_race_base
+
+                        # Normalize edilmiş kategori oluştur
+                        race_category = cached_race_category(current_race, current_gender, current_age)
+
+                    yield {
+                        "Şehir": self.city_name,
+                        "Yarış": current_race,  # Orijinal yarış adı
+                        "Yarış_Kategori": race_category,  # Normalize edilmiş kategori
+                        "Cinsiyet": current_gender,
+                        "Yaş": current_age,
+                        "YB": parsed_athlete["yb"],
+                        "İsim": parsed_athlete["name"],
+                        "Kulüp": parsed_athlete["club"],
+                        "Süre_cs": centiseconds,
+                        "Puan": parsed_athlete["score"]
+                    }
+
+        self.state = (current_race_base, current_age, current_gender)
+
+
+def iter_records(lines, city_name):
+    """Temizlenmiş satırlardan sporcu kayıtları - durum satır akışı boyunca taşınır"""
+    return RecordParser(city_name).parse(lines)
+
+
+def iter_record_batches(records, batch_size=DEFAULT_BATCH_SIZE):
+    """Kayıt akışını sütun bazlı DataFrame parçalarına böler"""
+    columns = {column: [] for column in RESULT_COLUMNS}
+    count = 0
+
+    for record in records:
+        for column in RESULT_COLUMNS:
+            columns[column].append(record[column])
+        count += 1
+
+        if count >= batch_size:
+            yield pd.DataFrame(columns)
+            columns = {column: [] for column in RESULT_COLUMNS}
+            count = 0
+
+    if count:
+        yield pd.DataFrame(columns)
+
+
+def records_to_frame(batches):
+    """DataFrame parçalarını tek DataFrame'de birleştirir"""
+    batches = list(batches)
+    if not batches:
+        return pd.DataFrame()
+    return pd.concat(batches, ignore_index=True)
+
+
+# İsim: büyük harfle başlar; harf, boşluk, tire ve kesme işareti içerir
+NAME_START_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZÇĞİÖŞÜ")
+NAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzçğıöşüABCDEFGHIJKLMNOPQRSTUVWXYZÇĞİÖŞÜ-'İıĞğÇçŞşÖöÜü")
+_NAME_PREFIX_CHARS = "".join(NAME_CHARS) + " \t"
+
+
+def _scan_name_yb(line):
+    """
+    Soldan isim ve iki haneli doğum yılı (YB).
+    İsim rakam içeremediği için YB, isim karakteri olmayan ilk token olmak zorundadır.
+    Sonuç: (isim sonu, YB başı) ya da None
+    """
+    if not line or line[0] not in NAME_START_CHARS:
+        return None
+
+    n = len(line)
+    # Yaygın karakterler C'de atlanır, kalan (Unicode boşluk vb.) tek tek kontrol edilir
+    yb_start = n - len(line[1:].lstrip(_NAME_PREFIX_CHARS))
+    while yb_start < n and (line[yb_start] in NAME_CHARS or line[yb_start].isspace()):
+        yb_start += 1
+
+    name_end = skip_space_back(line, yb_start)
+    if name_end == yb_start or not is_two_digit_token(line, yb_start):
+        return None
+    # İsim en az iki karakterdir; tek harfli isimden sonra en az iki boşluk gerekir
+    if name_end < 2 and yb_start < 3:
+        return None
+    return name_end, yb_start
+
+
+def _is_athlete_time(token):
+    """(dk:)ss.cc ya da ss,cc biçimi - regex: (?:\\d+:)?\\d{1,2}[.,]\\d{2}"""
+    if len(token) < 4 or token[-3] not in ".," or not token[-2:].isdecimal():
+        return False
+    head = token[:-3]
+    minutes, colon, seconds = head.rpartition(":")
+    if colon and not minutes.isdecimal():
+        return False
+    return 1 <= len(seconds) <= 2 and seconds.isdecimal()
+
+
+def _parse_athlete_line_exact(line):
+    """İsim YB Kulüp Süre Puan - tam biçimli satır"""
+    head = _scan_name_yb(line)
+    tail = scan_tail(line)
+    if head is None or tail is None:
+        return None
+
+    name_end, yb_start = head
+    club_end, time_start, time_end, score_start = tail
+    time_raw = line[time_start:time_end]
+    if not _is_athlete_time(time_raw):
+        return None
+
+    club = scan_club(line, yb_start, time_start, club_end)
+    if club is None:
+        return None
+
+    return {
+        "name": line[:name_end],
+        "yb": int(line[yb_start:yb_start + 2]),
+        "club": club.strip(),
+        "time": time_raw.replace(',', '.'),
+        "score": int(line[score_start:])
+    }
+
+
+def _parse_athlete_line_ocr(line):
+    """Süresi bitişik ya da kulüp sonu bozulmuş satırlar: süre, son token'ın sonundan alınır"""
+    n = len(line)
+    score_start = digits_start(line, n)
+    if score_start == n or score_start == 0 or not line[score_start - 1].isspace():
+        return None
+
+    # \d{1,2}[:.]\d{2} - puandan önceki token'ın sonunda
+    time_end = skip_space_back(line, score_start)
+    if (time_end < 4 or not line[time_end - 2:time_end].isdecimal()
+            or line[time_end - 3] not in ":." or not line[time_end - 4].isdecimal()):
+        return None
+    time_start = time_end - 5 if time_end >= 5 and line[time_end - 5].isdecimal() else time_end - 4
+
+    remaining = line[:time_start].strip()
+    head = _scan_name_yb(remaining)
+    if head is None:
+        return None
+    name_end, yb_start = head
+
+    # OCR hata düzeltmeleri
+    club = remaining[skip_space(remaining, yb_start + 2):]
+    if club.endswith("1ü:"):
+        club = club[:-3] + "ü"
+    elif club.endswith("1ü"):
+        club = club[:-2] + "ü"
+    club = strip_trailing_digits(club.rstrip(":")).strip()
+
+    return {
+        "name": remaining[:name_end],
+        "yb": int(remaining[yb_start:yb_start + 2]),
+        "club": club,
+        "time": line[time_start:time_end].replace(':', '.'),
+        "score": int(line[score_start:])
+    }
+
+
+def parse_athlete_line_robust(line):
+    """
+    OCR hatalarını tolere eden sporcu satırı parse'ı.
+    Satır sağdan token token taranır (puan, süre, kulüp, YB, isim); regex geri izlemesi
+    olmadığından bozuk ve çok uzun satırlarda da süre satır uzunluğuyla doğrusaldır.
+    """
+    # Normal format dene
+    result = _parse_athlete_line_exact(line)
+    if result is not None:
+        count("athlete_fast")
+        return result
+
+    # OCR hatası için agresif parsing
+    result = _parse_athlete_line_ocr(line)
+    if result is not None:
+        count("athlete_fallback")
+        return result
+
+    count("athlete_unmatched")
+    return None
+
+
+def normalize_race_category_advanced(race_title, gender, age):
+    """
+    Gelişmiş yarış kategorisi normalizasyonu
+    Farklı formatları tek standarda çevirir
+    """
+
+    # Önce metni temizle
+    cleaned_title = race_title.strip()
+
+    # Yarış numarası çıkar
+    race_match = re.search(r"Yarış\s+(\d+)", cleaned_title)
+    race_num = race_match.group(1) if race_match else "1"
+
+    # Mesafe çıkar
+    distance_match = re.search(r"(\d+)m", cleaned_title)
+    distance = distance_match.group(0) if distance_match else ""
+
+    # Stil çıkar
+    style_map = {
+        "serbest": "Serbest",
+        "sırtüstü": "Sırtüstü",
+        "sırt": "Sırtüstü",
+        "kurbağalama": "Kurbağalama",
+        "kurbağa": "Kurbağalama",
+        "kelebek": "Kelebek",
+        "karışık": "Karışık"
+    }
+
+    style = ""
+    title_lower = cleaned_title.lower()
+    for key, value in style_map.items():
+        if key in title_lower:
+            style = value
+            break
+
+    # Cinsiyet standartlaştır
+    std_gender = ""
+    if gender in ["Kız", "Kızlar"]:
+        std_gender = "Kızlar"
+    elif gender in ["Erkek", "Erkekler"]:
+        std_gender = "Erkekler"
+    else:
+        std_gender = gender
+
+    # Standart format oluştur: "Yarış X, Cinsiyet, Mesafe Stil, Yaş yaş"
+    if all([race_num, std_gender, distance, style, age]):
+        return f"Yarış {race_num}, {std_gender}, {distance} {style}, {age} yaş"
+    else:
+        # Eksik bilgi varsa fallback
+        return cleaned_title
+
+
+# Aynı başlık sayfa devamlarında ve farklı dosyalarda tekrar eder; bellek sınırlı kalsın
+RACE_CATEGORY_CACHE_SIZE = 4096
+cached_race_category = functools.lru_cache(maxsize=RACE_CATEGORY_CACHE_SIZE)(normalize_race_category_advanced)
+
+
+def race_categories(df):
+    """
+    Yarış_Kategori sütununu üretir: her benzersiz (Yarış, Cinsiyet, Yaş) üçlüsü
+    bir kez normalize edilir, sonuç satırlara indeksle dağıtılır.
+    """
+    keys = pd.MultiIndex.from_frame(df[['Yarış', 'Cinsiyet', 'Yaş']])
+    unique_keys = keys.unique()
+    categories = np.array([cached_race_category(*key) for key in unique_keys], dtype=object)
+    return pd.Series(categories[unique_keys.get_indexer(keys)], index=df.index)
+
+
+def normalize_race_category(race_title, gender, age):
+    """Eski fonksiyon - geriye uyumluluk için"""
+    return normalize_race_category_advanced(race_title, gender, age)
+
+
+# Test fonksiyonu
+def test_normalization():
+    """Normalizasyon testleri"""
+    test_cases = [
+        ("Yarış 10 Erkekler, 200m Sırtüstü, 11 yaş", "Erkekler", "11"),
+        ("Yarış 10, Erkekler, 200m Sırtüstü, 11 yaş", "Erkekler", "11"),
+        ("Yarış 1 Kızlar, 100m Serbest, 10 yaş", "Kızlar", "10"),
+        ("Yarış 1, Kızlar, 100m Serbest, 10 yaş", "Kızlar", "10"),
+        ("Yarış 5, Erkek, 50m Kelebek, 12 yaş", "Erkek", "12"),
+    ]
+
+    print("🧪 Yarış Normalizasyon Testi:")
+    print("=" * 60)
+
+    results = []
+    for race_title, gender, age in test_cases:
+        normalized = normalize_race_category_advanced(race_title, gender, age)
+        results.append(normalized)
+        print(f"Girdi: {race_title}")
+        print(f"Çıktı: {normalized}")
+        print("-" * 40)
+
+    # Kritik test: Aynı yarışlar birleşiyor mu?
+    result1 = results[0]  # "Yarış 10 Erkekler, 200m Sırtüstü, 11 yaş"
+    result2 = results[1]  # "Yarış 10, Erkekler, 200m Sırtüstü, 11 yaş"
+
+    print(f"\n✅ Birleştirme Testi:")
+    print(f"Format 1: {result1}")
+    print(f"Format 2: {result2}")
+    print(f"Aynı mı? {'✅ EVET' if result1 == result2 else '❌ HAYIR'}")
+
+    return result1 == result2
@@ -0,0 +1,11 @@
+"""Süreç havuzu - sayfa çıkarma, toplu dönüştürme ve arka plan kuyruğu ortak kullanır"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def spawn_pool(max_workers):
+    """
+    spawn bağlamlı süreç havuzu. fork, Streamlit sunucusunun thread'leri (ve tuttukları
+    kilitler) açıkken alt süreci kilitleyebilir; spawn işçileri temiz bir yorumlayıcıda başlatır.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
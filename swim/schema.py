@@ -0,0 +1,100 @@
+"""Birleşik sonuç tablosunun sıkı (kategorik / küçük tamsayı) şeması"""
+import re
+
+import pandas as pd
+
+# Tekrarlı metin sütunları - kategorik tutulur
+CATEGORY_COLUMNS = ["Şehir", "Yarış", "Yarış_Kategori", "Cinsiyet", "İsim", "Kulüp"]
+
+# Tamsayı sütunları ve tipleri; Süre_cs santisaniye (1/100 sn) cinsinden süredir
+INTEGER_COLUMNS = {
+    "Yaş": "int8",
+    "YB": "int8",
+    "Puan": "int16",
+    "Süre_cs": "int32",
+}
+
+
+# Parser'ın kabul ettiği zaman biçimi: [dakika:]saniye[.salise]
+_TIME_PATTERN = re.compile(r'^(?:(\d+):)?(\d+)(?:\.(\d{1,2}))?$')
+
+
+def parse_centiseconds(text):
+    """Tek bir zaman metnini ('1:23.45', '23.45') tamsayı santisaniyeye çevirir; geçersizse None"""
+    match = _TIME_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    minutes, seconds, fraction = match.groups()
+    return int(minutes or 0) * 6000 + int(seconds) * 100 + int((fraction or "0").ljust(2, "0"))
+
+
+def _format_time(centiseconds):
+    minutes, rest = divmod(int(centiseconds), 6000)
+    seconds, fraction = divmod(rest, 100)
+    if minutes:
+        return f"{minutes}:{seconds:02d}.{fraction:02d}"
+    return f"{seconds}.{fraction:02d}"
+
+
+def format_centiseconds(centiseconds):
+    """
+    Santisaniye serisinden görüntülenen zaman ('1:23.45', '59.12') - kategorik döner,
+    her farklı süre bir kez biçimlenir. Eksik süreler boş kalır.
+    """
+    codes, uniques = pd.factorize(centiseconds, sort=True)
+    labels = [_format_time(value) for value in uniques]
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+def time_to_centiseconds(times):
+    """
+    Zaman serisini ('1:23.45', '23.45', '1:23,45') vektörel olarak santisaniyeye çevirir.
+    Yalnızca Süre_cs sütunu olmayan eski (önbellekteki) tablolar için kullanılır; geçersiz değerler NaN olur.
+    """
+    parts = times.astype(str).str.strip().str.replace(',', '.', regex=False).str.extract(
+        r'^(?:(\d+):)?(\d+)(?:\.(\d{1,2}))?$'
+    )
+    minutes = pd.to_numeric(parts[0], errors='coerce').fillna(0)
+    seconds = pd.to_numeric(parts[1], errors='coerce')
+    fraction = pd.to_numeric(parts[2].str.ljust(2, '0'), errors='coerce').fillna(0)
+    return minutes * 6000 + seconds * 100 + fraction
+
+
+def _to_integer(series, dtype):
+    values = pd.to_numeric(series, errors='coerce')
+    if values.isna().any():
+        # Eksik değer varsa nullable tip kullan (int8 -> Int8)
+        return values.astype(dtype.capitalize())
+    return values.astype(dtype)
+
+
+def enforce_schema(df):
+    """DataFrame'i ortak şemaya çevirir; zaten uygun sütunlar olduğu gibi kalır"""
+    if df.empty:
+        return df
+
+    df = df.copy()
+
+    if "Süre_cs" not in df.columns and "Zaman" in df.columns:
+        df["Süre_cs"] = time_to_centiseconds(df["Zaman"])
+    # Eski kayıtlardaki float saniye sütunu artık tutulmaz
+    df = df.drop(columns=["Saniye"], errors="ignore")
+
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+
+    for column, dtype in INTEGER_COLUMNS.items():
+        if column in df.columns and str(df[column].dtype).lower() != dtype:
+            df[column] = _to_integer(df[column], dtype)
+
+    # Görüntülenen zaman süreden türetilir (eski tablolardaki metin zamanlar da yeniden yazılır)
+    times = df.get("Zaman")
+    if "Süre_cs" in df.columns and (times is None or not isinstance(times.dtype, pd.CategoricalDtype)):
+        times = format_centiseconds(df["Süre_cs"])
+        if "Zaman" in df.columns:
+            df["Zaman"] = times
+        else:
+            df.insert(df.columns.get_loc("Süre_cs"), "Zaman", times)
+
+    return df
@@ -0,0 +1,62 @@
+"""Dashboard ve Excel sayfasının paylaştığı, dosya hash'i ile adreslenen bellek içi parse deposu"""
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("SWIM_STORE_MAX_ENTRIES", "32"))
+
+# Bir yarışma için depolanan tablolar
+MEET_TABLES = ("results", "individual", "team", "disqualified")
+
+
+class ParseStore:
+    """
+    Süreç genelinde tek bir depo: aynı PDF bir sayfada parse edildiyse
+    diğer sayfa (ve diğer oturumlar) sonucu yeniden parse etmeden kullanır.
+    Kapasite aşılınca en uzun süredir kullanılmayan kayıt atılır (LRU).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Streamlit oturumları ayrı thread'lerde çalışır
+        self._lock = threading.Lock()
+
+    def get(self, file_hash):
+        """Depodaki tablo sözlüğünü döndürür, yoksa None"""
+        with self._lock:
+            meet = self._entries.get(file_hash)
+            if meet is not None:
+                self._entries.move_to_end(file_hash)
+            return meet
+
+    def put(self, file_hash, meet):
+        """Tablo sözlüğünü ({tablo adı: DataFrame}) depolar"""
+        with self._lock:
+            self._entries[file_hash] = meet
+            self._entries.move_to_end(file_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, file_hash):
+        with self._lock:
+            self._entries.pop(file_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, file_hash):
+        with self._lock:
+            return file_hash in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_store = ParseStore()
+
+
+def get_parse_store():
+    """Süreç genelindeki paylaşılan depoyu döndürür"""
+    return _store